@@ -119,6 +119,41 @@ resource "null_resource" "deploy_cutover_ui" {
       "ELASTICACHE_HOST=${var.elasticache_endpoint}",
       "ELASTICACHE_PORT=${var.elasticache_port}",
       "ELASTICACHE_PASSWORD=${var.elasticache_password}",
+      "# Background metrics collector (seconds)",
+      "STATS_POLL_INTERVAL=1",
+      "STATS_DEADLINE_SECONDS=2",
+      "RIOT_POLL_INTERVAL=5",
+      "CONFIG_POLL_INTERVAL=5",
+      "# Persistent multiplexed SSH to the RIOT host (seconds)",
+      "SSH_CONTROL_PERSIST=600",
+      "RIOT_START_TIMEOUT=10",
+      "# RIOT-X metrics scraping and cutover readiness thresholds",
+      "RIOT_METRICS_PORT=${var.riotx_metrics_port}",
+      "RIOT_METRICS_INTERVAL=2",
+      "RIOT_MAX_LAG_SECONDS=1.0",
+      "RIOT_MAX_QUEUE_DEPTH=1000",
+      "RIOT_READY_WINDOW=10",
+      "# Source/target consistency checker (rate cap protects the source)",
+      "CONSISTENCY_MAX_KEYS_PER_SEC=2000",
+      "CONSISTENCY_BATCH_SIZE=200",
+      "CONSISTENCY_SAMPLE_RATE=1.0",
+      "CONSISTENCY_TTL_TOLERANCE_MS=5000",
+      "# Keyspace notification tracking (source has notify-keyspace-events=AKE; try to enable it on the target)",
+      "KSN_TRACKING_ENABLED=true",
+      "KSN_AUTO_CONFIGURE=true",
+      "KSN_PENDING_TTL=20",
+      "# Native cutover orchestrator (freeze writes, drain replication, switch, verify first target write)",
+      "REDISARENA_API_URL=http://localhost:5000",
+      "CUTOVER_APP_SWITCH=hot_swap",
+      "CUTOVER_CATCHUP_TIMEOUT=30",
+      "CUTOVER_FIRST_WRITE_TIMEOUT=15",
+      "CUTOVER_POLL_INTERVAL=0.1",
+      "# Serving mode: waitress thread pool; long operations run as background jobs",
+      "SERVER_MODE=waitress",
+      "SERVER_THREADS=32",
+      "STREAM_MAX_CLIENTS=16",
+      "JOB_MAX_WORKERS=4",
+      "JOB_OUTPUT_LINES=1000",
       "CONFIG",
       # Secure the configuration file
       "chmod 600 /opt/cutover-ui/.env",
@@ -63,9 +63,12 @@ update_redis_config() {
         return 1
     fi
     
-    sed -i "s/REDIS_HOST=.*/REDIS_HOST=$REDIS_CLOUD_HOST/" $ENV_FILE
-    sed -i "s/REDIS_PORT=.*/REDIS_PORT=$REDIS_CLOUD_PORT/" $ENV_FILE
-    sed -i "s/REDIS_PASSWORD=.*/REDIS_PASSWORD=$REDIS_CLOUD_PASSWORD/" $ENV_FILE
+    # Edit a copy and rename it over .env so RedisArena's watcher never sees a half-updated host:port
+    cp -p $ENV_FILE $ENV_FILE.tmp
+    sed -i -e "s/REDIS_HOST=.*/REDIS_HOST=$REDIS_CLOUD_HOST/" \
+           -e "s/REDIS_PORT=.*/REDIS_PORT=$REDIS_CLOUD_PORT/" \
+           -e "s/REDIS_PASSWORD=.*/REDIS_PASSWORD=$REDIS_CLOUD_PASSWORD/" $ENV_FILE.tmp
+    mv $ENV_FILE.tmp $ENV_FILE
     
     log "Redis configuration updated"
 }
@@ -113,7 +116,7 @@ case "${1:-cutover}" in
             update_redis_config
             # Commented out restart service call - configuration only
             # if restart_service; then
-                log "Cutover completed successfully - configuration updated but service restart required"
+                log "Cutover completed successfully - configuration updated (RedisArena hot-swaps to the new backend when BACKEND_WATCH_ENV=true)"
             # else
             #     log "Cutover failed: Service restart unsuccessful"
             #     exit 1
@@ -3,11 +3,22 @@
 Redis Migration Control Panel - Final Optimized Version
 Clean, organized layout with simplified functions and improved maintainability
 """
-from flask import Flask, jsonify, render_template
+from flask import Flask, Response, jsonify, render_template, request
+import hashlib
+import json
 import logging
 import subprocess
 import os
+import random
+import re
+import shutil
+import signal
+import threading
 import time
+import redis
+import requests
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, Optional, Tuple, Any, List
 from dotenv import load_dotenv
@@ -42,6 +53,54 @@ def execute_subprocess_with_timeout(cmd: List[str], timeout: int = 30) -> Tuple[
     except Exception as e:
         return False, "", str(e)
 
+def execute_subprocess_streaming(cmd: List[str], timeout: int = 30) -> Tuple[int, str]:
+    """
+    Execute a subprocess, passing each output line to the current job as it's printed.
+    
+    stderr is merged into stdout so lines keep their order; callers decide success from
+    the exit code, not from the text.
+    
+    Args:
+        cmd: List of command arguments
+        timeout: Seconds before the command (and anything it spawned) is killed
+        
+    Returns:
+        Tuple of (exit_code: int - 124 on timeout, output: str - the last few lines)
+    """
+    tail: deque = deque(maxlen=int(os.getenv("OUTPUT_TAIL_LINES", "20")))
+    try:
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace",
+            bufsize=1, start_new_session=True, env={**os.environ, "PYTHONUNBUFFERED": "1"}
+        )
+    except Exception as e:
+        return 127, str(e)
+    
+    timed_out = threading.Event()
+    def kill():
+        timed_out.set()
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            tail.append(line)
+            append_job_output(line)
+        exit_code = process.wait()
+    finally:
+        timer.cancel()
+    
+    if timed_out.is_set():
+        message = f"Command timed out after {timeout} seconds"
+        tail.append(message)
+        append_job_output(message)
+        exit_code = 124
+    return exit_code, "\n".join(tail)
+
 def read_env_file(file_path: str) -> Dict[str, str]:
     """
     Parse environment file and return key-value pairs.
@@ -81,24 +140,108 @@ def create_json_response(success: bool, message: str, **kwargs) -> Dict[str, Any
     response.update(kwargs)
     return response
 
-def execute_ssh_command(host: str, command: str, timeout: int = 10) -> Tuple[bool, str, str]:
+# Each open event stream holds a server thread for as long as the browser keeps it, so
+# streams are capped below the thread count; extra viewers get 503 and fall back to polling.
+_stream_slots = threading.BoundedSemaphore(int(os.getenv("STREAM_MAX_CLIENTS", "16")))
+
+def create_event_stream_response(events) -> Response:
+    """
+    Wrap an event generator in a Server-Sent Events response, if a stream slot is free.
+    
+    Args:
+        events: Generator yielding SSE-formatted strings
+        
+    Returns:
+        text/event-stream response, or a 503 JSON response when all slots are taken
+    """
+    if not _stream_slots.acquire(blocking=False):
+        return Response(json.dumps(create_json_response(False, "Too many live streams - poll instead")),
+                        status=503, mimetype="application/json")
+    response = Response(events, mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(_stream_slots.release)
+    return response
+
+# One persistent, multiplexed SSH connection (OpenSSH ControlMaster) per remote host.
+# Commands open a channel on it instead of doing a fresh TCP + SSH handshake each time.
+_ssh_master_lock = threading.Lock()
+
+def get_ssh_control_path(host: str) -> str:
+    """Get the control socket path for a host's multiplexed SSH connection."""
+    control_id = hashlib.sha1(host.encode()).hexdigest()[:12]
+    return os.path.join(os.getenv("SSH_CONTROL_DIR", "/tmp"), f"cutover-ui-ssh-{control_id}")
+
+def build_ssh_base_command(host: str) -> List[str]:
     """
-    Execute SSH command on remote host with proper error handling.
+    Build the ssh invocation shared by the control master and the commands using it.
     
     Args:
         host: Target host (e.g., 'ubuntu@ec2-host.amazonaws.com')
-        command: Command to execute
-        timeout: Command timeout in seconds
         
     Returns:
-        Tuple of (success: bool, stdout: str, stderr: str)
+        ssh command list without the destination and remote command
     """
     ssh_key_path = os.getenv("SSH_KEY_PATH", "/home/ubuntu/bamos-aws-us-west-2.pem")
-    cmd = [
+    return [
         "ssh", "-i", ssh_key_path,
         "-o", "StrictHostKeyChecking=no",
-        host, command
+        "-o", "BatchMode=yes",
+        "-o", f"ControlPath={get_ssh_control_path(host)}",
+        "-o", "ServerAliveInterval=15",
+        "-o", "ServerAliveCountMax=3",
+        "-o", "ConnectTimeout=5"
     ]
+
+def ensure_ssh_master(host: str) -> bool:
+    """
+    Make sure a live control master exists for host, (re)connecting if needed.
+    
+    The master is started detached with its output discarded, so it never holds the
+    pipes of a captured subprocess open. It exits SSH_CONTROL_PERSIST seconds after its
+    last use, or when keepalives detect a dead connection, and is recreated on demand.
+    
+    Args:
+        host: Target host (e.g., 'ubuntu@ec2-host.amazonaws.com')
+        
+    Returns:
+        Whether a master is available (commands fall back to direct connections if not)
+    """
+    base = build_ssh_base_command(host)
+    with _ssh_master_lock:
+        success, _, _ = execute_subprocess_with_timeout(base + ["-O", "check", host], timeout=5)
+        if success:
+            return True
+        
+        # Remove a stale control socket left behind by a master that died
+        control_path = get_ssh_control_path(host)
+        if os.path.exists(control_path):
+            os.unlink(control_path)
+        
+        logger.info(f"Opening multiplexed SSH connection to {host}...")
+        try:
+            result = subprocess.run(
+                base + ["-M", "-N", "-f", "-o", f"ControlPersist={os.getenv('SSH_CONTROL_PERSIST', '600')}", host],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15
+            )
+            return result.returncode == 0
+        except subprocess.TimeoutExpired:
+            logger.error(f"Timed out opening SSH connection to {host}")
+            return False
+
+def execute_ssh_command(host: str, command: str, timeout: int = 10) -> Tuple[bool, str, str]:
+    """
+    Execute SSH command on remote host over the multiplexed connection.
+    
+    Args:
+        host: Target host (e.g., 'ubuntu@ec2-host.amazonaws.com')
+        command: Command to execute
+        timeout: Command timeout in seconds
+        
+    Returns:
+        Tuple of (success: bool, stdout: str, stderr: str)
+    """
+    ensure_ssh_master(host)
+    cmd = build_ssh_base_command(host) + ["-o", "ControlMaster=no", host, command]
     return execute_subprocess_with_timeout(cmd, timeout)
 
 # =============================================================================
@@ -133,30 +276,48 @@ def get_redis_connection_config(database_type: str) -> Dict[str, str]:
     
     return configs[database_type]
 
-def build_redis_cli_command(database_type: str, redis_command: List[str]) -> List[str]:
+# Connection pools are kept for the life of the process, keyed by database type,
+# connection settings and socket timeout, so a changed .env gets a fresh pool
+_redis_pools: Dict[Tuple, redis.ConnectionPool] = {}
+_redis_pools_lock = threading.Lock()
+
+def get_redis_client(database_type: str, timeout: float = 5, decode_responses: bool = True) -> redis.Redis:
     """
-    Build redis-cli command with proper authentication.
+    Get a pooled Redis client for a specific database type.
     
     Args:
         database_type: Either 'elasticache' or 'redis_cloud'
-        redis_command: Redis command to execute
+        timeout: Socket connect/read timeout in seconds
+        decode_responses: False for binary-safe replies (DUMP payloads, raw keys)
         
     Returns:
-        Complete command list for subprocess
+        redis.Redis client backed by a persistent connection pool
     """
     config = get_redis_connection_config(database_type)
     
-    cmd = ["redis-cli", "-h", config['host'], "-p", config['port']]
-    
-    if config['password']:
-        cmd.extend(["-a", config['password']])
+    # Validate configuration for Redis Cloud
+    if database_type == 'redis_cloud' and not all([config['host'], config['port'], config['password']]):
+        raise ValueError("Incomplete Redis Cloud configuration")
     
-    cmd.extend(redis_command)
-    return cmd
+    pool_key = (database_type, config['host'], config['port'], config['password'], timeout, decode_responses)
+    with _redis_pools_lock:
+        pool = _redis_pools.get(pool_key)
+        if pool is None:
+            pool = redis.ConnectionPool(
+                host=config['host'],
+                port=int(config['port']),
+                password=config['password'] or None,
+                decode_responses=decode_responses,
+                socket_connect_timeout=timeout,
+                socket_timeout=timeout,
+                max_connections=int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "10"))
+            )
+            _redis_pools[pool_key] = pool
+    return redis.Redis(connection_pool=pool)
 
-def execute_redis_command(database_type: str, command: List[str], timeout: int = 30) -> Tuple[bool, str, str]:
+def execute_redis_command(database_type: str, command: List[str], timeout: int = 30) -> Tuple[bool, Any, str]:
     """
-    Execute a Redis command with proper error handling and connection setup.
+    Execute a Redis command over a pooled connection with proper error handling.
     
     Args:
         database_type: Either 'elasticache' or 'redis_cloud'
@@ -164,20 +325,14 @@ def execute_redis_command(database_type: str, command: List[str], timeout: int =
         timeout: Command timeout in seconds
         
     Returns:
-        Tuple of (success: bool, stdout: str, stderr: str)
+        Tuple of (success: bool, result: Any, error_message: str) - result is the
+        typed redis-py reply (int for DBSIZE, None for a missing key, ...)
     """
     try:
-        config = get_redis_connection_config(database_type)
-        
-        # Validate configuration for Redis Cloud
-        if database_type == 'redis_cloud' and not all([config['host'], config['port'], config['password']]):
-            return False, "", "Incomplete Redis Cloud configuration"
-        
-        cmd = build_redis_cli_command(database_type, command)
-        return execute_subprocess_with_timeout(cmd, timeout)
-        
+        client = get_redis_client(database_type, timeout)
+        return True, client.execute_command(*command), ""
     except Exception as e:
-        return False, "", str(e)
+        return False, None, str(e)
 
 def get_redis_key_count(database_type: str) -> Tuple[bool, int, str]:
     """
@@ -189,10 +344,10 @@ def get_redis_key_count(database_type: str) -> Tuple[bool, int, str]:
     Returns:
         Tuple of (success: bool, key_count: int, error_message: str)
     """
-    success, stdout, stderr = execute_redis_command(database_type, ['dbsize'], timeout=5)
-    if success and stdout.isdigit():
-        return True, int(stdout), ""
-    return False, 0, stderr or "Connection failed"
+    success, result, error = execute_redis_command(database_type, ['DBSIZE'], timeout=5)
+    if success:
+        return True, int(result), ""
+    return False, 0, error or "Connection failed"
 
 def get_redis_demo_counter(database_type: str) -> str:
     """
@@ -204,10 +359,10 @@ def get_redis_demo_counter(database_type: str) -> str:
     Returns:
         Formatted string showing the counter value
     """
-    success, stdout, stderr = execute_redis_command(database_type, ['get', 'migration:demo:counter'], timeout=3)
+    success, value, error = execute_redis_command(database_type, ['GET', 'migration:demo:counter'], timeout=3)
     if success:
-        if stdout and stdout != "(nil)":
-            return f"🔢 migration:demo:counter = {stdout}"
+        if value is not None:
+            return f"🔢 migration:demo:counter = {value}"
         else:
             return "🔢 migration:demo:counter = (not set)"
     else:
@@ -248,6 +403,46 @@ def get_redis_stats(database_type: str) -> Dict[str, Any]:
     
     return stats
 
+# Shared pool for per-backend probes, so one unreachable backend can't serialize the others
+_stats_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stats-probe")
+
+def collect_database_stats(database_types: List[str], timeout: float) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+    """
+    Probe several Redis databases concurrently under one overall deadline.
+    
+    Args:
+        database_types: Database types to probe (e.g. ['elasticache', 'redis_cloud'])
+        timeout: Overall deadline in seconds for all probes together
+        
+    Returns:
+        Tuple of (stats keyed by database type, partial: bool) - databases that miss
+        the deadline or fail get a placeholder entry and partial is True
+    """
+    futures = {database_type: _stats_executor.submit(get_redis_stats, database_type)
+               for database_type in database_types}
+    wait(futures.values(), timeout=timeout)
+    
+    results = {}
+    partial = False
+    for database_type, future in futures.items():
+        if future.done() and not future.exception():
+            results[database_type] = future.result()
+            continue
+        
+        partial = True
+        config = get_redis_connection_config(database_type)
+        if future.done():
+            demo_counter, status = f"❌ Error: {future.exception()}", 'disconnected'
+        else:
+            demo_counter, status = f"⏱️ No response within {timeout}s", 'timeout'
+        results[database_type] = {
+            'key_count': 0,
+            'demo_counter': demo_counter,
+            'host': config['host'],
+            'status': status
+        }
+    return results, partial
+
 def flush_redis_database(database_type: str) -> Tuple[bool, str]:
     """
     Flush all keys from a Redis database.
@@ -261,13 +456,13 @@ def flush_redis_database(database_type: str) -> Tuple[bool, str]:
     database_name = database_type.replace('_', ' ').title()
     logger.info(f"Flushing {database_name} database...")
     
-    success, stdout, stderr = execute_redis_command(database_type, ['flushdb'], timeout=30)
+    success, result, error = execute_redis_command(database_type, ['FLUSHDB'], timeout=30)
     
-    if success and "OK" in stdout:
+    if success and result:
         logger.info(f"{database_name} flushed successfully")
         return True, f"{database_name} database flushed successfully! All keys have been deleted."
     else:
-        error_msg = stderr or "FLUSHDB command failed"
+        error_msg = error or "FLUSHDB command failed"
         logger.error(f"{database_name} flush failed: {error_msg}")
         return False, f"Failed to flush {database_name}: {error_msg}"
 
@@ -404,13 +599,30 @@ def start_riot_process() -> None:
     host = get_riot_host()
     command = "cd /home/ubuntu && nohup ./start_riotx.sh > riotx.log 2>&1 &"
     
-    # Use Popen for fire-and-forget execution
-    ssh_key_path = os.getenv("SSH_KEY_PATH", "/home/ubuntu/bamos-aws-us-west-2.pem")
-    subprocess.Popen([
-        "ssh", "-i", ssh_key_path,
-        "-o", "StrictHostKeyChecking=no",
-        host, command
-    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Output is redirected remotely, so the session returns as soon as the script is launched
+    success, _, stderr = execute_ssh_command(host, command, timeout=10)
+    if not success:
+        raise Exception(f"SSH command failed: {stderr}")
+
+def wait_for_riot_process(running: bool, timeout: float) -> bool:
+    """
+    Poll the RIOT process state until it matches or the timeout passes.
+    
+    Args:
+        running: Desired state (True to wait for start, False for stop)
+        timeout: Maximum time to wait in seconds
+        
+    Returns:
+        Whether the desired state was reached
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        is_running, _ = check_riot_process_running()
+        if is_running == running:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
 
 def stop_riot_processes() -> Tuple[bool, str]:
     """
@@ -421,165 +633,1673 @@ def stop_riot_processes() -> Tuple[bool, str]:
     """
     host = get_riot_host()
     
-    # Kill RIOT process
-    success1, _, stderr1 = execute_ssh_command(host, "pkill -f 'com.redis.riot.Riotx'", timeout=10)
-    
-    # Kill start script
-    success2, _, stderr2 = execute_ssh_command(host, "pkill -f 'start_riotx.sh'", timeout=10)
-    
+    # Kill RIOT process and start script in one session. The [x] patterns keep pkill from
+    # matching the remote shell, whose own command line contains both patterns.
     # pkill returns exit code 1 when no processes found - this is normal
+    command = "pkill -f '[c]om.redis.riot.Riotx'; pkill -f '[s]tart_riotx.sh'; true"
+    success, _, stderr = execute_ssh_command(host, command, timeout=10)
+    if not success:
+        return False, f"Failed to stop RIOT: {stderr}"
+    
     return True, "RIOT replication stopped successfully"
 
 # =============================================================================
-# FLASK ROUTES
+# RIOT-X METRICS SCRAPER
 # =============================================================================
 
-@app.route("/")
-def home():
-    return render_template("index.html")
+# Rolling time series of replication progress scraped from the RIOT-X Prometheus endpoint
+_riot_series: deque = deque(maxlen=int(os.getenv("RIOT_METRICS_HISTORY", "300")))
+_riot_previous_scrape: Optional[Dict[str, Any]] = None
+_riot_series_lock = threading.Lock()
 
-@app.route("/api/test")
-def api_test():
-    return jsonify(create_json_response(
-        True, "Test successful - API is working perfectly!",
-        timestamp=datetime.now().isoformat()
-    ))
+# Metric families are matched by regex because Micrometer names vary across RIOT-X versions
+RIOT_METRIC_PATTERNS = {
+    'keys': os.getenv("RIOT_METRIC_KEYS_PATTERN", r"^riotx_(?!.*bytes).*(replicat|write|item).*_total$"),
+    'queue': os.getenv("RIOT_METRIC_QUEUE_PATTERN", r"^riotx_.*queue.*(size|depth|remaining)$"),
+    'lag': os.getenv("RIOT_METRIC_LAG_PATTERN", r"^riotx_.*lag.*")
+}
 
-@app.route("/api/start-redisarena", methods=["POST"])
-def start_redisarena():
-    try:
-        logger.info("Starting RedisArena application...")
-        success, stdout, stderr = execute_subprocess_with_timeout(
-            ["sudo", "systemctl", "start", "redisarena"], timeout=30
-        )
+def get_riot_metrics_url() -> str:
+    """Get the RIOT-X metrics endpoint URL from environment variables."""
+    default_url = f"http://{os.getenv('RIOT_PUBLIC_IP', 'localhost')}:{os.getenv('RIOT_METRICS_PORT', '8080')}/metrics"
+    return os.getenv("RIOT_METRICS_URL", default_url)
+
+def parse_prometheus_metrics(text: str) -> Dict[str, List[float]]:
+    """
+    Parse Prometheus text exposition format, keeping one value per label set.
+    
+    Counters can be summed across label sets but gauges can't, so combining the
+    series is left to the caller.
+    
+    Args:
+        text: Body of a /metrics response
         
-        if success:
-            return jsonify(create_json_response(True, "RedisArena application started successfully!"))
+    Returns:
+        Dict of sample name (including _sum/_count/_total suffixes) to its per-series values
+    """
+    samples: Dict[str, List[float]] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if '{' in line:
+            name = line[:line.index('{')]
+            rest = line[line.rindex('}') + 1:].split()
         else:
-            return jsonify(create_json_response(False, f"Failed to start RedisArena: {stderr}"))
-    except Exception as e:
-        return jsonify(create_json_response(False, f"Error starting RedisArena: {str(e)}"))
+            name, *rest = line.split()
+        if not rest:
+            continue
+        try:
+            value = float(rest[0])
+        except ValueError:
+            continue
+        if value == value and value not in (float('inf'), float('-inf')):
+            samples.setdefault(name, []).append(value)
+    return samples
 
-@app.route("/api/load-data", methods=["POST"])
-def load_sample_data():
-    try:
-        logger.info("Loading sample data into Redis...")
-        success, stdout, stderr = execute_subprocess_with_timeout(
-            ["/opt/redisarena/load_data.sh"], timeout=300
-        )
+def _sum_matching(samples: Dict[str, List[float]], pattern: str) -> Optional[float]:
+    matched = [sum(values) for name, values in samples.items() if re.match(pattern, name)]
+    return sum(matched) if matched else None
+
+def extract_riot_progress(samples: Dict[str, List[float]], previous: Optional[Dict[str, Any]], now: float) -> Dict[str, Any]:
+    """
+    Turn one scrape into replication progress figures.
+    
+    Args:
+        samples: Parsed metrics from parse_prometheus_metrics
+        previous: Raw counters from the previous scrape (None on the first one)
+        now: Scrape time (epoch seconds)
         
-        if success:
-            return jsonify(create_json_response(
-                True, "Sample gaming data loaded successfully! RedisArena is now populated with player leaderboards and game data."
-            ))
+    Returns:
+        Dict with keys_replicated, keys_per_sec, queue_depth, lag_seconds and the raw
+        counters needed for the next rate calculation
+    """
+    keys_total = _sum_matching(samples, RIOT_METRIC_PATTERNS['keys'])
+    queue_depth = _sum_matching(samples, RIOT_METRIC_PATTERNS['queue'])
+    
+    # Lag is a timer (use the mean over the scrape interval from _sum/_count) or a gauge
+    # (use the worst series - per-job lags are not additive)
+    lag_names = [name for name in samples if re.match(RIOT_METRIC_PATTERNS['lag'], name)]
+    lag_sum = sum(sum(samples[name]) for name in lag_names if name.endswith('_sum'))
+    lag_count = sum(sum(samples[name]) for name in lag_names if name.endswith('_count'))
+    lag_gauges = [value for name in lag_names
+                  if not name.endswith(('_sum', '_count', '_bucket', '_max', '_total'))
+                  for value in samples[name]]
+    lag_seconds = None
+    if lag_count:
+        if previous and previous.get('lag_count') is not None and lag_count > previous['lag_count']:
+            lag_seconds = (lag_sum - previous['lag_sum']) / (lag_count - previous['lag_count'])
+        elif not previous:
+            lag_seconds = lag_sum / lag_count
         else:
-            return jsonify(create_json_response(False, f"Failed to load sample data: {stderr}"))
-    except Exception as e:
-        return jsonify(create_json_response(False, f"Error loading sample data: {str(e)}"))
+            lag_seconds = previous.get('lag_seconds')
+    elif lag_gauges:
+        lag_seconds = max(lag_gauges)
+    if lag_seconds is not None and lag_names and any(unit in lag_names[0] for unit in ('_ms', 'millis')):
+        lag_seconds /= 1000.0
+    
+    keys_per_sec = None
+    if keys_total is not None and previous and previous.get('keys_total') is not None and now > previous['at']:
+        # A counter reset (RIOT restarted) shows up as a negative delta
+        keys_per_sec = max(0.0, (keys_total - previous['keys_total']) / (now - previous['at']))
+    
+    return {
+        'at': now,
+        'keys_replicated': keys_total,
+        'keys_per_sec': round(keys_per_sec, 1) if keys_per_sec is not None else None,
+        'queue_depth': queue_depth,
+        'lag_seconds': round(lag_seconds, 4) if lag_seconds is not None else None,
+        'keys_total': keys_total,
+        'lag_sum': lag_sum if lag_count else None,
+        'lag_count': lag_count if lag_count else None
+    }
 
-@app.route("/api/get-app-url")
-def get_app_url():
+def scrape_riot_metrics() -> Dict[str, Any]:
+    """
+    Scrape the RIOT-X metrics endpoint once and append a point to the rolling series.
+    
+    Returns:
+        The new series point (with 'error' set and no figures if the scrape failed)
+    """
+    global _riot_previous_scrape
+    now = time.time()
     try:
-        success, public_ip, stderr = execute_subprocess_with_timeout(
-            ["curl", "-s", "http://169.254.169.254/latest/meta-data/public-ipv4"], timeout=10
-        )
-        
-        if success and public_ip:
-            url = f"http://{public_ip}:5000"
-            return jsonify(create_json_response(True, f"RedisArena available at {url}", url=url))
-        else:
-            # Fallback URL
-            fallback_url = "http://44.243.93.201:5000"
-            return jsonify(create_json_response(True, f"RedisArena available at {fallback_url}", url=fallback_url))
+        response = requests.get(get_riot_metrics_url(), timeout=float(os.getenv("RIOT_METRICS_TIMEOUT", "2")))
+        response.raise_for_status()
+        samples = parse_prometheus_metrics(response.text)
+        with _riot_series_lock:
+            progress = extract_riot_progress(samples, _riot_previous_scrape, now)
+            _riot_previous_scrape = progress
+            point = {key: progress[key] for key in ('at', 'keys_replicated', 'keys_per_sec', 'queue_depth', 'lag_seconds')}
+            _riot_series.append(point)
+        return point
     except Exception as e:
-        fallback_url = "http://44.243.93.201:5000"
-        return jsonify(create_json_response(True, f"RedisArena available at {fallback_url}", url=fallback_url))
+        point = {'at': now, 'error': str(e)}
+        with _riot_series_lock:
+            _riot_previous_scrape = None
+            _riot_series.append(point)
+        return point
 
-@app.route("/api/validate-redis-cloud", methods=["POST"])
-def validate_redis_cloud():
-    try:
-        logger.info("Validating Redis Cloud connectivity...")
-        success, stdout, stderr = execute_subprocess_with_timeout(
-            ["/home/ubuntu/do_cutover.sh", "validate"], timeout=30
-        )
+def evaluate_cutover_readiness() -> Dict[str, Any]:
+    """
+    Decide whether replication has kept up long enough to cut over safely.
+    
+    Every scrape in the last RIOT_READY_WINDOW seconds must have succeeded with lag at or
+    below RIOT_MAX_LAG_SECONDS and queue depth at or below RIOT_MAX_QUEUE_DEPTH.
+    
+    Returns:
+        Dict with ready: bool, the thresholds used, and the reasons it isn't ready
+    """
+    max_lag = float(os.getenv("RIOT_MAX_LAG_SECONDS", "1.0"))
+    max_queue = float(os.getenv("RIOT_MAX_QUEUE_DEPTH", "1000"))
+    window = float(os.getenv("RIOT_READY_WINDOW", "10"))
+    
+    now = time.time()
+    with _riot_series_lock:
+        points = [point for point in _riot_series if now - point['at'] <= window]
+        covered = bool(_riot_series) and now - _riot_series[0]['at'] >= window
+    
+    reasons = []
+    if not covered:
+        reasons.append(f"Less than {window:g}s of replication metrics collected")
+    if any('error' in point for point in points):
+        reasons.append("RIOT-X metrics endpoint not reachable")
+    lags = [point['lag_seconds'] for point in points if point.get('lag_seconds') is not None]
+    queues = [point['queue_depth'] for point in points if point.get('queue_depth') is not None]
+    if not lags and not queues:
+        reasons.append("No lag or queue metrics found on the RIOT-X endpoint")
+    if lags and max(lags) > max_lag:
+        reasons.append(f"Lag {max(lags):.3f}s exceeds {max_lag:g}s")
+    if queues and max(queues) > max_queue:
+        reasons.append(f"Queue depth {max(queues):,.0f} exceeds {max_queue:,.0f}")
+    
+    return {
+        'ready': not reasons,
+        'reasons': reasons,
+        'max_lag_seconds': max_lag,
+        'max_queue_depth': max_queue,
+        'window_seconds': window,
+        'worst_lag_seconds': max(lags) if lags else None,
+        'worst_queue_depth': max(queues) if queues else None
+    }
+
+def get_riot_metrics_series(seconds: float) -> List[Dict[str, Any]]:
+    """
+    Get the rolling series points from the last `seconds` seconds.
+    
+    Args:
+        seconds: How far back to go
         
-        if "Redis Cloud connectivity verified" in stdout:
-            return jsonify(create_json_response(True, "Redis Cloud connectivity verified successfully!"))
-        else:
-            error_msg = stderr or stdout or "Validation failed"
-            return jsonify(create_json_response(False, f"Redis Cloud PING test failed: {error_msg}"))
-    except Exception as e:
-        return jsonify(create_json_response(False, f"Error validating Redis Cloud: {str(e)}"))
+    Returns:
+        List of series points, oldest first
+    """
+    cutoff = time.time() - seconds
+    with _riot_series_lock:
+        return [point for point in _riot_series if point['at'] >= cutoff]
 
-@app.route("/api/perform-cutover", methods=["POST"])
-def perform_cutover():
-    try:
-        logger.info("Starting Redis Cloud cutover...")
-        success, stdout, stderr = execute_subprocess_with_timeout(
-            ["/home/ubuntu/do_cutover.sh", "cutover"], timeout=300
-        )
+# =============================================================================
+# CONSISTENCY CHECKER
+# =============================================================================
+
+# State of the current (or last) source/target consistency check. Only counters, the
+# current batch and a capped mismatch report are kept, so memory stays bounded.
+_consistency_state: Dict[str, Any] = {'state': 'idle'}
+_consistency_changed = threading.Condition()
+_consistency_cancel = threading.Event()
+
+def make_rate_limiter(max_per_second: float):
+    """
+    Build a token-bucket limiter shared by the checker's passes.
+    
+    Args:
+        max_per_second: Keys per second allowed (0 or less = unlimited)
         
-        if "Cutover completed successfully" in stdout:
-            return jsonify(create_json_response(
-                True, "Cutover completed successfully! RedisArena is now connected to Redis Cloud."
-            ))
-        else:
-            error_msg = stderr or "Cutover process failed"
-            return jsonify(create_json_response(False, f"Cutover failed: {error_msg}"))
-    except Exception as e:
-        return jsonify(create_json_response(False, f"Error performing cutover: {str(e)}"))
+    Returns:
+        acquire(count) function that sleeps until count keys are allowed
+    """
+    lock = threading.Lock()
+    state = {'tokens': max_per_second, 'at': time.monotonic()}
+    
+    def acquire(count: int) -> None:
+        if max_per_second <= 0:
+            return
+        with lock:
+            now = time.monotonic()
+            state['tokens'] = min(max_per_second, state['tokens'] + (now - state['at']) * max_per_second)
+            state['at'] = now
+            state['tokens'] -= count
+            wait_seconds = -state['tokens'] / max_per_second if state['tokens'] < 0 else 0
+        if wait_seconds:
+            _consistency_cancel.wait(wait_seconds)
+    return acquire
 
-@app.route("/api/perform-rollback", methods=["POST"])
-def perform_rollback():
-    try:
-        logger.info("Starting rollback to ElastiCache...")
-        success, stdout, stderr = execute_subprocess_with_timeout(
-            ["/home/ubuntu/do_cutover.sh", "rollback"], timeout=300
-        )
+def scan_key_batches(client: redis.Redis, match: str, batch_size: int, sample_rate: float):
+    """
+    SCAN a database and yield keys in batches, optionally sampling.
+    
+    Args:
+        client: Binary-safe Redis client
+        match: SCAN MATCH pattern
+        batch_size: SCAN COUNT hint and batch size
+        sample_rate: Fraction of keys to keep (1.0 = all)
         
-        if "Configuration rolled back" in stdout:
-            return jsonify(create_json_response(
-                True, "Rollback completed successfully! RedisArena is now connected to ElastiCache."
-            ))
-        else:
-            error_msg = stderr or "Rollback process failed"
-            return jsonify(create_json_response(False, f"Rollback failed: {error_msg}"))
-    except Exception as e:
-        return jsonify(create_json_response(False, f"Error performing rollback: {str(e)}"))
+    Yields:
+        Lists of keys (bytes)
+    """
+    cursor = 0
+    while True:
+        cursor, keys = client.scan(cursor=cursor, match=match, count=batch_size)
+        if sample_rate < 1.0:
+            keys = [key for key in keys if random.random() < sample_rate]
+        if keys:
+            yield keys
+        if cursor == 0 or _consistency_cancel.is_set():
+            return
 
-@app.route("/api/restart-redisarena", methods=["POST"])
-def restart_redisarena():
-    try:
-        logger.info("Restarting RedisArena application...")
-        success, stdout, stderr = execute_subprocess_with_timeout(
-            ["/home/ubuntu/do_cutover.sh", "restart"], timeout=60
-        )
+def fetch_key_details(client: redis.Redis, keys: List[bytes]) -> List[Tuple[str, int, Optional[bytes]]]:
+    """
+    Fetch TYPE, PTTL and DUMP for a batch of keys in one pipelined round trip.
+    
+    Args:
+        client: Binary-safe Redis client
+        keys: Keys to fetch
         
-        if "RedisArena service restarted successfully" in stdout or "Restarting RedisArena" in stdout:
-            return jsonify(create_json_response(True, "RedisArena application restarted successfully!"))
-        elif success:  # Check if the script ran without error even if the expected message isn't found
-            return jsonify(create_json_response(True, "Restart command executed successfully!"))
-        else:
-            error_msg = stderr or "Restart process failed"
-            return jsonify(create_json_response(False, f"Restart failed: {error_msg}"))
-    except Exception as e:
-        return jsonify(create_json_response(False, f"Error restarting application: {str(e)}"))
+    Returns:
+        List of (type, pttl, dump payload) tuples in key order
+    """
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+        pipe.pttl(key)
+        pipe.dump(key)
+    results = pipe.execute(raise_on_error=False)
+    details = []
+    for i in range(0, len(results), 3):
+        key_type, pttl, payload = results[i:i + 3]
+        key_type = key_type.decode() if isinstance(key_type, bytes) else str(key_type)
+        details.append((key_type, pttl if isinstance(pttl, int) else -2,
+                        payload if isinstance(payload, bytes) else None))
+    return details
 
-@app.route("/api/flush-elasticache", methods=["POST"])
-def flush_elasticache():
-    """Flush ElastiCache database using shared utility function"""
-    try:
-        success, message = flush_redis_database('elasticache')
-        return jsonify(create_json_response(success, message))
-    except Exception as e:
-        logger.error(f"Error in flush_elasticache endpoint: {str(e)}")
-        return jsonify(create_json_response(False, f"Error flushing ElastiCache: {str(e)}"))
+def logical_value_digest(client: redis.Redis, key: bytes, key_type: str, max_elements: int) -> Optional[str]:
+    """
+    Digest a value by its contents rather than its DUMP encoding.
+    
+    DUMP payloads differ between Redis versions and encodings (listpack vs ziplist, ...)
+    even for identical values, so a DUMP mismatch is confirmed with this before reporting.
+    Collections larger than max_elements are compared by size only to bound memory.
+    
+    Args:
+        client: Binary-safe Redis client
+        key: Key to digest
+        key_type: Its TYPE
+        max_elements: Largest collection to read in full
+        
+    Returns:
+        Hex digest (or "size:<n>" for oversized collections), None if the key is gone
+    """
+    size_commands = {'hash': client.hlen, 'list': client.llen, 'set': client.scard,
+                     'zset': client.zcard, 'stream': client.xlen}
+    if key_type in size_commands:
+        size = size_commands[key_type](key)
+        if size > max_elements:
+            return f"size:{size}"
+    
+    if key_type == 'string':
+        parts = [client.get(key)]
+    elif key_type == 'hash':
+        parts = sorted(b"%s=%s" % item for item in client.hgetall(key).items())
+    elif key_type == 'list':
+        parts = client.lrange(key, 0, -1)
+    elif key_type == 'set':
+        parts = sorted(client.smembers(key))
+    elif key_type == 'zset':
+        parts = [b"%s=%r" % (member, score) for member, score in client.zrange(key, 0, -1, withscores=True)]
+    elif key_type == 'stream':
+        parts = [repr(entry).encode() for entry in client.xrange(key)]
+    else:
+        return None
+    if parts == [None]:
+        return None
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
 
-@app.route("/api/flush-redis-cloud", methods=["POST"])
-def flush_redis_cloud():
-    """Flush Redis Cloud database using shared utility function"""
-    try:
+def compare_key_batch(source: redis.Redis, target: redis.Redis, keys: List[bytes],
+                      options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare a batch of source keys against the target.
+    
+    Args:
+        source: Binary-safe source client
+        target: Binary-safe target client
+        keys: Source keys to compare
+        options: Check options (ttl_tolerance_ms, max_elements)
+        
+    Returns:
+        List of mismatches: {'key', 'kind', 'detail'} with kind one of
+        missing_in_target, type, value, ttl
+    """
+    mismatches = []
+    source_details = fetch_key_details(source, keys)
+    target_details = fetch_key_details(target, keys)
+    
+    for key, (source_type, source_ttl, source_dump), (target_type, target_ttl, target_dump) in zip(
+            keys, source_details, target_details):
+        if source_type == 'none':
+            continue  # Expired or deleted on the source since SCAN
+        key_name = key.decode('utf-8', 'replace')
+        if target_type == 'none':
+            mismatches.append({'key': key_name, 'kind': 'missing_in_target', 'detail': source_type})
+            continue
+        if source_type != target_type:
+            mismatches.append({'key': key_name, 'kind': 'type', 'detail': f"{source_type} != {target_type}"})
+            continue
+        if source_dump != target_dump:
+            source_digest = logical_value_digest(source, key, source_type, options['max_elements'])
+            target_digest = logical_value_digest(target, key, target_type, options['max_elements'])
+            if source_digest != target_digest:
+                mismatches.append({'key': key_name, 'kind': 'value', 'detail': source_type})
+                continue
+        # TTL drift: persistent on one side only, or expiry times further apart than the tolerance
+        if (source_ttl < 0) != (target_ttl < 0) or abs(source_ttl - target_ttl) > options['ttl_tolerance_ms']:
+            mismatches.append({'key': key_name, 'kind': 'ttl', 'detail': f"{source_ttl}ms != {target_ttl}ms"})
+    return mismatches
+
+def get_consistency_state() -> Dict[str, Any]:
+    """Get a consistent copy of the check state for serialization."""
+    with _consistency_changed:
+        return json.loads(json.dumps(_consistency_state))
+
+def update_consistency_state(**changes: Any) -> None:
+    """Apply changes to the consistency check state and wake stream subscribers."""
+    with _consistency_changed:
+        _consistency_state.update(changes)
+        _consistency_state['version'] = _consistency_state.get('version', 0) + 1
+        _consistency_changed.notify_all()
+
+def record_consistency_results(scanned: int, compared: int, mismatches: List[Dict[str, Any]]) -> None:
+    """Add one batch's results to the running totals and the capped mismatch report."""
+    with _consistency_changed:
+        state = _consistency_state
+        state['scanned'] += scanned
+        state['compared'] += compared
+        for mismatch in mismatches:
+            state['mismatch_counts'][mismatch['kind']] = state['mismatch_counts'].get(mismatch['kind'], 0) + 1
+            if len(state['mismatches']) < state['options']['max_reported']:
+                state['mismatches'].append(mismatch)
+        elapsed = time.time() - state['started_at']
+        state['keys_per_sec'] = round(state['compared'] / elapsed, 1) if elapsed > 0 else 0
+        state['version'] = state.get('version', 0) + 1
+        _consistency_changed.notify_all()
+
+def run_consistency_pass(direction: str, options: Dict[str, Any], acquire) -> None:
+    """
+    Run one direction of the check.
+    
+    'forward' scans the source and compares every key with the target; 'reverse' scans
+    the target and only looks for keys that don't exist on the source.
+    
+    Args:
+        direction: 'forward' or 'reverse'
+        options: Check options
+        acquire: Rate limiter from make_rate_limiter
+    """
+    source = get_redis_client('elasticache', timeout=10, decode_responses=False)
+    target = get_redis_client('redis_cloud', timeout=10, decode_responses=False)
+    scanned_client = source if direction == 'forward' else target
+    
+    for keys in scan_key_batches(scanned_client, options['match'], options['batch_size'], options['sample_rate']):
+        if _consistency_cancel.is_set():
+            return
+        acquire(len(keys))
+        
+        if direction == 'forward':
+            mismatches = compare_key_batch(source, target, keys, options)
+            if mismatches and options['recheck_delay'] > 0:
+                # Replication is live, so give in-flight writes a moment and confirm
+                _consistency_cancel.wait(options['recheck_delay'])
+                raw_keys = {key.decode('utf-8', 'replace'): key for key in keys}
+                recheck = [raw_keys[mismatch['key']] for mismatch in mismatches]
+                mismatches = compare_key_batch(source, target, recheck, options)
+            record_consistency_results(len(keys), len(keys), mismatches)
+        else:
+            pipe = source.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(key)
+            extra = [key.decode('utf-8', 'replace') for key, exists in zip(keys, pipe.execute()) if not exists]
+            record_consistency_results(len(keys), 0, [
+                {'key': key, 'kind': 'extra_in_target', 'detail': ''} for key in extra
+            ])
+        
+        if options['max_keys'] and _consistency_state['scanned'] >= options['max_keys']:
+            return
+
+def run_consistency_check(options: Dict[str, Any]) -> None:
+    """
+    Run forward and reverse passes in parallel and record the final result.
+    
+    Args:
+        options: Check options
+    """
+    acquire = make_rate_limiter(options['max_keys_per_sec'])
+    errors = []
+    
+    def run_pass(direction: str) -> None:
+        try:
+            run_consistency_pass(direction, options, acquire)
+        except Exception as e:
+            logger.error(f"Consistency check {direction} pass failed: {e}")
+            errors.append(f"{direction}: {e}")
+    
+    passes = [threading.Thread(target=run_pass, args=(direction,), daemon=True, name=f"consistency-{direction}")
+              for direction in ('forward', 'reverse')]
+    for thread in passes:
+        thread.start()
+    for thread in passes:
+        thread.join()
+    
+    if errors:
+        state = 'failed'
+    elif _consistency_cancel.is_set():
+        state = 'cancelled'
+    else:
+        state = 'completed'
+    mismatch_total = sum(_consistency_state['mismatch_counts'].values())
+    update_consistency_state(
+        state=state,
+        finished_at=time.time(),
+        errors=errors,
+        consistent=state == 'completed' and mismatch_total == 0
+    )
+    logger.info(f"Consistency check {state}: {_consistency_state['compared']:,} keys compared, "
+                f"{mismatch_total:,} mismatches")
+
+def start_consistency_check(options: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Start a consistency check in the background unless one is already running.
+    
+    Args:
+        options: Check options (see /api/consistency-check)
+        
+    Returns:
+        Tuple of (started: bool, message: str)
+    """
+    with _consistency_changed:
+        if _consistency_state.get('state') == 'running':
+            return False, "A consistency check is already running"
+        _consistency_cancel.clear()
+        _consistency_state.clear()
+        _consistency_state.update({
+            'state': 'running',
+            'started_at': time.time(),
+            'options': options,
+            'scanned': 0,
+            'compared': 0,
+            'keys_per_sec': 0,
+            'mismatch_counts': {},
+            'mismatches': [],
+            'version': 0
+        })
+    threading.Thread(target=run_consistency_check, args=(options,), daemon=True, name="consistency-check").start()
+    return True, "Consistency check started"
+
+# =============================================================================
+# KEYSPACE NOTIFICATION TRACKER
+# =============================================================================
+
+# Both databases publish keyspace events (the ElastiCache module enables them); from those
+# we keep per-prefix write/delete/expire rates and the keys written on the source whose
+# matching target event hasn't been seen yet - a live replication gap without any scans.
+# Expirations aren't replicated (each side expires by its own TTL), so they never become
+# pending; a source expiry just retires the key.
+KSN_DELETE_EVENTS = {'del', 'unlink'}
+KSN_EXPIRE_EVENTS = {'expired', 'evicted'}
+KSN_MAX_PREFIXES = 200
+
+# RedisArena's key families; most put a player name, UUID or counter right after the
+# family (e.g. 'rate:{player}:{n}'), so prefixes can't simply be the first N segments.
+# Other keys fall back to their leading fixed-token segments (lowercase words).
+KSN_KEY_FAMILIES = sorted(
+    os.getenv("KSN_KEY_FAMILIES", ",".join([
+        'user:session', 'leaderboard:global', 'online:players', 'messages:global',
+        'analytics:realtime', 'analytics:event', 'temp:match', 'temp:lobby', 'temp:session',
+        'temp:data', 'event:temp', 'cache:rapid', 'cache:update', 'cache:item', 'game:lobby',
+        'migration:demo', 'purchase', 'notification', 'achievement', 'ratelimit', 'rate'
+    ])).split(","),
+    key=len, reverse=True
+)
+KSN_TOKEN_PATTERN = re.compile(r"[a-z][a-z_]*")
+
+_ksn_lock = threading.Lock()
+_ksn_rate_window = int(os.getenv("KSN_RATE_WINDOW", "10"))
+_ksn_prefix_depth = int(os.getenv("KSN_PREFIX_DEPTH", "2"))
+_ksn_buckets: Dict[str, deque] = {side: deque(maxlen=_ksn_rate_window + 1) for side in ('elasticache', 'redis_cloud')}
+_ksn_pending: "OrderedDict[str, float]" = OrderedDict()
+_ksn_delays: deque = deque(maxlen=1000)
+_ksn_counters = {'matched': 0, 'aged_out': 0, 'overflow': 0}
+_ksn_sides: Dict[str, Dict[str, Any]] = {
+    side: {'connected': False, 'events': 0, 'last_event_at': None, 'error': None}
+    for side in ('elasticache', 'redis_cloud')
+}
+_ksn_prefixes: set = set()
+
+def keyspace_prefix(key: str) -> str:
+    """
+    Reduce a key to its family prefix, leaving out player names and other IDs.
+    
+    Known KSN_KEY_FAMILIES win; otherwise up to KSN_PREFIX_DEPTH leading segments are
+    kept while they look like fixed tokens, and the last segment is always dropped.
+    
+    Args:
+        key: Redis key (e.g. 'user:session:Shadow_Warrior' or 'rate:Shadow_Warrior:42')
+        
+    Returns:
+        Prefix such as 'user:session' or 'rate', or 'other' for keys without a family and
+        once KSN_MAX_PREFIXES are tracked
+    """
+    prefix = next((family for family in KSN_KEY_FAMILIES
+                   if key == family or key.startswith(family + ':')), None)
+    if prefix is None:
+        tokens = []
+        for segment in key.split(':')[:-1][:_ksn_prefix_depth]:
+            if not KSN_TOKEN_PATTERN.fullmatch(segment):
+                break
+            tokens.append(segment)
+        prefix = ':'.join(tokens) or 'other'
+    if prefix not in _ksn_prefixes:
+        if len(_ksn_prefixes) >= KSN_MAX_PREFIXES:
+            return 'other'
+        _ksn_prefixes.add(prefix)
+    return prefix
+
+def record_keyspace_event(side: str, event: str, key: str, now: float) -> None:
+    """
+    Count one keyspace event and update the source/target pending set.
+    
+    Args:
+        side: 'elasticache' (source) or 'redis_cloud' (target)
+        event: Keyevent name (set, hset, del, expired, ...)
+        key: Affected key
+        now: Event receive time (epoch seconds)
+    """
+    kind = 'delete' if event in KSN_DELETE_EVENTS else 'expire' if event in KSN_EXPIRE_EVENTS else 'write'
+    second = int(now)
+    with _ksn_lock:
+        buckets = _ksn_buckets[side]
+        if not buckets or buckets[-1][0] != second:
+            buckets.append((second, {}))
+        counts = buckets[-1][1].setdefault(keyspace_prefix(key), {'write': 0, 'delete': 0, 'expire': 0})
+        counts[kind] += 1
+        
+        status = _ksn_sides[side]
+        status['events'] += 1
+        status['last_event_at'] = now
+        
+        if side == 'elasticache' and kind == 'expire':
+            _ksn_pending.pop(key, None)
+        elif side == 'elasticache':
+            _ksn_pending[key] = now
+            _ksn_pending.move_to_end(key)
+            if len(_ksn_pending) > int(os.getenv("KSN_PENDING_MAX", "100000")):
+                _ksn_pending.popitem(last=False)
+                _ksn_counters['overflow'] += 1
+        else:
+            seen_at = _ksn_pending.pop(key, None)
+            if seen_at is not None:
+                _ksn_counters['matched'] += 1
+                _ksn_delays.append(now - seen_at)
+
+def keyspace_listener_loop(side: str) -> None:
+    """
+    Subscribe to one database's keyevent notifications, reconnecting on failure.
+    
+    Args:
+        side: 'elasticache' or 'redis_cloud'
+    """
+    db = int(os.getenv("KSN_DB", "0"))
+    while True:
+        pubsub = None
+        try:
+            client = get_redis_client(side, timeout=10)
+            if os.getenv("KSN_AUTO_CONFIGURE", "false").lower() == "true":
+                try:
+                    client.config_set('notify-keyspace-events', 'KEA')
+                except Exception as e:
+                    logger.warning(f"Could not enable keyspace notifications on {side}: {e}")
+            
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(f"__keyevent@{db}__:*")
+            with _ksn_lock:
+                _ksn_sides[side].update(connected=True, error=None)
+            logger.info(f"👂 Tracking keyspace notifications on {side}")
+            
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message['type'] == 'pmessage':
+                    event = message['channel'].split(':', 1)[1]
+                    record_keyspace_event(side, event, message['data'], time.time())
+        except Exception as e:
+            logger.error(f"Keyspace notification listener for {side} failed: {e}")
+            with _ksn_lock:
+                _ksn_sides[side].update(connected=False, error=str(e))
+            time.sleep(5)
+        finally:
+            if pubsub:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+def start_keyspace_tracking() -> None:
+    """Start a keyspace notification listener thread for each database."""
+    for side in ('elasticache', 'redis_cloud'):
+        threading.Thread(target=keyspace_listener_loop, args=(side,), daemon=True, name=f"ksn-{side}").start()
+
+def get_keyspace_gap() -> Dict[str, Any]:
+    """
+    Summarize keyspace activity and the estimated replication gap.
+    
+    Pending source keys older than KSN_PENDING_TTL seconds are retired as aged out -
+    either replication missed them or the target event was lost.
+    
+    Returns:
+        Dict with per-side status and per-prefix rates, the pending key count, the oldest
+        pending age and observed source-to-target delays
+    """
+    now = time.time()
+    pending_ttl = float(os.getenv("KSN_PENDING_TTL", "20"))
+    with _ksn_lock:
+        while _ksn_pending:
+            seen_at = next(iter(_ksn_pending.values()))
+            if now - seen_at <= pending_ttl:
+                break
+            _ksn_pending.popitem(last=False)
+            _ksn_counters['aged_out'] += 1
+        
+        rates = {}
+        for side, buckets in _ksn_buckets.items():
+            # Skip the current, still-filling second
+            totals: Dict[str, Dict[str, float]] = {}
+            for second, counts in buckets:
+                if now - second > _ksn_rate_window or second == int(now):
+                    continue
+                for prefix, kinds in counts.items():
+                    prefix_totals = totals.setdefault(prefix, {'write': 0, 'delete': 0, 'expire': 0})
+                    for kind, count in kinds.items():
+                        prefix_totals[kind] += count
+            rates[side] = {
+                prefix: {kind: round(count / _ksn_rate_window, 1) for kind, count in kinds.items()}
+                for prefix, kinds in sorted(totals.items())
+            }
+        
+        delays = sorted(_ksn_delays)
+        oldest = next(iter(_ksn_pending.values())) if _ksn_pending else None
+        return {
+            'sides': {side: dict(status) for side, status in _ksn_sides.items()},
+            'rates_per_sec': rates,
+            'pending_keys': len(_ksn_pending),
+            'oldest_pending_seconds': round(now - oldest, 3) if oldest else 0.0,
+            'replication_delay_p50_ms': round(delays[len(delays) // 2] * 1000, 1) if delays else None,
+            'replication_delay_p99_ms': round(delays[int(len(delays) * 0.99)] * 1000, 1) if delays else None,
+            **_ksn_counters
+        }
+
+def count_pending_keys(written_before: float) -> int:
+    """
+    Count source keys written before a point in time that the target hasn't echoed yet.
+    
+    Args:
+        written_before: Epoch seconds; later source writes are ignored
+        
+    Returns:
+        Number of such pending keys
+    """
+    count = 0
+    with _ksn_lock:
+        # Pending keys are ordered by when they were last written on the source
+        for seen_at in _ksn_pending.values():
+            if seen_at > written_before:
+                break
+            count += 1
+    return count
+
+# =============================================================================
+# CUTOVER ORCHESTRATOR
+# =============================================================================
+
+# The cutover runs here as timed steps instead of in do_cutover.sh: freeze writes in
+# RedisArena, wait for replication to drain, repoint its .env, hot-swap (or restart) and
+# confirm the first write lands on the target. The last run's timeline is kept for the UI.
+CUTOVER_COUNTER_KEY = 'migration:demo:counter'
+_cutover_lock = threading.Lock()
+_last_cutover: Optional[Dict[str, Any]] = None
+
+def get_redisarena_api_url() -> str:
+    """Get the RedisArena API base URL (the app runs on this host by default)."""
+    return os.getenv("REDISARENA_API_URL", "http://localhost:5000").rstrip('/')
+
+def call_redisarena_api(method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                        timeout: float = 10) -> Dict[str, Any]:
+    """
+    Call the RedisArena API and unwrap its {'success': ...} envelope.
+    
+    Args:
+        method: HTTP method
+        path: API path, e.g. '/api/write-freeze'
+        payload: Optional JSON body
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Decoded response body
+        
+    Raises:
+        RuntimeError: If RedisArena reports failure
+    """
+    response = requests.request(method, f"{get_redisarena_api_url()}{path}", json=payload, timeout=timeout)
+    response.raise_for_status()
+    body = response.json()
+    if not body.get('success'):
+        raise RuntimeError(body.get('error') or body.get('message') or f"{method} {path} failed")
+    return body
+
+def run_cutover_step(timeline: List[Dict[str, Any]], started: float, name: str, action) -> Dict[str, Any]:
+    """
+    Run one cutover step and append its timing to the timeline.
+    
+    Args:
+        timeline: Step list being built for this cutover
+        started: perf_counter() at the start of the cutover
+        name: Step name
+        action: Callable returning a dict of step details
+        
+    Returns:
+        The step details
+    """
+    entry = {'step': name, 'started_at': datetime.now().isoformat(),
+             'offset_ms': round((time.perf_counter() - started) * 1000, 1)}
+    step_started = time.perf_counter()
+    try:
+        detail = action() or {}
+        entry.update(ok=True, detail=detail)
+        return detail
+    except Exception as e:
+        entry.update(ok=False, error=str(e))
+        raise
+    finally:
+        entry['duration_ms'] = round((time.perf_counter() - step_started) * 1000, 1)
+        timeline.append(entry)
+        append_job_output(f"+{entry['offset_ms']}ms {name}: {'ok' if entry['ok'] else 'failed - ' + entry['error']} "
+                          f"({entry['duration_ms']}ms)")
+        logger.info(f"Cutover step {name}: {'ok' if entry['ok'] else 'failed'} in {entry['duration_ms']}ms")
+
+def wait_for_replication_catchup(frozen_at: float, timeout: float, poll_interval: float) -> Dict[str, Any]:
+    """
+    Poll until nothing written on the source is still on its way to the target.
+    
+    Caught up means the demo counter matches on both sides, the keyspace tracker (when
+    both sides are connected) has no pending keys written before the freeze and the
+    RIOT-X queue is empty - or its lag gauge is zero when no queue metric is exported.
+    
+    Args:
+        frozen_at: Epoch seconds when the write freeze had drained
+        timeout: Seconds to wait before giving up
+        poll_interval: Seconds between polls
+        
+    Returns:
+        Dict with the number of polls and the demo counter value both sides agree on
+        
+    Raises:
+        RuntimeError: If replication hasn't caught up within the timeout
+    """
+    source = get_redis_client('elasticache', timeout=2)
+    target = get_redis_client('redis_cloud', timeout=2)
+    deadline = time.perf_counter() + timeout
+    polls = 0
+    while True:
+        polls += 1
+        waiting = []
+        source_counter, target_counter = source.get(CUTOVER_COUNTER_KEY), target.get(CUTOVER_COUNTER_KEY)
+        if source_counter != target_counter:
+            waiting.append(f"{CUTOVER_COUNTER_KEY} source={source_counter} target={target_counter}")
+        
+        # get_keyspace_gap() also retires pending keys older than KSN_PENDING_TTL
+        gap = get_keyspace_gap()
+        pending = count_pending_keys(frozen_at)
+        if all(side['connected'] for side in gap['sides'].values()) and pending:
+            waiting.append(f"{pending} source keys not yet seen on the target")
+        
+        point = scrape_riot_metrics()
+        if point.get('queue_depth'):
+            waiting.append(f"RIOT-X queue depth {point['queue_depth']:,.0f}")
+        elif point.get('queue_depth') is None and point.get('lag_seconds'):
+            waiting.append(f"RIOT-X lag {point['lag_seconds']:.3f}s")
+        
+        if not waiting:
+            return {
+                'polls': polls,
+                'demo_counter': int(source_counter or 0),
+                'riot_metrics_available': 'error' not in point,
+                'keyspace_pending': pending
+            }
+        if time.perf_counter() >= deadline:
+            raise RuntimeError(f"Replication did not catch up within {timeout:g}s: {'; '.join(waiting)}")
+        time.sleep(poll_interval)
+
+def rewrite_app_env(env_file: str, updates: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Back up RedisArena's .env and replace the given settings in place.
+    
+    Every call keeps a timestamped snapshot for its own rollback. `.env.backup`, the
+    file `do_cutover.sh rollback` restores, is only refreshed while the .env doesn't
+    already hold the updates, so re-running a cutover never replaces the pre-cutover
+    config with the target's. The new file is written beside the old one and renamed
+    over it, so the app's .env watcher never reads half a file.
+    
+    Args:
+        env_file: Path to RedisArena's .env
+        updates: Settings to set (appended when missing)
+        
+    Returns:
+        Dict with the backup paths and the keys written
+    """
+    backup_file = f"{env_file}.backup"
+    snapshot_file = f"{env_file}.backup.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    with open(env_file, 'r') as f:
+        lines = f.read().splitlines()
+    shutil.copy2(env_file, snapshot_file)
+    
+    current = dict(
+        (part.strip() for part in line.split('=', 1))
+        for line in lines if '=' in line and not line.lstrip().startswith('#')
+    )
+    # Already cut over: the existing backup is still the one a rollback needs
+    backup_updated = any(current.get(key) != value for key, value in updates.items())
+    if backup_updated:
+        shutil.copy2(env_file, backup_file)
+    
+    written = set()
+    for index, line in enumerate(lines):
+        key = line.split('=', 1)[0].strip()
+        if '=' in line and not line.lstrip().startswith('#') and key in updates:
+            lines[index] = f"{key}={updates[key]}"
+            written.add(key)
+    lines.extend(f"{key}={value}" for key, value in updates.items() if key not in written)
+    
+    temp_file = f"{env_file}.tmp"
+    with open(temp_file, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    shutil.copymode(snapshot_file, temp_file)
+    os.replace(temp_file, env_file)
+    return {'backup_file': backup_file, 'backup_updated': backup_updated,
+            'snapshot_file': snapshot_file, 'keys': sorted(updates)}
+
+def wait_for_app_backend(backend: str, timeout: float, poll_interval: float) -> Dict[str, Any]:
+    """
+    Wait until RedisArena answers and reports the given backend.
+    
+    Args:
+        backend: Expected host:port
+        timeout: Seconds to wait
+        poll_interval: Seconds between polls
+        
+    Returns:
+        The GET /api/switch-backend response
+        
+    Raises:
+        RuntimeError: If the app isn't on the backend within the timeout
+    """
+    deadline = time.perf_counter() + timeout
+    last_error = "no response"
+    while time.perf_counter() < deadline:
+        try:
+            body = call_redisarena_api('GET', '/api/switch-backend', timeout=2)
+            if body.get('current_backend') == backend:
+                return body
+            last_error = f"still on {body.get('current_backend')}"
+        except Exception as e:
+            last_error = str(e)
+        time.sleep(poll_interval)
+    raise RuntimeError(f"RedisArena not on {backend} after {timeout:g}s ({last_error})")
+
+def wait_for_target_write(baseline: int, timeout: float, poll_interval: float) -> Dict[str, Any]:
+    """
+    Poll the target until the demo counter moves past the value replication left there.
+    
+    Args:
+        baseline: Demo counter value when writes were frozen
+        timeout: Seconds to wait
+        poll_interval: Seconds between polls
+        
+    Returns:
+        Dict with the counter value seen on the target
+        
+    Raises:
+        RuntimeError: If no write shows up on the target within the timeout
+    """
+    target = get_redis_client('redis_cloud', timeout=2)
+    deadline = time.perf_counter() + timeout
+    while True:
+        value = int(target.get(CUTOVER_COUNTER_KEY) or 0)
+        if value > baseline:
+            return {'demo_counter': value}
+        if time.perf_counter() >= deadline:
+            raise RuntimeError(f"No write reached the target within {timeout:g}s ({CUTOVER_COUNTER_KEY}={value})")
+        time.sleep(poll_interval)
+
+def run_cutover(mode: str) -> Dict[str, Any]:
+    """
+    Cut RedisArena over to Redis Cloud and measure how long writes were unavailable.
+    
+    Steps: validate the target, freeze writes, wait for replication to catch up, rewrite
+    the app's .env, hot-swap (or restart) the app, then verify the first write on the
+    target. A failure before the app has switched restores the .env and thaws writes on
+    the source.
+    
+    Args:
+        mode: 'hot_swap' (POST /api/switch-backend) or 'restart' (systemctl restart)
+        
+    Returns:
+        Dict with success, the step timeline and the write-unavailability window
+    """
+    global _last_cutover
+    catchup_timeout = float(os.getenv("CUTOVER_CATCHUP_TIMEOUT", "30"))
+    first_write_timeout = float(os.getenv("CUTOVER_FIRST_WRITE_TIMEOUT", "15"))
+    poll_interval = float(os.getenv("CUTOVER_POLL_INTERVAL", "0.1"))
+    env_file = os.getenv("REDISARENA_ENV_FILE", "/opt/redisarena/.env")
+    
+    target = get_redis_connection_config('redis_cloud')
+    target_backend = f"{target['host']}:{target['port']}"
+    started = time.perf_counter()
+    timeline: List[Dict[str, Any]] = []
+    result: Dict[str, Any] = {'success': False, 'mode': mode, 'target_backend': target_backend,
+                              'started_at': datetime.now().isoformat(), 'timeline': timeline}
+    frozen = config_switched = app_switched = False
+    try:
+        run_cutover_step(timeline, started, 'validate_target',
+                         lambda: {'ping': get_redis_client('redis_cloud').ping()})
+        app_state = run_cutover_step(timeline, started, 'check_app', lambda: {
+            'backend': call_redisarena_api('GET', '/api/switch-backend')['current_backend'],
+            'simulation_running': call_redisarena_api('GET', '/api/stop-simulation')['status'].get('state') == 'running'
+        })
+        
+        freeze_requested = time.perf_counter()
+        freeze = run_cutover_step(timeline, started, 'freeze_writes', lambda: call_redisarena_api(
+            'POST', '/api/write-freeze',
+            {'max_seconds': catchup_timeout + first_write_timeout + 30}))
+        frozen = True
+        
+        catchup = run_cutover_step(timeline, started, 'wait_for_replication',
+                                   lambda: wait_for_replication_catchup(time.time(), catchup_timeout, poll_interval))
+        
+        env_backup = run_cutover_step(timeline, started, 'switch_config', lambda: rewrite_app_env(env_file, {
+            'REDIS_HOST': target['host'], 'REDIS_PORT': target['port'], 'REDIS_PASSWORD': target['password']
+        }))
+        config_switched = True
+        
+        if mode == 'restart':
+            def restart_app():
+                success, _, stderr = execute_subprocess_with_timeout(
+                    ["sudo", "systemctl", "restart", "redisarena"], timeout=60)
+                if not success:
+                    raise RuntimeError(f"systemctl restart failed: {stderr}")
+                body = wait_for_app_backend(target_backend, 60, 0.5)
+                # RedisArena auto-resumes on startup when the demo counter is set; only start
+                # it ourselves if it came back idle
+                resumed = call_redisarena_api('GET', '/api/stop-simulation')['status'].get('state') == 'running'
+                if app_state['simulation_running'] and not resumed:
+                    call_redisarena_api('POST', '/api/start-simulation')
+                return {'current_backend': body['current_backend'], 'auto_resumed': resumed}
+            swap = run_cutover_step(timeline, started, 'restart_app', restart_app)
+        else:
+            def hot_swap():
+                body = call_redisarena_api('POST', '/api/switch-backend', {
+                    'host': target['host'], 'port': int(target['port']), 'password': target['password']
+                })
+                if not body.get('switched'):
+                    # The app's .env watcher got there first - its switch ended the freeze
+                    body = {**wait_for_app_backend(target_backend, 5, poll_interval)['last_switch'], 'switched': False}
+                return body
+            swap = run_cutover_step(timeline, started, 'hot_swap', hot_swap)
+        frozen, app_switched = False, True
+        
+        if app_state['simulation_running']:
+            run_cutover_step(timeline, started, 'verify_first_write',
+                             lambda: wait_for_target_write(catchup['demo_counter'], first_write_timeout, poll_interval))
+            result['observed_write_unavailable_ms'] = round((time.perf_counter() - freeze_requested) * 1000, 1)
+            if mode != 'restart':
+                # The app's own monotonic measure: gate closed -> reopened -> first successful batch
+                last_switch = call_redisarena_api('GET', '/api/switch-backend')['last_switch'] or {}
+                if last_switch.get('write_freeze_ms') is not None and last_switch.get('first_write_ms') is not None:
+                    result['write_unavailable_ms'] = round(last_switch['write_freeze_ms'] + last_switch['first_write_ms'], 1)
+            result['write_unavailable_ms'] = result.get('write_unavailable_ms', result['observed_write_unavailable_ms'])
+        else:
+            result['write_unavailable_ms'] = swap.get('switch_gap_ms', timeline[-1]['duration_ms'])
+        result.update(success=True, drain_ms=freeze.get('drain_ms'), replication_polls=catchup['polls'])
+    except Exception as e:
+        logger.error(f"Cutover failed: {e}")
+        result['error'] = str(e)
+        if not app_switched:
+            def rollback():
+                actions = []
+                if config_switched:
+                    shutil.copy2(env_backup['snapshot_file'], env_file)
+                    actions.append('restored .env')
+                if frozen:
+                    call_redisarena_api('DELETE', '/api/write-freeze')
+                    actions.append('thawed writes on the source')
+                return {'actions': actions}
+            try:
+                run_cutover_step(timeline, started, 'rollback', rollback)
+            except Exception as rollback_error:
+                result['rollback_error'] = str(rollback_error)
+    finally:
+        result['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        _last_cutover = result
+        request_metrics_refresh()
+    return result
+
+def start_cutover(mode: str) -> Optional[Dict[str, Any]]:
+    """
+    Run a cutover unless one is already in progress.
+    
+    Args:
+        mode: 'hot_swap' or 'restart'
+        
+    Returns:
+        The cutover result, or None if another cutover is running
+    """
+    if not _cutover_lock.acquire(blocking=False):
+        return None
+    try:
+        return run_cutover(mode)
+    finally:
+        _cutover_lock.release()
+
+# =============================================================================
+# BACKGROUND METRICS COLLECTOR
+# =============================================================================
+
+# Latest payload per section, refreshed by one collector thread each. Routes serve these
+# instead of doing live Redis/SSH/file work per request; the SSE stream pushes every change.
+_metrics_snapshot: Dict[str, Dict[str, Any]] = {}
+_metrics_version = 0
+_metrics_changed = threading.Condition()
+_metrics_refresh_events: Dict[str, threading.Event] = {}
+
+def build_database_stats_payload() -> Dict[str, Any]:
+    """
+    Probe both databases and build the /api/get-database-stats response.
+    
+    Returns:
+        Dict containing the response
+    """
+    # Probe both databases concurrently; a slow one is reported as timed out
+    stats, partial = collect_database_stats(
+        ['elasticache', 'redis_cloud'], timeout=float(os.getenv("STATS_DEADLINE_SECONDS", "2"))
+    )
+    
+    return create_json_response(
+        True, "Database statistics retrieved successfully" if not partial
+        else "Database statistics partially retrieved (some databases did not respond)",
+        elasticache=stats['elasticache'],
+        redis_cloud=stats['redis_cloud'],
+        partial=partial,
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
+
+def build_riot_status_payload() -> Dict[str, Any]:
+    """
+    Check the RIOT process and build the /api/riot-status response.
+    
+    Returns:
+        Dict containing the response
+    """
+    try:
+        is_running, stdout = check_riot_process_running()
+        return create_json_response(
+            True, "RIOT is running" if is_running else "RIOT is not running",
+            running=is_running
+        )
+    except Exception as e:
+        logger.error(f"Error checking RIOT status: {e}")
+        return create_json_response(False, f"Error: {str(e)}", running=False)
+
+def build_config_payload() -> Dict[str, Any]:
+    """
+    Read the RedisArena .env file and build the /api/get-config response.
+    
+    Returns:
+        Dict containing the response
+    """
+    # Read the .env file
+    env_file_path = "/opt/redisarena/.env"
+    if not os.path.exists(env_file_path):
+        return create_json_response(False, f"Configuration file not found: {env_file_path}")
+    
+    with open(env_file_path, 'r') as f:
+        env_content = f.read()
+    
+    # Parse Redis configuration
+    redis_config = parse_redis_config_from_env(env_content)
+    backend_type = determine_backend_type(redis_config["host"])
+    
+    # Create formatted displays
+    config_display = f"""📁 Configuration File Path: {env_file_path}
+
+📄 Current Configuration:
+{env_content}
+
+📊 Redis Connection Summary:{create_config_summary(redis_config, backend_type)}"""
+    
+    app_connection_code = create_app_connection_code(redis_config, backend_type)
+
+    return create_json_response(
+        True, "Configuration retrieved successfully",
+        config=config_display,
+        app_connection_code=app_connection_code,
+        file_path=env_file_path,
+        backend_type=backend_type
+    )
+
+def build_riot_metrics_payload() -> Dict[str, Any]:
+    """
+    Scrape RIOT-X metrics and build the /api/riot-metrics response.
+    
+    Returns:
+        Dict containing the response
+    """
+    point = scrape_riot_metrics()
+    readiness = evaluate_cutover_readiness()
+    if 'error' in point:
+        return create_json_response(
+            False, f"RIOT-X metrics unavailable: {point['error']}", current=point, readiness=readiness
+        )
+    return create_json_response(
+        True, "Safe to cut over" if readiness['ready'] else "Not ready: " + "; ".join(readiness['reasons']),
+        current=point,
+        readiness=readiness
+    )
+
+def build_replication_gap_payload() -> Dict[str, Any]:
+    """
+    Build the /api/replication-gap response from keyspace notification tracking.
+    
+    Returns:
+        Dict containing the response
+    """
+    gap = get_keyspace_gap()
+    connected = all(side['connected'] for side in gap['sides'].values())
+    return create_json_response(
+        connected, f"{gap['pending_keys']:,} source changes not yet seen on the target" if connected
+        else "Keyspace notification tracking is not connected to both databases",
+        **gap
+    )
+
+# section -> (payload builder, env var for its refresh interval, default interval in seconds)
+METRICS_SECTIONS = {
+    'database_stats': (build_database_stats_payload, "STATS_POLL_INTERVAL", "1"),
+    'riot_status': (build_riot_status_payload, "RIOT_POLL_INTERVAL", "5"),
+    'riot_metrics': (build_riot_metrics_payload, "RIOT_METRICS_INTERVAL", "2"),
+    'replication_gap': (build_replication_gap_payload, "KSN_POLL_INTERVAL", "1"),
+    'config': (build_config_payload, "CONFIG_POLL_INTERVAL", "5")
+}
+
+def publish_metrics(section: str, payload: Dict[str, Any]) -> None:
+    """
+    Store a freshly collected payload and wake SSE subscribers.
+    
+    Args:
+        section: Snapshot section name (a METRICS_SECTIONS key)
+        payload: Response dict for that section
+    """
+    global _metrics_version
+    with _metrics_changed:
+        previous = _metrics_snapshot.get(section)
+        _metrics_snapshot[section] = {**payload, 'collected_at': time.time()}
+        # Only wake subscribers when something other than the collection time changed
+        if previous is None or {**previous, 'collected_at': None} != {**payload, 'collected_at': None}:
+            _metrics_version += 1
+            _metrics_changed.notify_all()
+
+def get_metrics_snapshot(section: str) -> Dict[str, Any]:
+    """
+    Get the cached payload for a section, collecting it live if the collector hasn't yet.
+    
+    Args:
+        section: Snapshot section name (a METRICS_SECTIONS key)
+        
+    Returns:
+        Response dict with collected_at and age_seconds added (always live when the
+        collector isn't running, e.g. when imported rather than run as a script)
+    """
+    payload = _metrics_snapshot.get(section)
+    if payload is None or section not in _metrics_refresh_events:
+        publish_metrics(section, METRICS_SECTIONS[section][0]())
+        payload = _metrics_snapshot[section]
+    return {**payload, 'age_seconds': round(time.time() - payload['collected_at'], 3)}
+
+def request_metrics_refresh(*sections: str) -> None:
+    """
+    Wake collectors early after an operation that changes what they report.
+    
+    Args:
+        *sections: Sections to refresh (all sections if none given)
+    """
+    for section in sections or METRICS_SECTIONS:
+        event = _metrics_refresh_events.get(section)
+        if event:
+            event.set()
+
+def metrics_collector_loop(section: str, interval: float) -> None:
+    """
+    Refresh one snapshot section every interval seconds (or sooner when requested).
+    
+    Args:
+        section: Snapshot section name (a METRICS_SECTIONS key)
+        interval: Refresh interval in seconds
+    """
+    builder = METRICS_SECTIONS[section][0]
+    refresh_event = _metrics_refresh_events[section]
+    while True:
+        refresh_event.clear()
+        try:
+            publish_metrics(section, builder())
+        except Exception as e:
+            logger.error(f"Error collecting {section}: {e}")
+            publish_metrics(section, create_json_response(False, f"Error collecting {section}: {str(e)}"))
+        refresh_event.wait(interval)
+
+def start_metrics_collector() -> None:
+    """Start one daemon collector thread per snapshot section."""
+    for section, (_, interval_var, default_interval) in METRICS_SECTIONS.items():
+        interval = float(os.getenv(interval_var, default_interval))
+        _metrics_refresh_events[section] = threading.Event()
+        threading.Thread(
+            target=metrics_collector_loop, args=(section, interval),
+            daemon=True, name=f"collector-{section}"
+        ).start()
+        logger.info(f"📡 Collecting {section} every {interval}s")
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+
+# Long operations (data load, cutover, rollback, restarts) can run on a small worker pool
+# and be tracked by job ID, so the request returns at once and no server thread is held
+# for minutes. Operations that touch the same thing share a group and never overlap.
+JOB_GROUPS = {
+    'start_redisarena': 'app_service',
+    'restart_redisarena': 'app_service',
+    'perform_cutover': 'backend',
+    'perform_rollback': 'backend',
+    'load_data': 'load_data'
+}
+_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_jobs_lock = threading.Lock()
+_job_executor = ThreadPoolExecutor(max_workers=int(os.getenv("JOB_MAX_WORKERS", "4")), thread_name_prefix="job")
+
+# Live output per job: a bounded ring of (sequence, line); sequence numbers keep growing
+# past evicted lines so a reconnecting stream can resume from the last one it saw
+_job_outputs: Dict[str, Dict[str, Any]] = {}
+_job_output_changed = threading.Condition()
+_job_context = threading.local()
+
+def append_job_output(line: str) -> None:
+    """Append a line to the output of the job running on this thread (no-op outside jobs)."""
+    job_id = getattr(_job_context, 'job_id', None)
+    if job_id is None:
+        return
+    with _job_output_changed:
+        output = _job_outputs.get(job_id)
+        if output is not None:
+            output['lines'].append((output['next_seq'], line))
+            output['next_seq'] += 1
+            _job_output_changed.notify_all()
+
+def get_job_output(job_id: str, after: int = -1) -> List[Tuple[int, str]]:
+    """
+    Get a job's buffered output lines.
+    
+    Args:
+        job_id: Job to read
+        after: Only return lines with a higher sequence number
+        
+    Returns:
+        List of (sequence, line), oldest first
+    """
+    with _job_output_changed:
+        output = _job_outputs.get(job_id)
+        return [entry for entry in output['lines'] if entry[0] > after] if output else []
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Get a copy of a job record, or None if it's unknown or was pruned."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+def list_jobs() -> List[Dict[str, Any]]:
+    """Get copies of all retained job records, newest first."""
+    with _jobs_lock:
+        return [dict(job) for job in reversed(_jobs.values())]
+
+def run_job(job_id: str, action, args: Tuple) -> None:
+    """
+    Execute a job's action and record its outcome.
+    
+    Args:
+        job_id: Job to run
+        action: Operation returning a create_json_response() dict
+        args: Positional arguments for the action
+    """
+    started = time.time()
+    with _jobs_lock:
+        _jobs[job_id].update(state='running', started_at=datetime.fromtimestamp(started).isoformat())
+    _job_context.job_id = job_id
+    try:
+        result = action(*args)
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        result = create_json_response(False, f"Job failed: {str(e)}")
+    finally:
+        _job_context.job_id = None
+    with _jobs_lock:
+        _jobs[job_id].update(
+            state='succeeded' if result.get('success') else 'failed',
+            finished_at=datetime.now().isoformat(),
+            duration_ms=round((time.time() - started) * 1000, 1),
+            result=result
+        )
+    # Wake output streams so they can send the final state
+    with _job_output_changed:
+        _job_output_changed.notify_all()
+
+def submit_job(kind: str, action, *args: Any) -> Tuple[Dict[str, Any], bool]:
+    """
+    Queue an operation as a background job unless one in its group is still active.
+    
+    Args:
+        kind: Operation name (a JOB_GROUPS key)
+        action: Operation returning a create_json_response() dict
+        *args: Positional arguments for the action
+        
+    Returns:
+        Tuple of (job record, created: bool) - the active conflicting job when not created
+    """
+    group = JOB_GROUPS.get(kind, kind)
+    with _jobs_lock:
+        for job in _jobs.values():
+            if job['group'] == group and job['state'] in ('queued', 'running'):
+                return dict(job), False
+        
+        job_id = os.urandom(6).hex()
+        _jobs[job_id] = {
+            'id': job_id, 'kind': kind, 'group': group, 'state': 'queued',
+            'created_at': datetime.now().isoformat(), 'started_at': None, 'finished_at': None,
+            'duration_ms': None, 'result': None
+        }
+        # Forget the oldest finished jobs beyond the history limit
+        excess = max(0, len(_jobs) - int(os.getenv("JOB_HISTORY", "50")))
+        finished = [jid for jid, job in _jobs.items() if job['state'] not in ('queued', 'running')]
+        for old_id in finished[:excess]:
+            del _jobs[old_id]
+        job = dict(_jobs[job_id])
+    
+    with _job_output_changed:
+        _job_outputs[job_id] = {'lines': deque(maxlen=int(os.getenv("JOB_OUTPUT_LINES", "1000"))), 'next_seq': 0}
+        for old_id in [jid for jid in _job_outputs if jid not in _jobs]:
+            del _job_outputs[old_id]
+    
+    _job_executor.submit(run_job, job_id, action, args)
+    logger.info(f"Job {job_id} queued: {kind}")
+    return job, True
+
+def dispatch_operation(kind: str, action, *args: Any):
+    """
+    Run an operation as a background job, or inline when the request asks to wait.
+    
+    By default answers 202 with the job ID (409 if the operation's group is busy);
+    poll /api/jobs/<id>. ?wait=true or "wait": true in the JSON body runs it inline
+    and returns the result, holding the request until the operation finishes.
+    
+    Args:
+        kind: Operation name (a JOB_GROUPS key)
+        action: Operation returning a create_json_response() dict
+        *args: Positional arguments for the action
+        
+    Returns:
+        Flask response
+    """
+    data = request.get_json(silent=True) or {}
+    if str(request.args.get('wait', data.get('wait', False))).lower() in ('1', 'true'):
+        return jsonify(action(*args))
+    
+    job, created = submit_job(kind, action, *args)
+    if not created:
+        return jsonify(create_json_response(
+            False, f"{job['kind']} is already in progress (job {job['id']})", job=job
+        )), 409
+    return jsonify(create_json_response(True, f"{kind} started as job {job['id']}", job_id=job['id'], job=job)), 202
+
+# =============================================================================
+# FLASK ROUTES
+# =============================================================================
+
+@app.route("/")
+def home():
+    return render_template("index.html")
+
+@app.route("/api/test")
+def api_test():
+    return jsonify(create_json_response(
+        True, "Test successful - API is working perfectly!",
+        timestamp=datetime.now().isoformat()
+    ))
+
+def run_start_redisarena() -> Dict[str, Any]:
+    """Start the RedisArena systemd service."""
+    try:
+        logger.info("Starting RedisArena application...")
+        success, stdout, stderr = execute_subprocess_with_timeout(
+            ["sudo", "systemctl", "start", "redisarena"], timeout=30
+        )
+        
+        if success:
+            return create_json_response(True, "RedisArena application started successfully!")
+        else:
+            return create_json_response(False, f"Failed to start RedisArena: {stderr}")
+    except Exception as e:
+        return create_json_response(False, f"Error starting RedisArena: {str(e)}")
+
+@app.route("/api/start-redisarena", methods=["POST"])
+def start_redisarena():
+    return dispatch_operation('start_redisarena', run_start_redisarena)
+
+def run_load_data() -> Dict[str, Any]:
+    """Populate the source database with load_data.sh."""
+    try:
+        logger.info("Loading sample data into Redis...")
+        exit_code, output = execute_subprocess_streaming(["/opt/redisarena/load_data.sh"], timeout=300)
+        
+        if exit_code == 0:
+            return create_json_response(
+                True, "Sample gaming data loaded successfully! RedisArena is now populated with player leaderboards and game data."
+            )
+        else:
+            return create_json_response(False, f"Failed to load sample data (exit {exit_code}): {output}")
+    except Exception as e:
+        return create_json_response(False, f"Error loading sample data: {str(e)}")
+
+@app.route("/api/load-data", methods=["POST"])
+def load_sample_data():
+    return dispatch_operation('load_data', run_load_data)
+
+@app.route("/api/get-app-url")
+def get_app_url():
+    try:
+        success, public_ip, stderr = execute_subprocess_with_timeout(
+            ["curl", "-s", "http://169.254.169.254/latest/meta-data/public-ipv4"], timeout=10
+        )
+        
+        if success and public_ip:
+            url = f"http://{public_ip}:5000"
+            return jsonify(create_json_response(True, f"RedisArena available at {url}", url=url))
+        else:
+            # Fallback URL
+            fallback_url = "http://44.243.93.201:5000"
+            return jsonify(create_json_response(True, f"RedisArena available at {fallback_url}", url=fallback_url))
+    except Exception as e:
+        fallback_url = "http://44.243.93.201:5000"
+        return jsonify(create_json_response(True, f"RedisArena available at {fallback_url}", url=fallback_url))
+
+@app.route("/api/validate-redis-cloud", methods=["POST"])
+def validate_redis_cloud():
+    try:
+        logger.info("Validating Redis Cloud connectivity...")
+        exit_code, output = execute_subprocess_streaming(["/home/ubuntu/do_cutover.sh", "validate"], timeout=30)
+        
+        if exit_code == 0:
+            return jsonify(create_json_response(True, "Redis Cloud connectivity verified successfully!"))
+        else:
+            error_msg = output or "Validation failed"
+            return jsonify(create_json_response(False, f"Redis Cloud PING test failed: {error_msg}"))
+    except Exception as e:
+        return jsonify(create_json_response(False, f"Error validating Redis Cloud: {str(e)}"))
+
+def run_perform_cutover(mode: str) -> Dict[str, Any]:
+    """Cut RedisArena over to Redis Cloud with the cutover orchestrator."""
+    try:
+        logger.info(f"Starting Redis Cloud cutover ({mode})...")
+        result = start_cutover(mode)
+        if result is None:
+            return create_json_response(False, "A cutover is already in progress")
+        
+        if result['success']:
+            return create_json_response(
+                True, f"Cutover completed successfully! RedisArena is now connected to Redis Cloud "
+                      f"(writes unavailable for {result['write_unavailable_ms']}ms).",
+                cutover=result
+            )
+        return create_json_response(False, f"Cutover failed: {result['error']}", cutover=result)
+    except Exception as e:
+        return create_json_response(False, f"Error performing cutover: {str(e)}")
+
+@app.route("/api/perform-cutover", methods=["POST"])
+def perform_cutover():
+    data = request.get_json(silent=True) or {}
+    mode = data.get('mode', os.getenv("CUTOVER_APP_SWITCH", "hot_swap"))
+    if mode not in ('hot_swap', 'restart'):
+        return jsonify(create_json_response(False, "mode must be 'hot_swap' or 'restart'"))
+    return dispatch_operation('perform_cutover', run_perform_cutover, mode)
+
+@app.route("/api/jobs")
+def background_jobs():
+    """Recent background jobs, newest first"""
+    return jsonify(create_json_response(True, "Background jobs", jobs=list_jobs()))
+
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id):
+    """Status (and, once finished, result) of one background job"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify(create_json_response(False, f"Unknown job {job_id}")), 404
+    output = get_job_output(job_id, int(request.args.get('after', -1)))
+    return jsonify(create_json_response(True, f"Job {job['state']}", job=job, output=output))
+
+@app.route("/api/jobs/<job_id>/stream")
+def job_output_stream(job_id):
+    """Server-Sent Events stream of a job's output lines, then its final state"""
+    if get_job(job_id) is None:
+        return jsonify(create_json_response(False, f"Unknown job {job_id}")), 404
+    # EventSource sends the last id it saw when it reconnects
+    resume_after = int(request.headers.get('Last-Event-ID', -1))
+    
+    def generate(last_seq):
+        while True:
+            with _job_output_changed:
+                lines, job = get_job_output(job_id, last_seq), get_job(job_id)
+                active = job is not None and job['state'] in ('queued', 'running')
+                if not lines and active:
+                    _job_output_changed.wait(timeout=15)
+                    lines, job = get_job_output(job_id, last_seq), get_job(job_id)
+                    active = job is not None and job['state'] in ('queued', 'running')
+            if not lines and active:
+                yield ": keepalive\n\n"
+                continue
+            for seq, line in lines:
+                yield f"id: {seq}\nevent: output\ndata: {json.dumps(line)}\n\n"
+                last_seq = seq
+            if not active:
+                yield f"event: done\ndata: {json.dumps(job)}\n\n"
+                return
+    
+    return create_event_stream_response(generate(resume_after))
+
+@app.route("/api/cutover-timeline")
+def cutover_timeline():
+    """Timeline of the most recent cutover"""
+    if _last_cutover is None:
+        return jsonify(create_json_response(False, "No cutover has run yet"))
+    return jsonify(create_json_response(True, "Last cutover timeline", cutover=_last_cutover))
+
+def run_perform_rollback() -> Dict[str, Any]:
+    """Roll RedisArena back to ElastiCache with do_cutover.sh."""
+    try:
+        logger.info("Starting rollback to ElastiCache...")
+        exit_code, output = execute_subprocess_streaming(["/home/ubuntu/do_cutover.sh", "rollback"], timeout=300)
+        request_metrics_refresh()
+        
+        if exit_code == 0:
+            return create_json_response(
+                True, "Rollback completed successfully! RedisArena is now connected to ElastiCache."
+            )
+        else:
+            error_msg = output or "Rollback process failed"
+            return create_json_response(False, f"Rollback failed (exit {exit_code}): {error_msg}")
+    except Exception as e:
+        return create_json_response(False, f"Error performing rollback: {str(e)}")
+
+@app.route("/api/perform-rollback", methods=["POST"])
+def perform_rollback():
+    return dispatch_operation('perform_rollback', run_perform_rollback)
+
+def run_restart_redisarena() -> Dict[str, Any]:
+    """Restart RedisArena with do_cutover.sh."""
+    try:
+        logger.info("Restarting RedisArena application...")
+        exit_code, output = execute_subprocess_streaming(["/home/ubuntu/do_cutover.sh", "restart"], timeout=60)
+        
+        if exit_code == 0:
+            return create_json_response(True, "RedisArena application restarted successfully!")
+        else:
+            error_msg = output or "Restart process failed"
+            return create_json_response(False, f"Restart failed (exit {exit_code}): {error_msg}")
+    except Exception as e:
+        return create_json_response(False, f"Error restarting application: {str(e)}")
+
+@app.route("/api/restart-redisarena", methods=["POST"])
+def restart_redisarena():
+    return dispatch_operation('restart_redisarena', run_restart_redisarena)
+
+@app.route("/api/flush-elasticache", methods=["POST"])
+def flush_elasticache():
+    """Flush ElastiCache database using shared utility function"""
+    try:
+        success, message = flush_redis_database('elasticache')
+        request_metrics_refresh('database_stats')
+        return jsonify(create_json_response(success, message))
+    except Exception as e:
+        logger.error(f"Error in flush_elasticache endpoint: {str(e)}")
+        return jsonify(create_json_response(False, f"Error flushing ElastiCache: {str(e)}"))
+
+@app.route("/api/flush-redis-cloud", methods=["POST"])
+def flush_redis_cloud():
+    """Flush Redis Cloud database using shared utility function"""
+    try:
         success, message = flush_redis_database('redis_cloud')
+        request_metrics_refresh('database_stats')
         return jsonify(create_json_response(success, message))
     except Exception as e:
         logger.error(f"Error in flush_redis_cloud endpoint: {str(e)}")
@@ -606,21 +2326,9 @@ def get_grafana_url():
 
 @app.route("/api/get-database-stats")
 def get_database_stats():
-    """Get database statistics using refactored utility functions"""
+    """Get database statistics from the background collector's snapshot"""
     try:
-        logger.info("Getting database statistics...")
-        
-        # Get stats for both databases using the utility function
-        elasticache_stats = get_redis_stats('elasticache')
-        redis_cloud_stats = get_redis_stats('redis_cloud')
-        
-        return jsonify(create_json_response(
-            True, "Database statistics retrieved successfully",
-            elasticache=elasticache_stats,
-            redis_cloud=redis_cloud_stats,
-            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        ))
-        
+        return jsonify(get_metrics_snapshot('database_stats'))
     except Exception as e:
         logger.error(f"Error getting database stats: {str(e)}")
         return jsonify(create_json_response(False, f"Error getting database stats: {str(e)}"))
@@ -628,62 +2336,79 @@ def get_database_stats():
 @app.route("/api/get-config")
 def get_config():
     try:
-        logger.info("Reading current .env configuration...")
-        
-        # Read the .env file
-        env_file_path = "/opt/redisarena/.env"
-        if not os.path.exists(env_file_path):
-            return jsonify(create_json_response(False, f"Configuration file not found: {env_file_path}"))
-        
-        with open(env_file_path, 'r') as f:
-            env_content = f.read()
-        
-        # Parse Redis configuration
-        redis_config = parse_redis_config_from_env(env_content)
-        backend_type = determine_backend_type(redis_config["host"])
-        
-        # Create formatted displays
-        config_display = f"""📁 Configuration File Path: {env_file_path}
-
-📄 Current Configuration:
-{env_content}
-
-📊 Redis Connection Summary:{create_config_summary(redis_config, backend_type)}"""
-        
-        app_connection_code = create_app_connection_code(redis_config, backend_type)
-
-        return jsonify(create_json_response(
-            True, "Configuration retrieved successfully",
-            config=config_display,
-            app_connection_code=app_connection_code,
-            file_path=env_file_path,
-            backend_type=backend_type
-        ))
-        
+        return jsonify(get_metrics_snapshot('config'))
     except Exception as e:
         logger.error(f"Error reading configuration: {str(e)}")
         return jsonify(create_json_response(False, f"Error reading configuration: {str(e)}"))
 
+@app.route("/api/metrics/stream")
+def metrics_stream():
+    """Server-Sent Events stream of the metrics snapshot, pushed whenever a section changes"""
+    def generate():
+        version = -1
+        while True:
+            with _metrics_changed:
+                if version == _metrics_version:
+                    _metrics_changed.wait(timeout=15)
+                changed = version != _metrics_version
+                if changed:
+                    version = _metrics_version
+                    snapshot = dict(_metrics_snapshot)
+            if not changed:
+                # Keep proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: snapshot\ndata: {json.dumps({'version': version, **snapshot})}\n\n"
+    
+    return create_event_stream_response(generate())
+
 # =============================================================================
 # RIOT Control API Routes
 # =============================================================================
 
 @app.route("/api/riot-status")
 def riot_status():
-    """Check if RIOT process is running"""
+    """Check if RIOT process is running (served from the collector snapshot)"""
     try:
-        logger.info("Checking RIOT status...")
-        is_running, stdout = check_riot_process_running()
-        
-        return jsonify(create_json_response(
-            True, "RIOT is running" if is_running else "RIOT is not running",
-            running=is_running
-        ))
+        if request.args.get("refresh") == "true":
+            publish_metrics('riot_status', build_riot_status_payload())
+        return jsonify(get_metrics_snapshot('riot_status'))
         
     except Exception as e:
         logger.error(f"Error checking RIOT status: {e}")
         return jsonify(create_json_response(False, f"Error: {str(e)}", running=False))
 
+@app.route("/api/riot-metrics")
+def riot_metrics():
+    """RIOT-X replication progress: latest scrape, readiness and the rolling series"""
+    try:
+        seconds = float(request.args.get("seconds", "300"))
+        return jsonify({**get_metrics_snapshot('riot_metrics'), 'series': get_riot_metrics_series(seconds)})
+    except Exception as e:
+        logger.error(f"Error getting RIOT metrics: {e}")
+        return jsonify(create_json_response(False, f"Error getting RIOT metrics: {str(e)}"))
+
+@app.route("/api/cutover-readiness")
+def cutover_readiness():
+    """Whether replication lag has stayed within thresholds long enough to cut over"""
+    try:
+        readiness = get_metrics_snapshot('riot_metrics')['readiness']
+        return jsonify(create_json_response(
+            True, "Safe to cut over" if readiness['ready'] else "Not ready to cut over", **readiness
+        ))
+    except Exception as e:
+        logger.error(f"Error evaluating cutover readiness: {e}")
+        return jsonify(create_json_response(False, f"Error evaluating cutover readiness: {str(e)}", ready=False))
+
+@app.route("/api/replication-gap")
+def replication_gap():
+    """Live replication gap and per-prefix rates from keyspace notifications"""
+    try:
+        return jsonify(get_metrics_snapshot('replication_gap'))
+    except Exception as e:
+        logger.error(f"Error getting replication gap: {e}")
+        return jsonify(create_json_response(False, f"Error getting replication gap: {str(e)}"))
+
 @app.route("/api/start-riot", methods=["POST"])
 def start_riot():
     """Start RIOT replication process"""
@@ -698,9 +2423,9 @@ def start_riot():
         # Start RIOT process
         start_riot_process()
         
-        # Wait a moment then verify it started
-        time.sleep(3)
-        is_running_after, _ = check_riot_process_running()
+        # Verify it started (status checks are cheap over the multiplexed connection)
+        is_running_after = wait_for_riot_process(True, timeout=float(os.getenv("RIOT_START_TIMEOUT", "10")))
+        request_metrics_refresh('riot_status')
         
         if is_running_after:
             return jsonify(create_json_response(True, "RIOT replication started successfully"))
@@ -717,17 +2442,89 @@ def stop_riot():
     try:
         logger.info("Stopping RIOT replication...")
         success, message = stop_riot_processes()
+        request_metrics_refresh('riot_status')
         return jsonify(create_json_response(success, message))
             
     except Exception as e:
         logger.error(f"Error stopping RIOT: {e}")
         return jsonify(create_json_response(False, f"Error stopping RIOT: {str(e)}"))
 
+# =============================================================================
+# Consistency Check API Routes
+# =============================================================================
+
+@app.route("/api/consistency-check", methods=["GET", "POST"])
+def consistency_check():
+    """Start a source/target consistency check (POST) or get its progress and report (GET)"""
+    try:
+        if request.method == "POST":
+            data = request.get_json(silent=True) or {}
+            options = {
+                'match': str(data.get('match', '*')),
+                'sample_rate': float(data.get('sample_rate', os.getenv("CONSISTENCY_SAMPLE_RATE", "1.0"))),
+                'max_keys': int(data.get('max_keys', 0)),
+                'batch_size': int(data.get('batch_size', os.getenv("CONSISTENCY_BATCH_SIZE", "200"))),
+                'max_keys_per_sec': float(data.get('max_keys_per_sec', os.getenv("CONSISTENCY_MAX_KEYS_PER_SEC", "2000"))),
+                'ttl_tolerance_ms': int(data.get('ttl_tolerance_ms', os.getenv("CONSISTENCY_TTL_TOLERANCE_MS", "5000"))),
+                'max_elements': int(os.getenv("CONSISTENCY_MAX_ELEMENTS", "10000")),
+                'recheck_delay': float(os.getenv("CONSISTENCY_RECHECK_DELAY", "1.0")),
+                'max_reported': int(os.getenv("CONSISTENCY_MAX_REPORTED", "200"))
+            }
+            if not 0 < options['sample_rate'] <= 1 or not 1 <= options['batch_size'] <= 10000:
+                return jsonify(create_json_response(False, "sample_rate must be in (0, 1] and batch_size in [1, 10000]"))
+            
+            started, message = start_consistency_check(options)
+            return jsonify(create_json_response(started, message, **get_consistency_state()))
+        
+        state = get_consistency_state()
+        return jsonify(create_json_response(True, f"Consistency check {state['state']}", **state))
+    except Exception as e:
+        logger.error(f"Error in consistency check: {e}")
+        return jsonify(create_json_response(False, f"Error in consistency check: {str(e)}"))
+
+@app.route("/api/consistency-check/cancel", methods=["POST"])
+def cancel_consistency_check():
+    """Stop a running consistency check after its current batch"""
+    _consistency_cancel.set()
+    return jsonify(create_json_response(True, "Consistency check cancellation requested"))
+
+@app.route("/api/consistency-check/stream")
+def consistency_check_stream():
+    """Server-Sent Events stream of consistency check progress until it finishes"""
+    def generate():
+        version = -1
+        while True:
+            with _consistency_changed:
+                if version == _consistency_state.get('version'):
+                    _consistency_changed.wait(timeout=15)
+                changed = version != _consistency_state.get('version')
+                if changed:
+                    version = _consistency_state.get('version')
+                    state = json.dumps(_consistency_state)
+                    finished = _consistency_state.get('state') != 'running'
+            if not changed:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: progress\ndata: {state}\n\n"
+            if finished:
+                return
+    
+    return create_event_stream_response(generate())
+
 if __name__ == "__main__":
     logger.info("🚀 Starting Redis Migration Control Panel (Final Optimized)...")
     logger.info("🌐 Access at: http://0.0.0.0:8080")
-    app.run(
-        host=os.getenv("SERVER_HOST", "0.0.0.0"), 
-        port=int(os.getenv("SERVER_PORT", "8080")), 
-        debug=False
-    )
\ No newline at end of file
+    start_metrics_collector()
+    if os.getenv("KSN_TRACKING_ENABLED", "true").lower() == "true":
+        start_keyspace_tracking()
+    host, port = os.getenv("SERVER_HOST", "0.0.0.0"), int(os.getenv("SERVER_PORT", "8080"))
+    if os.getenv("SERVER_MODE", "threaded") == "waitress":
+        # Production WSGI server with a fixed thread pool (SSE streams are capped below it)
+        from waitress import serve
+        logger.info(f"Serving with waitress ({os.getenv('SERVER_THREADS', '32')} threads)")
+        serve(app, host=host, port=port,
+              threads=int(os.getenv("SERVER_THREADS", "32")),
+              connection_limit=int(os.getenv("SERVER_CONNECTION_LIMIT", "200")),
+              channel_timeout=int(os.getenv("SERVER_CHANNEL_TIMEOUT", "120")))
+    else:
+        app.run(host=host, port=port, debug=False, threaded=True)
\ No newline at end of file
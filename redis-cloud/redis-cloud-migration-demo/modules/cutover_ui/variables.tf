@@ -45,4 +45,10 @@ variable "elasticache_password" {
   type        = string
   default     = ""
   sensitive   = true
+}
+
+variable "riotx_metrics_port" {
+  description = "Port of the RIOT-X metrics endpoint scraped by the UI (must match the security group)"
+  type        = number
+  default     = 8080
 }
\ No newline at end of file
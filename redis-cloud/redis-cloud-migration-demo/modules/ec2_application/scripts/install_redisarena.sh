@@ -120,6 +120,67 @@ HEALTH_CHECK_INTERVAL=30
 
 # Demo Settings
 AUTO_START_SIMULATION=true
+
+# Simulation Engine (threaded | asyncio)
+SIMULATION_ENGINE=threaded
+ASYNC_PLAYER_SESSIONS=500
+ASYNC_POOL_MAX_CONNECTIONS=100
+
+# Global ops/sec target for all workers (0 = unthrottled)
+TARGET_OPS_PER_SEC=0
+
+# Dashboard stats push interval (seconds)
+STATS_BROADCAST_INTERVAL=1.0
+STATS_CACHE_MAX_AGE_MS=250
+LEADERBOARD_RECONCILE_INTERVAL=10
+
+# Memory footprint sampler (SCAN calls per tick, keys sampled per family per batch)
+MEMORY_SAMPLER_INTERVAL=2.0
+MEMORY_SAMPLER_SCAN_COUNT=200
+MEMORY_SAMPLER_SCAN_BUDGET=5
+MEMORY_SAMPLER_SAMPLES_PER_FAMILY=2
+
+# Key population (unbounded = fresh UUID keys, bounded = recycle IDs per prefix)
+KEY_POPULATION_MODE=unbounded
+# Optional overrides, e.g. cache:rapid:=10000,temp:session:=5000
+KEY_POPULATION_SIZES=
+
+# Cache read path (target GET hit ratio over the most recent CACHE_RING_SIZE writes)
+CACHE_TARGET_HIT_RATIO=0.8
+CACHE_RING_SIZE=5000
+
+# Live backend switch: hot-swap the connection pool when this file changes
+BACKEND_WATCH_ENV=true
+BACKEND_WATCH_INTERVAL=1.0
+BACKEND_DRAIN_TIMEOUT=5.0
+
+# Migration validation mirror (off | dual_write | shadow_read | both)
+DUAL_MODE=off
+SECONDARY_REDIS_HOST=
+SECONDARY_REDIS_PORT=6379
+SECONDARY_REDIS_PASSWORD=
+SHADOW_READ_SAMPLE_RATE=0.01
+SECONDARY_QUEUE_SIZE=10000
+
+# Demo counter sequence writer (writes per second, timeline entries kept)
+DEMO_COUNTER_HZ=1.0
+DEMO_TIMELINE_MAX_ENTRIES=100000
+
+# Seed data snapshots (RESP files, also replayable with redis-cli --pipe)
+SEED_SNAPSHOT_DIR=/opt/redisarena/snapshots
+SEED_PIPELINE_SIZE=10000
+
+# Overall deadline for stopping all simulation threads (seconds)
+SIMULATION_STOP_TIMEOUT=5.0
+
+# Player population (synthetic players beyond the curated names; active set rotates)
+PLAYER_POPULATION_SIZE=120
+PLAYER_ACTIVE_SET_SIZE=1000
+PLAYER_ROTATION_INTERVAL=30
+PLAYER_ROTATION_FRACTION=0.1
+
+# Write freeze used by the cutover orchestrator (auto-thaw safety limit, seconds)
+WRITE_FREEZE_MAX_SECONDS=60
 EOF
 
 chown "$SERVICE_USER:$SERVICE_USER" "$APP_DIR/.env"
@@ -9,19 +9,27 @@ RedisArena - High-Performance Gaming Platform (ENHANCED VERSION)
 
 import os
 import redis
+import redis.asyncio as aioredis
+import asyncio
 import json
+import heapq
+import bisect
 import time
 import random
 import threading
 import logging
 import re
 import uuid
+import queue
+import hashlib
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from typing import Dict, List, Optional
-from flask import Flask, render_template, jsonify, request
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from flask import Flask, Response, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +38,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ENV_FILE = "/opt/redisarena/.env"
+
 @dataclass
 class RedisConfig:
     host: str
@@ -38,9 +48,39 @@ class RedisConfig:
     db: int
 
 class RedisManager:
+    # Bound connects and replies so an unreachable or half-configured backend fails fast
+    SOCKET_CONNECT_TIMEOUT = 5.0
+    SOCKET_TIMEOUT = 10.0
+    
     def __init__(self, config: RedisConfig):
+        self.config = config
         # Create connection pool for thread-safe operations
-        self.connection_pool = redis.ConnectionPool(
+        self.connection_pool = self._create_pool(config)
+        self.connection = redis.Redis(connection_pool=self.connection_pool)
+        self._test_connection()
+        
+        # Hot-swap support: workers enter in_flight() per batch; a switch closes the gate,
+        # drains in-flight batches, swaps the pool and reopens the gate
+        self._gate = threading.Condition()
+        self._paused = False
+        self._in_flight = 0
+        self.generation = 0
+        self.last_switch: Optional[Dict] = None
+        
+        # Write freeze (gate held closed across calls, e.g. by a cutover orchestrator).
+        # After the gate reopens, the first successful batch is timestamped into the
+        # record of whatever reopened it (last_switch or last_freeze).
+        self._frozen_since: Optional[float] = None
+        self.last_freeze: Optional[Dict] = None
+        self._reopened_at = 0.0
+        self._first_write_record: Optional[Dict] = None
+        
+        # Optional dual-write / shadow-read mirror to a secondary backend
+        self.mirror: Optional['SecondaryMirror'] = None
+    
+    @staticmethod
+    def _create_pool(config: RedisConfig) -> redis.ConnectionPool:
+        return redis.ConnectionPool(
             host=config.host,
             port=config.port,
             password=config.password if config.password else None,
@@ -48,12 +88,12 @@ class RedisManager:
             decode_responses=True,
             socket_keepalive=True,
             socket_keepalive_options={},
+            socket_connect_timeout=RedisManager.SOCKET_CONNECT_TIMEOUT,
+            socket_timeout=RedisManager.SOCKET_TIMEOUT,
             health_check_interval=30,
             max_connections=50,  # Increased for high ops
             retry_on_timeout=True
         )
-        self.connection = redis.Redis(connection_pool=self.connection_pool)
-        self._test_connection()
     
     def _test_connection(self):
         try:
@@ -63,9 +103,419 @@ class RedisManager:
             logger.error(f"❌ Redis connection failed: {e}")
             raise
     
+    def enable_mirror(self, mirror: 'SecondaryMirror'):
+        """Route primary commands through the mirror (writes replayed, reads sampled)"""
+        self.mirror = mirror
+        # Unmirrored client for re-checking shadow-read mismatches against the primary
+        mirror.primary_source = self.get_connection
+        self.connection = self._wrap(self.connection)
+    
+    def _wrap(self, connection, proxy: Optional[type] = None):
+        if self.mirror is None:
+            return connection
+        if self.mirror.config == self.config:
+            # Mirroring a backend onto itself would apply every write twice
+            logger.warning(f"⚠️ Primary is the mirror target ({self.mirror.label}) - mirroring paused")
+            return connection
+        return (proxy or MirroringRedis)(connection, self.mirror)
+    
+    @contextmanager
+    def in_flight(self, stop_event: Optional[threading.Event] = None):
+        """Wrap a worker batch: waits while a backend switch is in progress
+        
+        Yields False without starting a batch if stop_event is set while waiting
+        (stop_simulation wakes the waiters), True otherwise.
+        """
+        with self._gate:
+            while self._paused and not (stop_event is not None and stop_event.is_set()):
+                self._gate.wait()
+            entered = not self._paused
+            if entered:
+                self._in_flight += 1
+        if not entered:
+            yield False
+            return
+        succeeded = False
+        try:
+            yield True
+            succeeded = True
+        finally:
+            self.end_batch(succeeded)
+    
+    def wake_waiters(self):
+        """Wake in_flight() callers blocked on a closed gate so they re-check their stop_event"""
+        with self._gate:
+            self._gate.notify_all()
+    
+    def try_begin_batch(self) -> bool:
+        """Non-blocking in_flight() entry for the asyncio engine (False while switching)"""
+        with self._gate:
+            if self._paused:
+                return False
+            self._in_flight += 1
+            return True
+    
+    def end_batch(self, succeeded: bool = False):
+        with self._gate:
+            self._in_flight -= 1
+            if succeeded and self._first_write_record is not None:
+                self._first_write_record['first_write_ms'] = round((time.perf_counter() - self._reopened_at) * 1000, 3)
+                self._first_write_record['first_write_at'] = datetime.now().isoformat()
+                self._first_write_record = None
+            self._gate.notify_all()
+    
+    def _reopen_gate(self, record: Dict):
+        """Reopen the gate (caller holds it) and time the first successful batch into record"""
+        self._paused = False
+        self._frozen_since = None
+        self._reopened_at = time.perf_counter()
+        record.update({'first_write_ms': None, 'first_write_at': None})
+        self._first_write_record = record
+        self._gate.notify_all()
+    
+    @property
+    def frozen(self) -> bool:
+        return self._frozen_since is not None
+    
+    def freeze_writes(self, drain_timeout: float = 5.0) -> Dict:
+        """Close the gate and drain in-flight batches; it stays closed until thaw_writes() or switch_backend()"""
+        with self._gate:
+            if self._frozen_since is None:
+                self._frozen_since = time.perf_counter()
+                self._paused = True
+                self.last_freeze = {'frozen_at': datetime.now().isoformat(), 'backend': self.backend_label}
+            drained = self._gate.wait_for(lambda: self._in_flight == 0, timeout=drain_timeout)
+            self.last_freeze.update({
+                'drain_ms': round((time.perf_counter() - self._frozen_since) * 1000, 3),
+                'drained': drained,
+                'abandoned_batches': self._in_flight
+            })
+            return dict(self.last_freeze)
+    
+    def thaw_writes(self) -> Optional[Dict]:
+        """Reopen a frozen gate on the current backend (None if writes weren't frozen)"""
+        with self._gate:
+            if self._frozen_since is None:
+                return None
+            self.last_freeze.update({
+                'thawed_at': datetime.now().isoformat(),
+                'write_freeze_ms': round((time.perf_counter() - self._frozen_since) * 1000, 3)
+            })
+            self._reopen_gate(self.last_freeze)
+            return dict(self.last_freeze)
+    
+    @classmethod
+    def connect(cls, config: RedisConfig) -> redis.Redis:
+        """Client on a fresh pool for config, PINGed (the pool is closed again if that fails)"""
+        connection = redis.Redis(connection_pool=cls._create_pool(config))
+        try:
+            connection.ping()
+        except Exception:
+            connection.connection_pool.disconnect()
+            raise
+        return connection
+    
+    def switch_backend(self, new_config: RedisConfig, drain_timeout: float = 5.0,
+                       new_connection: Optional[redis.Redis] = None) -> Dict:
+        """Atomically move all workers to a new backend without restarting the process
+        
+        The new pool is connected and PINGed before the gate closes (pass new_connection
+        from connect() to do that earlier), so the measured switch-over gap only covers
+        draining in-flight batches and swapping references.
+        """
+        if new_connection is None:
+            new_connection = self.connect(new_config)
+        new_pool = new_connection.connection_pool
+        
+        previous_label = self.backend_label
+        old_pool = self.connection_pool
+        record: Dict = {}
+        
+        gate_closed = time.perf_counter()
+        with self._gate:
+            self._paused = True
+            drained = self._gate.wait_for(lambda: self._in_flight == 0, timeout=drain_timeout)
+            abandoned = self._in_flight
+            drain_ms = (time.perf_counter() - gate_closed) * 1000
+            
+            self.config = new_config
+            self.connection_pool = new_pool
+            self.connection = self._wrap(new_connection)
+            self.generation += 1
+            
+            # Switching while frozen ends the freeze; report how long writes were held
+            if self._frozen_since is not None:
+                record['write_freeze_ms'] = round((time.perf_counter() - self._frozen_since) * 1000, 3)
+            self._reopen_gate(record)
+        gap_ms = (time.perf_counter() - gate_closed) * 1000
+        
+        old_pool.disconnect(inuse_connections=drained)
+        
+        record.update({
+            'previous_backend': previous_label,
+            'current_backend': self.backend_label,
+            'switch_gap_ms': round(gap_ms, 3),
+            'drain_ms': round(drain_ms, 3),
+            'drained': drained,
+            'abandoned_batches': abandoned,
+            'switched_at': datetime.now().isoformat()
+        })
+        self.last_switch = record
+        logger.info(f"🔀 Backend switched {previous_label} → {self.backend_label} in {gap_ms:.1f}ms "
+                    f"(drain {drain_ms:.1f}ms, drained={drained})")
+        return self.last_switch
+    
+    @property
+    def backend_label(self) -> str:
+        """host:port of the backend currently in use (for per-backend metrics)"""
+        return f"{self.config.host}:{self.config.port}"
+    
     def get_connection(self):
         """Get a connection from the pool (thread-safe)"""
         return redis.Redis(connection_pool=self.connection_pool)
+    
+    def get_async_connection(self, max_connections: int = 100):
+        """Create an asyncio client (must be called from the event loop that will use it)"""
+        # Blocking pool so hundreds of coroutines queue for a connection instead of erroring
+        pool = aioredis.BlockingConnectionPool(
+            host=self.config.host,
+            port=self.config.port,
+            password=self.config.password if self.config.password else None,
+            db=self.config.db,
+            decode_responses=True,
+            socket_keepalive=True,
+            socket_connect_timeout=self.SOCKET_CONNECT_TIMEOUT,
+            socket_timeout=self.SOCKET_TIMEOUT,
+            health_check_interval=30,
+            max_connections=max_connections,
+            timeout=5
+        )
+        return self._wrap(aioredis.Redis(connection_pool=pool), AsyncMirroringRedis)
+
+# Commands replayed on the secondary in dual-write mode / compared in shadow-read mode
+MIRRORED_WRITE_COMMANDS = {
+    'set', 'setex', 'psetex', 'delete', 'unlink', 'expire', 'incr', 'incrby', 'hset', 'hincrby',
+    'hdel', 'zadd', 'zincrby', 'zrem', 'zremrangebyrank', 'sadd', 'srem', 'lpush', 'rpush', 'ltrim'
+}
+SHADOW_READ_COMMANDS = {
+    'get', 'hget', 'hgetall', 'zscore', 'zcard', 'zrevrange', 'scard', 'smembers', 'lrange', 'exists'
+}
+
+class SecondaryMirror:
+    """Replays primary writes and shadow reads against a secondary backend off the hot path
+    
+    The primary path only does a non-blocking put on a bounded queue; a background
+    thread applies writes to the secondary and compares sampled reads. When the queue
+    is full, jobs are dropped and counted rather than slowing the primary.
+    """
+    
+    def __init__(self, config: RedisConfig, dual_write: bool = True, shadow_read: bool = False,
+                 sample_rate: float = 0.01, queue_size: int = 10000):
+        self.config = config
+        self.label = f"{config.host}:{config.port}"
+        self.dual_write = dual_write
+        self.shadow_read = shadow_read
+        self.sample_rate = sample_rate
+        self.client = redis.Redis(connection_pool=RedisManager._create_pool(config))
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.latency = LatencyHistogram()
+        self.recent_mismatches = deque(maxlen=20)
+        self.writes_mirrored = 0
+        self.write_errors = 0
+        self.shadow_reads = 0
+        self.mismatches = 0
+        self.unstable_reads = 0
+        self.shadow_errors = 0
+        self.dropped = 0
+        self.primary_source: Optional[Callable] = None
+        threading.Thread(target=self._worker, daemon=True, name="SecondaryMirror").start()
+        logger.info(f"🪞 Mirroring to {self.label} (dual_write={dual_write}, shadow_read={shadow_read}, "
+                    f"sample_rate={sample_rate})")
+    
+    def _submit(self, job: Tuple):
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self.dropped += 1
+    
+    def submit_write(self, name: str, args: Tuple, kwargs: Dict):
+        self._submit(('write', [(name, args, kwargs)]))
+    
+    def submit_pipeline(self, commands: List[Tuple[str, Tuple, Dict]]):
+        self._submit(('write', commands))
+    
+    def submit_shadow_read(self, name: str, args: Tuple, kwargs: Dict, primary_result):
+        self._submit(('read', name, args, kwargs, primary_result))
+    
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            started = time.perf_counter()
+            if job[0] == 'write':
+                try:
+                    pipe = self.client.pipeline(transaction=False)
+                    for name, args, kwargs in job[1]:
+                        getattr(pipe, name)(*args, **kwargs)
+                    pipe.execute()
+                    self.writes_mirrored += len(job[1])
+                except Exception as e:
+                    self.write_errors += 1
+                    logger.debug(f"Secondary write failed: {e}")
+            else:
+                _, name, args, kwargs, primary_result = job
+                try:
+                    secondary_result = getattr(self.client, name)(*args, **kwargs)
+                    self.shadow_reads += 1
+                    if secondary_result != primary_result and self.primary_source:
+                        # Workers may have changed the key since the primary read; only a
+                        # primary value that is still the same counts as a real mismatch
+                        if getattr(self.primary_source(), name)(*args, **kwargs) != primary_result:
+                            self.unstable_reads += 1
+                            secondary_result = primary_result
+                    if secondary_result != primary_result:
+                        self.mismatches += 1
+                        self.recent_mismatches.append({
+                            'command': name,
+                            'key': str(args[0]) if args else '',
+                            'at': datetime.now().isoformat()
+                        })
+                except Exception as e:
+                    self.shadow_errors += 1
+                    logger.debug(f"Shadow read failed: {e}")
+            self.latency.record(time.perf_counter() - started)
+            self.queue.task_done()
+    
+    def flush(self, timeout: float) -> bool:
+        """Wait for queued mirror jobs to be applied; False if the deadline passed first"""
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def stats(self) -> Dict:
+        return {
+            'secondary': self.label,
+            'dual_write': self.dual_write,
+            'shadow_read': self.shadow_read,
+            'sample_rate': self.sample_rate,
+            'queue_depth': self.queue.qsize(),
+            'dropped': self.dropped,
+            'writes_mirrored': self.writes_mirrored,
+            'write_errors': self.write_errors,
+            'shadow_reads': self.shadow_reads,
+            'mismatches': self.mismatches,
+            'mismatch_ratio': round(self.mismatches / self.shadow_reads, 4) if self.shadow_reads else 0.0,
+            'unstable_reads': self.unstable_reads,
+            'shadow_errors': self.shadow_errors,
+            'recent_mismatches': list(self.recent_mismatches),
+            'secondary_latency': self.latency.summary()
+        }
+
+class _MirroredPipeline:
+    """Pipeline proxy that hands queued write commands to the mirror after a successful execute"""
+    
+    def __init__(self, pipeline, mirror: SecondaryMirror):
+        self._pipeline = pipeline
+        self._mirror = mirror
+        self._commands: List[Tuple[str, Tuple, Dict]] = []
+    
+    def __getattr__(self, name):
+        attr = getattr(self._pipeline, name)
+        # execute_command carries raw seed-load commands, which are all writes
+        if name not in MIRRORED_WRITE_COMMANDS and name != 'execute_command':
+            return attr
+        
+        def queue_command(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            attr(*args, **kwargs)
+            return self
+        return queue_command
+    
+    def execute(self, *args, **kwargs):
+        results = self._pipeline.execute(*args, **kwargs)
+        if self._commands:
+            self._mirror.submit_pipeline(self._commands)
+            self._commands = []
+        return results
+
+class MirroringRedis:
+    """Drop-in proxy for the primary redis.Redis client used by RedisManager.connection"""
+    
+    def __init__(self, primary, mirror: SecondaryMirror):
+        self._primary = primary
+        self._mirror = mirror
+        self._wrappers: Dict[str, Callable] = {}
+    
+    def __getattr__(self, name):
+        wrapper = self._wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+        
+        attr = getattr(self._primary, name)
+        mirror = self._mirror
+        if name in MIRRORED_WRITE_COMMANDS and mirror.dual_write:
+            def wrapper(*args, **kwargs):
+                result = attr(*args, **kwargs)
+                mirror.submit_write(name, args, kwargs)
+                return result
+        elif name in SHADOW_READ_COMMANDS and mirror.shadow_read:
+            def wrapper(*args, **kwargs):
+                result = attr(*args, **kwargs)
+                if random.random() < mirror.sample_rate:
+                    mirror.submit_shadow_read(name, args, kwargs, result)
+                return result
+        elif name == 'pipeline' and mirror.dual_write:
+            def wrapper(*args, **kwargs):
+                return _MirroredPipeline(attr(*args, **kwargs), mirror)
+        else:
+            return attr
+        
+        self._wrappers[name] = wrapper
+        return wrapper
+
+class _AsyncMirroredPipeline(_MirroredPipeline):
+    """_MirroredPipeline for redis.asyncio pipelines (queueing is sync, execute is awaited)"""
+    
+    async def execute(self, *args, **kwargs):
+        results = await self._pipeline.execute(*args, **kwargs)
+        if self._commands:
+            self._mirror.submit_pipeline(self._commands)
+            self._commands = []
+        return results
+
+class AsyncMirroringRedis(MirroringRedis):
+    """MirroringRedis for the asyncio engine's redis.asyncio client"""
+    
+    def __getattr__(self, name):
+        wrapper = self._wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+        
+        attr = getattr(self._primary, name)
+        mirror = self._mirror
+        if name in MIRRORED_WRITE_COMMANDS and mirror.dual_write:
+            async def wrapper(*args, **kwargs):
+                result = await attr(*args, **kwargs)
+                mirror.submit_write(name, args, kwargs)
+                return result
+        elif name in SHADOW_READ_COMMANDS and mirror.shadow_read:
+            async def wrapper(*args, **kwargs):
+                result = await attr(*args, **kwargs)
+                if random.random() < mirror.sample_rate:
+                    mirror.submit_shadow_read(name, args, kwargs, result)
+                return result
+        elif name == 'pipeline' and mirror.dual_write:
+            def wrapper(*args, **kwargs):
+                return _AsyncMirroredPipeline(attr(*args, **kwargs), mirror)
+        else:
+            return attr
+        
+        self._wrappers[name] = wrapper
+        return wrapper
 
 # Expanded player names for larger dataset
 PLAYER_NAMES = [
@@ -124,6 +574,918 @@ CHAT_TEMPLATES = [
     "Amazing play!", "Spectacular!", "Outstanding!", "Magnificent!", "Phenomenal!"
 ]
 
+# Key families tracked by the memory footprint sampler (longest prefix wins)
+KEY_FAMILIES = [
+    'cache:rapid:', 'cache:update:', 'cache:item:', 'temp:session:', 'temp:data:', 'temp:lobby:',
+    'temp:match:', 'temp:', 'analytics:realtime:', 'analytics:event:', 'user:session:', 'game:lobby:',
+    'achievement:', 'notification:', 'purchase:', 'ratelimit:', 'rate:', 'event:temp:',
+    'leaderboard:', 'messages:', 'online:', 'migration:'
+]
+
+# Steady-state populations for keys the simulation creates continuously (bounded key mode)
+KEY_POPULATION_DEFAULTS = {
+    'cache:rapid:': 5000,
+    'temp:session:': 2000,
+    'temp:data:': 1000,
+    'temp:lobby:': 500,
+    'temp:match:': 500,
+    'analytics:realtime:': 5000,
+    'event:temp:': 1000,
+    'purchase:': 20,  # Per player
+}
+
+class RateGovernor:
+    """Global token bucket that paces all simulation workers to a target ops/sec
+    
+    Workers reserve tokens for the operations they run; the shared bucket divides the
+    target rate between however many workers are competing for it. A target of 0
+    disables the governor and workers fall back to their own random sleeps.
+    """
+    
+    def __init__(self, target_ops_per_sec: int = 0, burst_seconds: float = 0.1):
+        self._lock = threading.Lock()
+        self.burst_seconds = burst_seconds
+        self.set_rate(target_ops_per_sec)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.target_ops_per_sec > 0
+    
+    def set_rate(self, target_ops_per_sec: int):
+        """Change the target rate at runtime (takes effect on the next reservation)"""
+        with self._lock:
+            self.target_ops_per_sec = max(0, int(target_ops_per_sec))
+            self._tokens = 0.0
+            self._last_refill = time.monotonic()
+    
+    def _reserve(self, ops: int) -> float:
+        """Take tokens for `ops` operations and return how long the caller must wait"""
+        with self._lock:
+            rate = self.target_ops_per_sec
+            if rate <= 0:
+                return 0.0
+            now = time.monotonic()
+            capacity = max(1.0, rate * self.burst_seconds)
+            self._tokens = min(capacity, self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            self._tokens -= ops
+            return -self._tokens / rate if self._tokens < 0 else 0.0
+    
+    def acquire(self, ops: int = 1, stop_event: Optional[threading.Event] = None):
+        """Block the calling thread until `ops` operations are allowed (or stop_event is set)"""
+        wait = self._reserve(ops)
+        if wait > 0:
+            if stop_event:
+                stop_event.wait(wait)
+            else:
+                time.sleep(wait)
+    
+    async def acquire_async(self, ops: int = 1):
+        """Coroutine version of acquire() for the asyncio engine"""
+        wait = self._reserve(ops)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AsyncSimulationEngine:
+    """Asyncio simulation engine - hundreds of player-session coroutines over redis.asyncio
+    
+    Runs its own event loop on a single thread, so one instance can drive thousands of
+    concurrent "players" without one OS thread per worker. Uses the same key patterns
+    and PlayerPopulation session state machine as the threaded GameWorkers.
+    """
+    
+    def __init__(self, arena: 'RedisArenaApp', sessions: int = 500, pool_size: int = 100):
+        self.arena = arena
+        self.sessions = sessions
+        self.pool_size = pool_size
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        """Start the event loop thread"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run_loop, daemon=True, name="AsyncEngine")
+        self.thread.start()
+        logger.info(f"✅ Async engine started with {self.sessions} player sessions (pool size {self.pool_size})")
+    
+    def stop(self, timeout: float = 5.0):
+        """Signal all sessions to finish and wait for the loop thread"""
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        self.thread = None
+    
+    def _run_loop(self):
+        try:
+            asyncio.run(self._main())
+        except Exception as e:
+            logger.error(f"Async engine error: {e}")
+        logger.info("⚡ Async engine stopped")
+    
+    async def _main(self):
+        self._client = self.arena.redis_mgr.get_async_connection(self.pool_size)
+        self._client_generation = self.arena.redis_mgr.generation
+        try:
+            await asyncio.gather(*(self._player_session(i) for i in range(self.sessions)))
+        finally:
+            await self._close_client(self._client)
+    
+    async def _close_client(self, client):
+        await client.aclose()
+        await client.connection_pool.disconnect()
+    
+    def _current_client(self):
+        """Async client for the active backend - rebuilt after a RedisManager hot-swap"""
+        if self._client_generation != self.arena.redis_mgr.generation:
+            old_client = self._client
+            self._client = self.arena.redis_mgr.get_async_connection(self.pool_size)
+            self._client_generation = self.arena.redis_mgr.generation
+            asyncio.get_running_loop().create_task(self._close_client(old_client))
+        return self._client
+    
+    def _active(self) -> bool:
+        return self.running and self.arena.simulation_active
+    
+    async def _player_session(self, session_id: int):
+        """Drive the shared player population: one session transition per step, then think time"""
+        # Stagger start-up so sessions don't all fire on the same tick
+        await asyncio.sleep(random.uniform(0, 1.0))
+        
+        while self._active():
+            # Same state machine (and active-set rotation) as the threaded engine
+            player, state, next_state = self.arena.players.step()
+            try:
+                if not await self._gated(self._transition, player, state, next_state):
+                    break
+                await self.arena.rate_governor.acquire_async(1)
+                await asyncio.sleep(random.uniform(0.05, 0.5))  # Player "think time"
+            except Exception as e:
+                logger.error(f"Async session {session_id} error: {e}")
+                await asyncio.sleep(0.1)
+    
+    async def _gated(self, action, *args) -> bool:
+        """Run one session step as an in-flight batch on the current backend
+        
+        Waits while a backend switch or write freeze holds the gate; returns False
+        without running the step if the engine stops first.
+        """
+        while not self.arena.redis_mgr.try_begin_batch():
+            if not self._active():
+                return False
+            await asyncio.sleep(0.005)
+        succeeded = False
+        try:
+            await action(self._current_client(), *args)
+            succeeded = True
+        finally:
+            self.arena.redis_mgr.end_batch(succeeded)
+        return True
+    
+    async def _transition(self, client, player: str, state: str, next_state: str):
+        """Write what one session transition implies - mirrors _simulate_player_activity"""
+        if next_state == 'offline':
+            await self._logout(client, player)
+        elif state == 'offline':
+            await self._login(client, player)
+        elif next_state == 'in_game':
+            await self._play_round(client, player)
+        elif next_state == 'shopping':
+            purchase_key = f'purchase:{player}:{self.arena.key_population.next_id("purchase:")}'
+            await client.setex(purchase_key, 86400, json.dumps({
+                'player': player,
+                'item': random.choice(GAME_ITEMS),
+                'price': random.randint(100, 10000),
+                'timestamp': time.time()
+            }))
+            self.arena.total_operations += 1
+        else:
+            status = {'lobby': 'in-menu', 'matchmaking': 'in-menu', 'post_game': 'idle'}
+            await client.hset(f'user:session:{player}', 'status', status[next_state])
+            self.arena.total_operations += 1
+    
+    async def _login(self, client, player: str):
+        pipe = client.pipeline(transaction=False)
+        pipe.sadd('online:players', player)
+        pipe.hset(f'user:session:{player}', mapping={
+            'username': player,
+            'last_seen': datetime.now().isoformat(),
+            'status': 'online'
+        })
+        pipe.expire(f'user:session:{player}', random.randint(1800, 86400))
+        await pipe.execute()
+        self.arena.total_operations += 3
+    
+    async def _logout(self, client, player: str):
+        pipe = client.pipeline(transaction=False)
+        pipe.srem('online:players', player)
+        pipe.hset(f'user:session:{player}', 'status', 'offline')
+        await pipe.execute()
+        self.arena.total_operations += 2
+    
+    async def _play_round(self, client, player: str):
+        """A single game round - mirrors the GameWorker operation mix"""
+        operation = random.choice(['update_leaderboard', 'post_message', 'update_session',
+                                   'create_temp_data', 'update_analytics'])
+        
+        started = time.perf_counter()
+        if operation == 'update_leaderboard':
+            new_score = await client.zincrby('leaderboard:global', self.arena._random_score_change(), player)
+            if new_score < 100:
+                new_score = 100
+                await client.zadd('leaderboard:global', {player: new_score})
+            elif new_score > 50000000:
+                new_score = 50000000
+                await client.zadd('leaderboard:global', {player: new_score})
+            self.arena.leaderboard_view.record(player, new_score)
+        elif operation == 'post_message':
+            message = self.arena._build_chat_message(player)
+            if message:
+                pipe = client.pipeline(transaction=False)
+                pipe.lpush('messages:global', json.dumps(message))
+                pipe.ltrim('messages:global', 0, 49)
+                await pipe.execute()
+        elif operation == 'update_session':
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(f'user:session:{player}', 'games_played', 1)
+            pipe.hset(f'user:session:{player}', 'status', random.choice(['playing', 'idle', 'in-menu', 'in-game']))
+            await pipe.execute()
+        elif operation == 'create_temp_data':
+            await client.setex(f'temp:match:{self.arena.key_population.next_id("temp:match:")}', random.randint(600, 1800),
+                               json.dumps({
+                                   'players': self.arena.players.sample(random.randint(4, 8)),
+                                   'status': 'active'
+                               }))
+        elif operation == 'update_analytics':
+            event_suffix = self.arena.key_population.next_id('analytics:realtime:', f'{int(time.time())}:{random.randint(1, 1000)}')
+            await client.setex(f'analytics:realtime:{event_suffix}',
+                               random.randint(1800, 7200),
+                               json.dumps({
+                                   'player': player,
+                                   'action': random.choice(['click', 'view', 'purchase', 'achievement', 'level_up']),
+                                   'value': random.randint(1, 500),
+                                   'timestamp': time.time()
+                               }))
+        self.arena.latency.record(operation, time.perf_counter() - started)
+        
+        self.arena.total_operations += 1
+
+class SnapshotCache:
+    """Short-lived, single-flight cache for an expensive snapshot
+    
+    Concurrent readers share one loader call; the result is kept both as a dict and as
+    pre-serialised JSON bytes so HTTP responses skip re-encoding.
+    """
+    
+    def __init__(self, loader, max_age: float = 0.25):
+        self.loader = loader
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._payload = None
+        self._body = b''
+        self._taken_at = 0.0
+    
+    def _fresh(self) -> bool:
+        return self._payload is not None and (time.monotonic() - self._taken_at) < self.max_age
+    
+    def get(self) -> Tuple[Dict, bytes]:
+        """Return (payload, json_bytes), refreshing at most once per max_age"""
+        if self._fresh():
+            return self._payload, self._body
+        
+        with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not self._fresh():
+                payload = self.loader()
+                self._body = json.dumps(payload).encode('utf-8')
+                self._payload = payload
+                self._taken_at = time.monotonic()
+            return self._payload, self._body
+    
+    def invalidate(self):
+        """Force the next get() to reload (e.g. after simulation state changes)"""
+        self._taken_at = 0.0
+
+class LeaderboardView:
+    """In-memory top-K leaderboard kept current from the workers' own ZINCRBY results
+    
+    ZINCRBY returns the player's new absolute score, so every write keeps the local
+    view exact for that player. A periodic reconcile against Redis corrects anything
+    changed by other writers and records how far the view had drifted.
+    """
+    
+    def __init__(self, key: str = 'leaderboard:global', size: int = 10):
+        self.key = key
+        self.size = size
+        self._scores: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+        self.reconcile_count = 0
+        self.last_reconciled = 0.0
+        self.last_drift = {'rank_mismatches': 0, 'length_diff': 0, 'max_score_drift': 0}
+    
+    def record(self, player: str, score: float):
+        """Record a score returned by a leaderboard write"""
+        with self._lock:
+            self._scores[player] = score
+    
+    def top(self, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        with self._lock:
+            return heapq.nlargest(k or self.size, self._scores.items(), key=lambda item: item[1])
+    
+    def reset(self):
+        with self._lock:
+            self._scores.clear()
+            self.ready = False
+    
+    def reconcile(self, connection):
+        """Compare against the server's top-K, adopt server scores and record drift"""
+        local_top = self.top()
+        
+        pipe = connection.pipeline()
+        pipe.zrevrange(self.key, 0, self.size - 1, withscores=True)
+        for player, _ in local_top:
+            pipe.zscore(self.key, player)
+        results = pipe.execute()
+        
+        server_top = results[0] or []
+        server_scores = results[1:]
+        
+        if self.ready:
+            # Compare only ranks both sides have; a short side is reported as length_diff
+            rank_mismatches = sum(
+                1 for (local_player, _), (server_player, _) in zip(local_top, server_top)
+                if local_player != server_player
+            )
+            max_score_drift = max(
+                (abs(local_score - (server_score or 0))
+                 for (_, local_score), server_score in zip(local_top, server_scores)),
+                default=0
+            )
+            self.last_drift = {'rank_mismatches': rank_mismatches,
+                               'length_diff': len(local_top) - len(server_top),
+                               'max_score_drift': int(max_score_drift)}
+        
+        with self._lock:
+            for (player, _), server_score in zip(local_top, server_scores):
+                if server_score is None:
+                    self._scores.pop(player, None)
+                else:
+                    self._scores[player] = server_score
+            for player, score in server_top:
+                self._scores[player] = score
+            
+            # Only the head matters for top-K; any player written later comes back with an exact score
+            if len(self._scores) > self.size * 10:
+                self._scores = dict(heapq.nlargest(self.size * 10, self._scores.items(), key=lambda item: item[1]))
+            
+            self.ready = True
+        
+        self.reconcile_count += 1
+        self.last_reconciled = time.time()
+    
+    def drift_stats(self) -> Dict:
+        return {
+            **self.last_drift,
+            'reconcile_count': self.reconcile_count,
+            'seconds_since_reconcile': round(time.time() - self.last_reconciled, 1) if self.last_reconciled else None
+        }
+
+class KeyspaceMemorySampler:
+    """Estimates per-prefix key counts and memory with a rate-limited incremental SCAN
+    
+    Each tick issues at most `scan_budget` SCAN calls and a handful of pipelined
+    MEMORY USAGE calls on randomly chosen keys per family, so the live workload
+    barely notices. When a full SCAN pass completes, counts are scaled to DBSIZE
+    and multiplied by the sampled average size per family.
+    """
+    
+    def __init__(self, prefixes: List[str], scan_count: int = 200, scan_budget: int = 5,
+                 samples_per_family: int = 2):
+        self.prefixes = sorted(prefixes, key=len, reverse=True)
+        self.scan_count = scan_count
+        self.scan_budget = scan_budget
+        self.samples_per_family = samples_per_family
+        self.passes_completed = 0
+        self.report: List[Dict] = []
+        self.report_generated_at = None
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._start_pass()
+    
+    def _start_pass(self):
+        self._pass_started = time.time()
+        self._scanned = 0
+        self._counts: Dict[str, int] = {}
+        self._bytes: Dict[str, List[int]] = {}  # family -> [sampled_bytes_total, samples]
+    
+    def _family(self, key: str) -> str:
+        for prefix in self.prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return 'other'
+    
+    def tick(self, connection):
+        """Advance the scan by one bounded step"""
+        with self._lock:
+            for _ in range(self.scan_budget):
+                self._cursor, keys = connection.scan(self._cursor, count=self.scan_count)
+                self._sample_batch(connection, keys)
+                if self._cursor == 0:
+                    self._finish_pass(connection)
+                    break
+    
+    def _sample_batch(self, connection, keys: List[str]):
+        by_family: Dict[str, List[str]] = {}
+        for key in keys:
+            by_family.setdefault(self._family(key), []).append(key)
+        
+        sampled = []
+        for family, family_keys in by_family.items():
+            self._counts[family] = self._counts.get(family, 0) + len(family_keys)
+            for key in random.sample(family_keys, min(self.samples_per_family, len(family_keys))):
+                sampled.append((family, key))
+        self._scanned += len(keys)
+        
+        if not sampled:
+            return
+        pipe = connection.pipeline(transaction=False)
+        for _, key in sampled:
+            pipe.memory_usage(key)
+        for (family, _), usage in zip(sampled, pipe.execute(raise_on_error=False)):
+            # Keys can expire between SCAN and MEMORY USAGE
+            if isinstance(usage, int):
+                totals = self._bytes.setdefault(family, [0, 0])
+                totals[0] += usage
+                totals[1] += 1
+    
+    def _finish_pass(self, connection):
+        total_keys = connection.dbsize()
+        report = []
+        for family, count in self._counts.items():
+            sampled_bytes, samples = self._bytes.get(family, [0, 0])
+            avg_bytes = sampled_bytes / samples if samples else 0
+            estimated_keys = int(count / self._scanned * total_keys) if self._scanned else 0
+            report.append({
+                'prefix': family,
+                'scanned_keys': count,
+                'estimated_keys': estimated_keys,
+                'sampled_keys': samples,
+                'avg_bytes': int(avg_bytes),
+                'estimated_bytes': int(avg_bytes * estimated_keys)
+            })
+        report.sort(key=lambda row: row['estimated_bytes'], reverse=True)
+        
+        self.report = report
+        self.report_generated_at = datetime.now().isoformat()
+        self.passes_completed += 1
+        logger.info(f"🧮 Memory footprint pass {self.passes_completed}: {len(report)} families, "
+                    f"~{sum(r['estimated_bytes'] for r in report) / 1024 / 1024:.1f} MB across {total_keys:,} keys")
+        self._start_pass()
+    
+    def snapshot(self) -> Dict:
+        return {
+            'families': self.report,
+            'total_estimated_bytes': sum(row['estimated_bytes'] for row in self.report),
+            'generated_at': self.report_generated_at,
+            'passes_completed': self.passes_completed,
+            'current_pass': {
+                'scanned_keys': self._scanned,
+                'started_at': datetime.fromtimestamp(self._pass_started).isoformat()
+            }
+        }
+
+class KeyPopulationController:
+    """Holds per-prefix key populations steady by recycling IDs from bounded pools
+    
+    Slots are handed out round-robin, so each key in a pool is rewritten (and its TTL
+    refreshed) once every pool_size writes. Memory stays flat with run length instead
+    of depending on TTL expiry. When disabled, fresh UUIDs are used as before.
+    """
+    
+    def __init__(self, pool_sizes: Dict[str, int], enabled: bool = False):
+        self.enabled = enabled
+        self.pool_sizes = dict(pool_sizes)
+        self._writes = {prefix: 0 for prefix in self.pool_sizes}
+        self._lock = threading.Lock()
+    
+    def next_id(self, prefix: str, default: Optional[str] = None) -> str:
+        """Next recycled slot for `prefix`, or `default` (a fresh UUID if None) when unbounded"""
+        if not self.enabled or prefix not in self.pool_sizes:
+            return default if default is not None else str(uuid.uuid4())
+        with self._lock:
+            slot = self._writes[prefix] % self.pool_sizes[prefix]
+            self._writes[prefix] += 1
+        return str(slot)
+    
+    def stats(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'pools': {
+                prefix: {'size': size, 'writes': self._writes[prefix]}
+                for prefix, size in self.pool_sizes.items()
+            }
+        }
+
+def parse_key_population_sizes(spec: str) -> Dict[str, int]:
+    """Parse 'prefix=size,prefix=size' overrides on top of KEY_POPULATION_DEFAULTS"""
+    sizes = dict(KEY_POPULATION_DEFAULTS)
+    for item in spec.split(','):
+        if '=' in item:
+            prefix, size = item.rsplit('=', 1)
+            sizes[prefix.strip()] = int(size)
+    return sizes
+
+# Player session state machine: state -> [(next_state, weight)]
+PLAYER_SESSION_TRANSITIONS = {
+    'offline': [('lobby', 1)],
+    'lobby': [('matchmaking', 6), ('shopping', 2), ('offline', 1)],
+    'matchmaking': [('in_game', 8), ('lobby', 1)],
+    'in_game': [('in_game', 6), ('post_game', 3)],
+    'post_game': [('lobby', 4), ('matchmaking', 3), ('offline', 1)],
+    'shopping': [('lobby', 1)]
+}
+
+class PlayerPopulation:
+    """Synthetic player population with a rotating active set of session state machines
+    
+    Players are identified by index (0..size-1); the first len(PLAYER_NAMES) use the
+    curated names and the rest get numbered variants, so millions of players cost no
+    memory. Only the active set carries session state. Every rotation_interval seconds a
+    fraction of it is swapped for fresh players, spreading load over the keyspace the way
+    a real player base churns; rotated-out players are handed back for a clean logout.
+    """
+    
+    def __init__(self, size: int = len(PLAYER_NAMES), active_size: int = 1000,
+                 rotation_interval: float = 30.0, rotation_fraction: float = 0.1):
+        self.size = max(1, size)
+        self.active_size = max(1, min(active_size, self.size))
+        self.rotation_interval = rotation_interval
+        self.rotation_fraction = rotation_fraction
+        self._active: List[int] = random.sample(range(self.size), self.active_size)
+        self._active_set = set(self._active)
+        self._states: Dict[int, str] = {index: 'offline' for index in self._active}
+        self._departed = deque()
+        self._lock = threading.Lock()
+        self._next_rotation = time.monotonic() + rotation_interval
+        self.rotations = 0
+        self.players_activated = self.active_size
+        self.transitions = 0
+    
+    def name(self, index: int) -> str:
+        if index < len(PLAYER_NAMES):
+            return PLAYER_NAMES[index]
+        return f'{PLAYER_NAMES[index % len(PLAYER_NAMES)]}_{index}'
+    
+    def pick(self, exclude: Optional[str] = None) -> str:
+        """A random active player (never `exclude` unless the population is a single player)"""
+        player = self.name(random.choice(self._active))
+        if player == exclude and self.active_size > 1:
+            return self.pick(exclude)
+        return player
+    
+    def sample(self, count: int) -> List[str]:
+        return [self.name(index) for index in random.sample(self._active, min(count, self.active_size))]
+    
+    def step(self) -> Tuple[str, str, str]:
+        """Advance one player's session; returns (player, from_state, to_state)"""
+        with self._lock:
+            self._maybe_rotate()
+            if self._departed:
+                index, state = self._departed.popleft()
+                return self.name(index), state, 'offline'
+            
+            index = random.choice(self._active)
+            state = self._states[index]
+            choices, weights = zip(*PLAYER_SESSION_TRANSITIONS[state])
+            next_state = random.choices(choices, weights)[0]
+            self._states[index] = next_state
+            self.transitions += 1
+        return self.name(index), state, next_state
+    
+    def _maybe_rotate(self):
+        if self.active_size >= self.size or time.monotonic() < self._next_rotation:
+            return
+        self._next_rotation = time.monotonic() + self.rotation_interval
+        self.rotations += 1
+        
+        for slot in random.sample(range(self.active_size), max(1, int(self.active_size * self.rotation_fraction))):
+            # Pick a player outside the active set (the population is much larger than it)
+            incoming = random.randrange(self.size)
+            while incoming in self._active_set:
+                incoming = random.randrange(self.size)
+            
+            outgoing = self._active[slot]
+            state = self._states.pop(outgoing)
+            if state != 'offline':
+                self._departed.append((outgoing, state))
+            self._active_set.discard(outgoing)
+            self._active[slot] = incoming
+            self._active_set.add(incoming)
+            self._states[incoming] = 'offline'
+            self.players_activated += 1
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            states = {state: 0 for state in PLAYER_SESSION_TRANSITIONS}
+            for state in self._states.values():
+                states[state] += 1
+            return {
+                'population': self.size,
+                'active_set': self.active_size,
+                'online': self.active_size - states['offline'],
+                'states': states,
+                'rotations': self.rotations,
+                'players_activated': self.players_activated,
+                'pending_logouts': len(self._departed),
+                'transitions': self.transitions
+            }
+
+class CacheWorkloadModel:
+    """Cache read model targeting a configurable hit ratio
+    
+    Recently written cache keys go into a fixed-size ring buffer. Reads pick a live key
+    from the ring with probability `live_read_probability`, otherwise a key that cannot
+    exist. That probability is nudged every window of reads so the observed hit ratio
+    converges on the target despite TTL expiry and deletes.
+    """
+    
+    def __init__(self, target_hit_ratio: float = 0.8, ring_size: int = 5000, window: int = 500):
+        self.target_hit_ratio = min(1.0, max(0.0, target_hit_ratio))
+        self.live_read_probability = self.target_hit_ratio
+        self.window = window
+        self._ring: List[Optional[str]] = [None] * ring_size
+        self._pos = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.deletes = 0
+        self.read_latency_total = 0.0
+        self.read_latency_max = 0.0
+        self._window_hits = 0
+        self._window_reads = 0
+    
+    def record_write(self, key: str):
+        with self._lock:
+            self._ring[self._pos] = key
+            self._pos = (self._pos + 1) % len(self._ring)
+    
+    def _random_live_slot(self) -> Optional[int]:
+        # Only a few probes: an empty or sparse ring just turns the read into a miss
+        for _ in range(3):
+            slot = random.randrange(len(self._ring))
+            if self._ring[slot] is not None:
+                return slot
+        return None
+    
+    def pick_read_key(self) -> str:
+        if random.random() < self.live_read_probability:
+            with self._lock:
+                slot = self._random_live_slot()
+                if slot is not None:
+                    return self._ring[slot]
+        return f'cache:rapid:{uuid.uuid4()}'
+    
+    def take_delete_key(self) -> Optional[str]:
+        """Remove and return a live key to invalidate (None if the ring is empty)"""
+        with self._lock:
+            slot = self._random_live_slot()
+            if slot is None:
+                return None
+            key, self._ring[slot] = self._ring[slot], None
+            self.deletes += 1
+            return key
+    
+    def record_read(self, hit: bool, latency: float):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self._window_hits += 1
+            else:
+                self.misses += 1
+            self._window_reads += 1
+            self.read_latency_total += latency
+            self.read_latency_max = max(self.read_latency_max, latency)
+            
+            if self._window_reads >= self.window:
+                observed = self._window_hits / self._window_reads
+                self.live_read_probability = min(1.0, max(0.0,
+                    self.live_read_probability + 0.5 * (self.target_hit_ratio - observed)))
+                self._window_hits = 0
+                self._window_reads = 0
+    
+    def stats(self) -> Dict:
+        reads = self.hits + self.misses
+        return {
+            'target_hit_ratio': self.target_hit_ratio,
+            'hit_ratio': round(self.hits / reads, 3) if reads else 0.0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'deletes': self.deletes,
+            'avg_read_ms': round(self.read_latency_total / reads * 1000, 3) if reads else 0.0,
+            'max_read_ms': round(self.read_latency_max * 1000, 3)
+        }
+
+# Geometric latency buckets from 10us to ~12s (20% resolution)
+LATENCY_BUCKETS = [0.00001 * (1.2 ** i) for i in range(77)]
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cheap to record, mergeable)"""
+    
+    __slots__ = ('counts',)
+    
+    def __init__(self, counts: Optional[List[int]] = None):
+        self.counts = list(counts) if counts else [0] * (len(LATENCY_BUCKETS) + 1)
+    
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    
+    def merge(self, other: 'LatencyHistogram'):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+    
+    def minus(self, other: Optional['LatencyHistogram']) -> 'LatencyHistogram':
+        if other is None:
+            return LatencyHistogram(self.counts)
+        return LatencyHistogram([a - b for a, b in zip(self.counts, other.counts)])
+    
+    def total(self) -> int:
+        return sum(self.counts)
+    
+    def percentile(self, p: float) -> float:
+        """Upper bound (seconds) of the bucket containing the p-th percentile"""
+        total = self.total()
+        if not total:
+            return 0.0
+        threshold = total * p / 100.0
+        running = 0
+        for i, count in enumerate(self.counts):
+            running += count
+            if running >= threshold:
+                return LATENCY_BUCKETS[min(i, len(LATENCY_BUCKETS) - 1)]
+        return LATENCY_BUCKETS[-1]
+    
+    def summary(self) -> Dict:
+        return {
+            'count': self.total(),
+            'p50_ms': round(self.percentile(50) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3)
+        }
+
+class LatencyRecorder:
+    """Per-thread latency histograms keyed by (backend, operation)
+    
+    Each thread records into its own histograms without locking; merge_window()
+    (called from the performance monitor) sums them and diffs against the previous
+    merge to get the latest window. Histograms of threads that have exited are folded
+    into a single retired map, so restarting workers doesn't grow the list.
+    """
+    
+    def __init__(self, backend_label: Callable[[], str]):
+        self.backend_label = backend_label
+        self._local = threading.local()
+        self._thread_histograms: List[Tuple[threading.Thread, Dict[Tuple[str, str], LatencyHistogram]]] = []
+        self._retired: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._previous: Dict[Tuple[str, str], LatencyHistogram] = {}
+    
+    def _histograms(self) -> Dict[Tuple[str, str], LatencyHistogram]:
+        histograms = getattr(self._local, 'histograms', None)
+        if histograms is None:
+            histograms = self._local.histograms = {}
+            with self._lock:
+                self._thread_histograms.append((threading.current_thread(), histograms))
+        return histograms
+    
+    def record(self, operation: str, seconds: float):
+        key = (self.backend_label(), operation)
+        histograms = self._histograms()
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        histogram.record(seconds)
+    
+    @contextmanager
+    def measure(self, operation: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - started)
+    
+    def merge_window(self) -> Dict:
+        """Merge all threads and return {'window': ..., 'by_backend': ...} summaries"""
+        with self._lock:
+            # An exited thread records nothing more, so its counts can be folded for good
+            for thread, histograms in self._thread_histograms:
+                if not thread.is_alive():
+                    for key, histogram in histograms.items():
+                        self._retired.setdefault(key, LatencyHistogram()).merge(histogram)
+            self._thread_histograms = [(thread, histograms) for thread, histograms in self._thread_histograms
+                                       if thread.is_alive()]
+            thread_maps = [histograms for _, histograms in self._thread_histograms] + [self._retired]
+        
+        totals: Dict[Tuple[str, str], LatencyHistogram] = {}
+        for histograms in thread_maps:
+            for key, histogram in list(histograms.items()):
+                totals.setdefault(key, LatencyHistogram()).merge(histogram)
+        
+        window: Dict[str, Dict] = {}
+        cumulative: Dict[str, Dict] = {}
+        for (backend, operation), total in totals.items():
+            cumulative.setdefault(backend, {})[operation] = total.summary()
+            delta = total.minus(self._previous.get((backend, operation)))
+            if delta.total():
+                window.setdefault(backend, {})[operation] = delta.summary()
+        self._previous = totals
+        
+        return {'window': window, 'by_backend': cumulative}
+
+class SequenceTimeline:
+    """Monotonic sequence writer and verifier for measuring replication gaps and RPO
+    
+    Every tick INCRs the demo counter and records `seq:timestamp_ms:backend` in a sorted
+    set scored by seq. Reading that timeline back from a backend gives exact gaps,
+    duplicates (a seq issued by more than one writer) and, after a cutover, the last
+    sequence from the old backend that made it across.
+    """
+    
+    COUNTER_KEY = 'migration:demo:counter'
+    TIMELINE_KEY = 'migration:demo:timeline'
+    
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.last_written: Dict[str, Tuple[int, int]] = {}  # backend -> (seq, timestamp_ms)
+    
+    def write(self, connection, backend: str) -> int:
+        seq = connection.incr(self.COUNTER_KEY)
+        timestamp_ms = int(time.time() * 1000)
+        pipe = connection.pipeline(transaction=False)
+        pipe.zadd(self.TIMELINE_KEY, {f'{seq}:{timestamp_ms}:{backend}': seq})
+        if seq % 100 == 0:
+            pipe.zremrangebyrank(self.TIMELINE_KEY, 0, -(self.max_entries + 1))
+        pipe.execute()
+        self.last_written[backend] = (seq, timestamp_ms)
+        return seq
+    
+    def verify(self, connection, previous_backend: Optional[str] = None, batch: int = 5000) -> Dict:
+        """Stream the timeline from `connection` and compute gaps, duplicates and the cutoff"""
+        entries = 0
+        first_seq = last_seq = None
+        missing_total = 0
+        gaps: List[Dict] = []
+        duplicates = 0
+        by_backend: Dict[str, Dict] = {}
+        
+        offset = 0
+        while True:
+            chunk = connection.zrange(self.TIMELINE_KEY, offset, offset + batch - 1, withscores=True)
+            if not chunk:
+                break
+            offset += len(chunk)
+            
+            for member, score in chunk:
+                seq = int(score)
+                _, timestamp_ms, backend = member.split(':', 2)
+                entries += 1
+                
+                if last_seq is None:
+                    first_seq = seq
+                elif seq == last_seq:
+                    duplicates += 1
+                elif seq > last_seq + 1:
+                    missing_total += seq - last_seq - 1
+                    if len(gaps) < 20:
+                        gaps.append({'from': last_seq + 1, 'to': seq - 1, 'missing': seq - last_seq - 1})
+                last_seq = seq
+                
+                stats = by_backend.setdefault(backend, {'first_seq': seq, 'last_seq': seq, 'last_timestamp_ms': 0})
+                stats['last_seq'] = seq
+                stats['last_timestamp_ms'] = max(stats['last_timestamp_ms'], int(timestamp_ms))
+        
+        report = {
+            'entries': entries,
+            'first_seq': first_seq,
+            'last_seq': last_seq,
+            'missing_total': missing_total,
+            'gaps': gaps,
+            'duplicates': duplicates,
+            'by_backend': by_backend
+        }
+        
+        # After a cutover: compare what we wrote to the old backend with what arrived here
+        if previous_backend and previous_backend in self.last_written:
+            written_seq, written_ts = self.last_written[previous_backend]
+            replicated = by_backend.get(previous_backend)
+            replicated_seq = replicated['last_seq'] if replicated else 0
+            replicated_ts = replicated['last_timestamp_ms'] if replicated else 0
+            report['replication_cutoff'] = {
+                'previous_backend': previous_backend,
+                'last_written_seq': written_seq,
+                'last_replicated_seq': replicated_seq,
+                'lost_writes': max(0, written_seq - replicated_seq),
+                'rpo_ms': max(0, written_ts - replicated_ts) if replicated else None
+            }
+        return report
+
 class RedisArenaApp:
     def __init__(self, config: RedisConfig):
         self.redis_mgr = RedisManager(config)
@@ -133,9 +1495,91 @@ class RedisArenaApp:
         
         # Application state
         self.simulation_active = False
+        self._start_lock = threading.Lock()
+        # Set on stop so every worker sleep/pace wakes immediately
+        self.stop_event = threading.Event()
+        self.stop_timeout = float(os.getenv('SIMULATION_STOP_TIMEOUT', 5.0))
+        self.stop_status = {'state': 'idle'}
+        # Threads that outlived the last stop; they share stop_event, so no new run until they exit
+        self._straggler_threads: List[threading.Thread] = []
         self.data_loaded = False
         self.demo_counter_value = 0
         
+        # Simulation engine: 'threaded' (GameWorker threads) or 'asyncio' (player-session coroutines)
+        self.simulation_engine = os.getenv('SIMULATION_ENGINE', 'threaded').lower()
+        self.async_engine = None
+        
+        # Leaderboard maintained from ZINCRBY results, reconciled against Redis periodically
+        self.leaderboard_view = LeaderboardView('leaderboard:global', size=10)
+        self.leaderboard_reconcile_interval = float(os.getenv('LEADERBOARD_RECONCILE_INTERVAL', 10))
+        
+        # Per-prefix memory footprint estimates for sizing the migration target
+        self.memory_sampler = KeyspaceMemorySampler(
+            KEY_FAMILIES,
+            scan_count=int(os.getenv('MEMORY_SAMPLER_SCAN_COUNT', 200)),
+            scan_budget=int(os.getenv('MEMORY_SAMPLER_SCAN_BUDGET', 5)),
+            samples_per_family=int(os.getenv('MEMORY_SAMPLER_SAMPLES_PER_FAMILY', 2))
+        )
+        self.memory_sampler_interval = float(os.getenv('MEMORY_SAMPLER_INTERVAL', 2.0))
+        
+        # Bounded key mode: recycle IDs so key count holds at a steady state
+        self.key_population = KeyPopulationController(
+            parse_key_population_sizes(os.getenv('KEY_POPULATION_SIZES', '')),
+            enabled=os.getenv('KEY_POPULATION_MODE', 'unbounded').lower() == 'bounded'
+        )
+        
+        # Player population with a rotating active set of session state machines
+        self.players = PlayerPopulation(
+            size=int(os.getenv('PLAYER_POPULATION_SIZE', len(PLAYER_NAMES))),
+            active_size=int(os.getenv('PLAYER_ACTIVE_SET_SIZE', 1000)),
+            rotation_interval=float(os.getenv('PLAYER_ROTATION_INTERVAL', 30)),
+            rotation_fraction=float(os.getenv('PLAYER_ROTATION_FRACTION', 0.1))
+        )
+        
+        # Cache read path with a target hit ratio over recently written keys
+        self.cache_model = CacheWorkloadModel(
+            target_hit_ratio=float(os.getenv('CACHE_TARGET_HIT_RATIO', 0.8)),
+            ring_size=int(os.getenv('CACHE_RING_SIZE', 5000))
+        )
+        
+        # Per-operation latency histograms (per thread, merged by the performance monitor)
+        self.latency = LatencyRecorder(lambda: self.redis_mgr.backend_label)
+        self.latency_report = {'window': {}, 'by_backend': {}}
+        
+        # Dual-write / shadow-read mirroring to a secondary backend for migration validation
+        dual_mode = os.getenv('DUAL_MODE', 'off').lower()
+        if dual_mode in ('dual_write', 'shadow_read', 'both') and os.getenv('SECONDARY_REDIS_HOST'):
+            self.redis_mgr.enable_mirror(SecondaryMirror(
+                RedisConfig(
+                    host=os.environ['SECONDARY_REDIS_HOST'],
+                    port=int(os.getenv('SECONDARY_REDIS_PORT', 6379)),
+                    password=os.getenv('SECONDARY_REDIS_PASSWORD', ''),
+                    db=int(os.getenv('SECONDARY_REDIS_DB', 0))
+                ),
+                dual_write=dual_mode in ('dual_write', 'both'),
+                shadow_read=dual_mode in ('shadow_read', 'both'),
+                sample_rate=float(os.getenv('SHADOW_READ_SAMPLE_RATE', 0.01)),
+                queue_size=int(os.getenv('SECONDARY_QUEUE_SIZE', 10000))
+            ))
+        
+        # Demo counter as a high-frequency monotonic sequence with a verifiable timeline
+        self.sequence = SequenceTimeline(max_entries=int(os.getenv('DEMO_TIMELINE_MAX_ENTRIES', 100000)))
+        self.demo_counter_hz = float(os.getenv('DEMO_COUNTER_HZ', 1.0))
+        
+        # Seed snapshots (RESP files replayable here or with `redis-cli --pipe`)
+        self.seed_snapshot_dir = os.getenv('SEED_SNAPSHOT_DIR', '/opt/redisarena/snapshots')
+        self.seed_pipeline_size = int(os.getenv('SEED_PIPELINE_SIZE', 10000))
+        
+        # Live backend switching (API call or .env file watch)
+        self._switch_lock = threading.Lock()
+        self.backend_drain_timeout = float(os.getenv('BACKEND_DRAIN_TIMEOUT', 5.0))
+        # Write freezes thaw on their own after this long in case the caller never comes back
+        self.write_freeze_max_seconds = float(os.getenv('WRITE_FREEZE_MAX_SECONDS', 60.0))
+        self._freeze_timer: Optional[threading.Timer] = None
+        
+        # Global ops/sec governor shared by all workers (0 = unthrottled)
+        self.rate_governor = RateGovernor(int(os.getenv('TARGET_OPS_PER_SEC', 0)))
+        
         # Performance tracking
         self.ops_per_second = 0
         self.total_operations = 0
@@ -147,12 +1591,26 @@ class RedisArenaApp:
         self.demo_thread = None
         self.cache_thread = None
         self.ttl_thread = None
+        self.memory_thread = None
+        
+        # WebSocket stats stream
+        self.connected_clients = 0
+        
+        # Dashboard stats snapshot shared by all HTTP and WebSocket readers
+        self.stats_cache = SnapshotCache(
+            self._collect_stats,
+            max_age=float(os.getenv('STATS_CACHE_MAX_AGE_MS', 250)) / 1000.0
+        )
         
         self._setup_routes()
         self._setup_websocket_handlers()
         
         # AUTO-DETECT EXISTING DATA ON STARTUP (Migration-friendly)
         self._auto_detect_and_continue()
+        
+        # Hot-swap the backend when do_cutover.sh rewrites the .env file
+        if os.getenv('BACKEND_WATCH_ENV', 'true').lower() == 'true':
+            threading.Thread(target=self._env_watcher, daemon=True, name="EnvWatcher").start()
     
     def _validate_player_name(self, name: str) -> bool:
         """Validate player name for security"""
@@ -170,6 +1628,15 @@ class RedisArenaApp:
         content_lower = content.lower()
         return not any(pattern in content_lower for pattern in dangerous_patterns)
     
+    def _validate_snapshot_name(self, name: str) -> bool:
+        """Validate snapshot name (a bare file stem inside SEED_SNAPSHOT_DIR)"""
+        if not name or not isinstance(name, str):
+            return False
+        return bool(re.match(r'^[a-zA-Z0-9_\-]{1,64}$', name))
+    
+    def _snapshot_path(self, name: str) -> str:
+        return os.path.join(self.seed_snapshot_dir, f'{name}.resp')
+    
     def _sanitize_html(self, text: str) -> str:
         """Basic HTML sanitization"""
         if not isinstance(text, str):
@@ -257,6 +1724,159 @@ class RedisArenaApp:
                 'server_status': 'Error'
             }
     
+    def _collect_stats(self) -> Dict:
+        """Build the dashboard stats payload (shared by /api/stats and the WebSocket stream)"""
+        # Always return profile stats
+        profile_stats = self._get_profile_stats()
+        
+        if not self.simulation_active:
+            return {
+                'success': True,
+                'leaderboard': [],
+                'recent_messages': [],
+                'online_count': 0,
+                'ops_per_second': 0,
+                'demo_counter': 0,
+                'profile_stats': profile_stats,
+                'simulation_running': False,
+                'data_loaded': self.data_loaded
+            }
+        
+        # Use Redis pipeline for efficient batch operations
+        pipe = self.redis_mgr.connection.pipeline()
+        pipe.lrange('messages:global', 0, 19)                        # 0: messages
+        pipe.scard('online:players')                                  # 1: online_count
+        pipe.get('migration:demo:counter')                           # 2: demo_counter
+        if not self.leaderboard_view.ready:
+            pipe.zrevrange('leaderboard:global', 0, 9, withscores=True)  # 3: leaderboard (until the view is seeded)
+        results = pipe.execute()
+        
+        # Process results from pipeline
+        leaderboard_data = self.leaderboard_view.top() if self.leaderboard_view.ready else (results[3] or [])
+        leaderboard = [{'player': player, 'score': int(score)} for player, score in leaderboard_data]
+        
+        recent_messages = results[0] or []
+        messages = [json.loads(msg) for msg in recent_messages] if recent_messages else []
+        
+        online_count = results[1] or 0
+        demo_counter = results[2] or 0
+        
+        return {
+            'success': True,
+            'leaderboard': leaderboard,
+            'recent_messages': messages,
+            'online_count': online_count,
+            'ops_per_second': self.ops_per_second,
+            'target_ops_per_sec': self.rate_governor.target_ops_per_sec,
+            'demo_counter': int(demo_counter),
+            'leaderboard_drift': self.leaderboard_view.drift_stats(),
+            'cache_stats': self.cache_model.stats(),
+            'player_population': self.players.stats(),
+            'latency': self.latency_report,
+            'backend': self.redis_mgr.backend_label,
+            'last_backend_switch': self.redis_mgr.last_switch,
+            'mirror': self.redis_mgr.mirror.stats() if self.redis_mgr.mirror else None,
+            'profile_stats': profile_stats,
+            'simulation_running': True,
+            'data_loaded': self.data_loaded
+        }
+    
+    def _stats_broadcaster(self):
+        """Compute stats once per interval and push them to every connected dashboard
+        
+        Redis cost is one snapshot per interval no matter how many browsers are open.
+        """
+        interval = float(os.getenv('STATS_BROADCAST_INTERVAL', 1.0))
+        logger.info(f"📡 Stats broadcaster started ({interval}s interval)")
+        
+        while True:
+            self.socketio.sleep(interval)
+            if self.connected_clients == 0:
+                continue
+            try:
+                payload, _ = self.stats_cache.get()
+                self.socketio.emit('stats', payload)
+            except Exception as e:
+                logger.error(f"Stats broadcast error: {e}")
+    
+    def switch_backend(self, new_config: RedisConfig) -> Dict:
+        """Hot-swap to a new Redis backend without restarting (simulation keeps running)"""
+        if new_config == self.redis_mgr.config:
+            return {'switched': False, 'current_backend': self.redis_mgr.backend_label}
+        # Connect before taking the lock so a slow or dead target can't stall freeze/thaw
+        new_connection = RedisManager.connect(new_config)
+        with self._switch_lock:
+            if new_config == self.redis_mgr.config:
+                new_connection.connection_pool.disconnect()
+                return {'switched': False, 'current_backend': self.redis_mgr.backend_label}
+            result = self.redis_mgr.switch_backend(new_config, drain_timeout=self.backend_drain_timeout,
+                                                   new_connection=new_connection)
+            self._cancel_freeze_timer()
+        
+        # The new backend's sorted set is the source of truth from here on
+        try:
+            self.leaderboard_view.reconcile(self.redis_mgr.connection)
+        except Exception as e:
+            logger.error(f"Leaderboard reconcile after switch failed: {e}")
+        self.stats_cache.invalidate()
+        return {'switched': True, **result}
+    
+    def freeze_writes(self, max_seconds: Optional[float] = None) -> Dict:
+        """Hold all workers at the gate until thaw_writes(), a backend switch, or max_seconds"""
+        max_seconds = max_seconds or self.write_freeze_max_seconds
+        with self._switch_lock:
+            result = self.redis_mgr.freeze_writes(drain_timeout=self.backend_drain_timeout)
+            self._cancel_freeze_timer()
+            self._freeze_timer = threading.Timer(max_seconds, self._auto_thaw)
+            self._freeze_timer.daemon = True
+            self._freeze_timer.start()
+        logger.info(f"🧊 Writes frozen on {result['backend']} (drain {result['drain_ms']:.1f}ms, "
+                    f"auto-thaw in {max_seconds:g}s)")
+        return {'max_seconds': max_seconds, **result}
+    
+    def thaw_writes(self) -> Optional[Dict]:
+        with self._switch_lock:
+            self._cancel_freeze_timer()
+            result = self.redis_mgr.thaw_writes()
+        if result:
+            logger.info(f"🔥 Writes thawed after {result['write_freeze_ms']:.1f}ms")
+        return result
+    
+    def _cancel_freeze_timer(self):
+        if self._freeze_timer:
+            self._freeze_timer.cancel()
+            self._freeze_timer = None
+    
+    def _auto_thaw(self):
+        with self._switch_lock:
+            self._freeze_timer = None
+            result = self.redis_mgr.thaw_writes()
+        if result:
+            logger.warning(f"⚠️ Write freeze hit WRITE_FREEZE_MAX_SECONDS - thawed after {result['write_freeze_ms']:.1f}ms")
+    
+    def _env_watcher(self):
+        """Poll the .env file and hot-swap when the Redis settings change"""
+        interval = float(os.getenv('BACKEND_WATCH_INTERVAL', 1.0))
+        last_mtime = os.path.getmtime(ENV_FILE) if os.path.exists(ENV_FILE) else None
+        logger.info(f"👀 Watching {ENV_FILE} for backend changes ({interval}s interval)")
+        
+        while True:
+            time.sleep(interval)
+            try:
+                if not os.path.exists(ENV_FILE):
+                    continue
+                mtime = os.path.getmtime(ENV_FILE)
+                if mtime == last_mtime:
+                    continue
+                last_mtime = mtime
+                
+                new_config = read_env_config()
+                if new_config != self.redis_mgr.config:
+                    logger.info(f"📝 {ENV_FILE} changed - switching backend to {new_config.host}:{new_config.port}")
+                    self.switch_backend(new_config)
+            except Exception as e:
+                logger.error(f"Backend hot-swap from {ENV_FILE} failed: {e}")
+    
     def _setup_routes(self):
         @self.app.route('/')
         def home():
@@ -265,51 +1885,8 @@ class RedisArenaApp:
         @self.app.route('/api/stats')
         def get_stats():
             try:
-                # Always return profile stats
-                profile_stats = self._get_profile_stats()
-                
-                if not self.simulation_active:
-                    return jsonify({
-                        'success': True,
-                        'leaderboard': [],
-                        'recent_messages': [],
-                        'online_count': 0,
-                        'ops_per_second': 0,
-                        'demo_counter': 0,
-                        'profile_stats': profile_stats,
-                        'simulation_running': False,
-                        'data_loaded': self.data_loaded
-                    })
-                
-                # Use Redis pipeline for efficient batch operations
-                pipe = self.redis_mgr.connection.pipeline()
-                pipe.zrevrange('leaderboard:global', 0, 9, withscores=True)  # 0: leaderboard
-                pipe.lrange('messages:global', 0, 19)                        # 1: messages
-                pipe.scard('online:players')                                  # 2: online_count
-                pipe.get('migration:demo:counter')                           # 3: demo_counter
-                results = pipe.execute()
-                
-                # Process results from pipeline
-                leaderboard_data = results[0] or []
-                leaderboard = [{'player': player, 'score': int(score)} for player, score in leaderboard_data]
-                
-                recent_messages = results[1] or []
-                messages = [json.loads(msg) for msg in recent_messages] if recent_messages else []
-                
-                online_count = results[2] or 0
-                demo_counter = results[3] or 0
-                
-                return jsonify({
-                    'success': True,
-                    'leaderboard': leaderboard,
-                    'recent_messages': messages,
-                    'online_count': online_count,
-                    'ops_per_second': self.ops_per_second,
-                    'demo_counter': int(demo_counter),
-                    'profile_stats': profile_stats,
-                    'simulation_running': True,
-                    'data_loaded': self.data_loaded
-                })
+                _, body = self.stats_cache.get()
+                return Response(body, mimetype='application/json')
             except Exception as e:
                 logger.error(f"Error getting stats: {e}")
                 return jsonify({'success': False, 'error': str(e)})
@@ -319,62 +1896,260 @@ class RedisArenaApp:
             try:
                 logger.info("🎮 Loading game data request received...")
                 
-                if self.simulation_active:
+                if self.simulation_active or self.stop_status.get('state') == 'stopping':
                     logger.warning("Cannot load data while simulation is running")
                     return jsonify({'success': False, 'message': 'Stop simulation first'})
                 
-                logger.info("🎮 Starting enhanced data load process...")
-                self._load_initial_data()
+                # Optional: {"export_snapshot": "name"} to record the seed, {"replay_snapshot": "name"} to reuse one
+                data = request.get_json(silent=True) or {}
+                export_name = data.get('export_snapshot')
+                replay_name = data.get('replay_snapshot')
+                for name in (export_name, replay_name):
+                    if name is not None and not self._validate_snapshot_name(name):
+                        return jsonify({'success': False, 'message': 'Invalid snapshot name'})
+                
+                if replay_name:
+                    path = self._snapshot_path(replay_name)
+                    if not os.path.exists(path):
+                        return jsonify({'success': False, 'message': f'Snapshot not found: {replay_name}'})
+                    result = self._replay_seed_snapshot(path)
+                else:
+                    logger.info("🎮 Starting enhanced data load process...")
+                    export_path = None
+                    if export_name:
+                        os.makedirs(self.seed_snapshot_dir, exist_ok=True)
+                        export_path = self._snapshot_path(export_name)
+                    result = self._load_initial_data(export_path)
+                
                 self.data_loaded = True
+                self.leaderboard_view.reset()
+                self.stats_cache.invalidate()
                 logger.info("✅ Enhanced game data loaded successfully!")
                 
-                return jsonify({'success': True, 'message': 'Enhanced game data loaded successfully!'})
+                return jsonify({'success': True, 'message': 'Enhanced game data loaded successfully!', **result})
             except Exception as e:
                 logger.error(f"Error loading data: {e}")
                 return jsonify({'success': False, 'error': str(e)})
         
+        @self.app.route('/api/seed-snapshots')
+        def list_seed_snapshots():
+            try:
+                snapshots = []
+                if os.path.isdir(self.seed_snapshot_dir):
+                    for filename in sorted(os.listdir(self.seed_snapshot_dir)):
+                        if filename.endswith('.resp'):
+                            path = os.path.join(self.seed_snapshot_dir, filename)
+                            snapshots.append({
+                                'name': filename[:-len('.resp')],
+                                'bytes': os.path.getsize(path),
+                                'modified': datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+                            })
+                return jsonify({'success': True, 'directory': self.seed_snapshot_dir, 'snapshots': snapshots})
+            except Exception as e:
+                logger.error(f"Error listing seed snapshots: {e}")
+                return jsonify({'success': False, 'error': str(e)})
+        
         @self.app.route('/api/start-simulation', methods=['POST'])
         def api_start_simulation():
             try:
                 if not self.data_loaded:
                     return jsonify({'success': False, 'message': 'Load data first'})
                 
+                if self.stop_status.get('state') == 'stopping':
+                    return jsonify({'success': False, 'message': 'Previous simulation is still stopping'})
+                
+                stragglers = self.live_stragglers()
+                if stragglers:
+                    return jsonify({'success': False, 'stragglers': stragglers,
+                                    'message': 'Threads from the previous simulation are still running'}), 409
+                
                 # Only reset counter for manual starts (not auto-continue)
                 if self.demo_counter_value == 0:
                     logger.info("🔢 Manual start - resetting demo counter")
                 
-                self.start_simulation()
-                return jsonify({'success': True, 'message': 'High-performance gaming simulation started!'})
+                if not self.start_simulation():
+                    return jsonify({'success': True, 'started': False, 'message': 'Simulation is already running'})
+                return jsonify({'success': True, 'started': True, 'message': 'High-performance gaming simulation started!'})
             except Exception as e:
                 logger.error(f"Error starting simulation: {e}")
                 return jsonify({'success': False, 'error': str(e)})
         
-        @self.app.route('/api/stop-simulation', methods=['POST'])
+        @self.app.route('/api/stop-simulation', methods=['GET', 'POST'])
         def api_stop_simulation():
             try:
-                self.stop_simulation()
-                return jsonify({'success': True, 'message': 'Simulation stopped'})
+                # POST starts a non-blocking stop; GET polls its progress
+                if request.method == 'POST':
+                    return jsonify({'success': True, 'message': 'Simulation stopping', 'status': self.stop_simulation()})
+                return jsonify({'success': True, 'status': self.stop_status})
             except Exception as e:
                 logger.error(f"Error stopping simulation: {e}")
                 return jsonify({'success': False, 'error': str(e)})
     
+        @self.app.route('/api/rate-limit', methods=['GET', 'POST'])
+        def api_rate_limit():
+            try:
+                if request.method == 'POST':
+                    data = request.get_json(silent=True) or {}
+                    target = data.get('target_ops_per_sec')
+                    if not isinstance(target, int) or target < 0:
+                        return jsonify({'success': False, 'message': 'target_ops_per_sec must be a non-negative integer'})
+                    self.rate_governor.set_rate(target)
+                    logger.info(f"🎚️ Target rate set to {target} ops/sec" if target else "🎚️ Rate governor disabled")
+                
+                return jsonify({
+                    'success': True,
+                    'target_ops_per_sec': self.rate_governor.target_ops_per_sec,
+                    'ops_per_second': self.ops_per_second
+                })
+            except Exception as e:
+                logger.error(f"Error updating rate limit: {e}")
+                return jsonify({'success': False, 'error': str(e)})
+    
+        @self.app.route('/api/switch-backend', methods=['GET', 'POST'])
+        def api_switch_backend():
+            try:
+                if request.method == 'GET':
+                    return jsonify({
+                        'success': True,
+                        'current_backend': self.redis_mgr.backend_label,
+                        'last_switch': self.redis_mgr.last_switch
+                    })
+                
+                data = request.get_json(silent=True) or {}
+                if data.get('host'):
+                    new_config = RedisConfig(
+                        host=data['host'],
+                        port=int(data.get('port', 6379)),
+                        password=data.get('password', ''),
+                        db=int(data.get('db', 0))
+                    )
+                else:
+                    # No explicit target - take whatever the .env file says now
+                    new_config = read_env_config()
+                
+                return jsonify({'success': True, **self.switch_backend(new_config)})
+            except Exception as e:
+                logger.error(f"Error switching backend: {e}")
+                return jsonify({'success': False, 'error': str(e)})
+        
+        @self.app.route('/api/write-freeze', methods=['GET', 'POST', 'DELETE'])
+        def api_write_freeze():
+            try:
+                # POST freezes writes (optional max_seconds), DELETE thaws them, GET reports state
+                if request.method == 'POST':
+                    data = request.get_json(silent=True) or {}
+                    max_seconds = data.get('max_seconds')
+                    return jsonify({'success': True, **self.freeze_writes(float(max_seconds) if max_seconds else None)})
+                if request.method == 'DELETE':
+                    result = self.thaw_writes()
+                    if result is None:
+                        return jsonify({'success': False, 'message': 'Writes are not frozen'})
+                    return jsonify({'success': True, **result})
+                return jsonify({
+                    'success': True,
+                    'frozen': self.redis_mgr.frozen,
+                    'backend': self.redis_mgr.backend_label,
+                    'last_freeze': self.redis_mgr.last_freeze
+                })
+            except Exception as e:
+                logger.error(f"Error updating write freeze: {e}")
+                return jsonify({'success': False, 'error': str(e)})
+        
+        @self.app.route('/api/demo-counter/verify')
+        def api_verify_demo_counter():
+            try:
+                last_switch = self.redis_mgr.last_switch
+                report = self.sequence.verify(
+                    self.redis_mgr.connection,
+                    previous_backend=last_switch['previous_backend'] if last_switch else None
+                )
+                return jsonify({'success': True, 'backend': self.redis_mgr.backend_label, **report})
+            except Exception as e:
+                logger.error(f"Error verifying demo counter: {e}")
+                return jsonify({'success': False, 'error': str(e)})
+        
+        @self.app.route('/api/mirror')
+        def api_mirror():
+            if not self.redis_mgr.mirror:
+                return jsonify({'success': False, 'message': 'Mirroring disabled (set DUAL_MODE and SECONDARY_REDIS_HOST)'})
+            return jsonify({'success': True, **self.redis_mgr.mirror.stats()})
+        
+        @self.app.route('/api/key-population')
+        def api_key_population():
+            return jsonify({'success': True, **self.key_population.stats()})
+        
+        @self.app.route('/api/player-population')
+        def api_player_population():
+            return jsonify({'success': True, **self.players.stats()})
+        
+        @self.app.route('/api/memory-footprint')
+        def api_memory_footprint():
+            try:
+                return jsonify({'success': True, **self.memory_sampler.snapshot()})
+            except Exception as e:
+                logger.error(f"Error getting memory footprint: {e}")
+                return jsonify({'success': False, 'error': str(e)})
+    
     def _setup_websocket_handlers(self):
         @self.socketio.on('connect')
         def handle_connect():
-            logger.info('Client connected')
+            self.connected_clients += 1
+            logger.info(f'Client connected ({self.connected_clients} dashboards)')
             emit('status', {'connected': True})
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
-            logger.info('Client disconnected')
+            self.connected_clients = max(0, self.connected_clients - 1)
+            logger.info(f'Client disconnected ({self.connected_clients} dashboards)')
     
-    def _load_initial_data(self):
-        """Load enhanced initial data with thousands of keys"""
+    def _load_initial_data(self, export_path: Optional[str] = None) -> Dict:
+        """Load enhanced initial data with thousands of keys (optionally writing a snapshot file)"""
         logger.info("🎮 Loading enhanced gaming data with thousands of keys...")
+        return self._execute_seed_commands(self._generate_seed_commands(), export_path)
+    
+    def _replay_seed_snapshot(self, path: str) -> Dict:
+        """Replay a RESP snapshot written by _load_initial_data(export_path=...)"""
+        logger.info(f"📼 Replaying seed snapshot {path}...")
+        with open(path, 'rb', buffering=1024 * 1024) as stream:
+            return self._execute_seed_commands(iter_resp_commands(stream))
+    
+    def _execute_seed_commands(self, commands: Iterable, export_path: Optional[str] = None) -> Dict:
+        """Send seed commands in large non-transactional pipelines, teeing them to a snapshot file"""
+        pipe = self.redis_mgr.connection.pipeline(transaction=False)
+        digest = hashlib.sha256()
+        out = open(export_path, 'wb', buffering=1024 * 1024) if export_path else None
+        count = 0
         
-        # Clear existing data
-        pipe = self.redis_mgr.connection.pipeline()
+        try:
+            for command in commands:
+                pipe.execute_command(*command)
+                if out:
+                    encoded = encode_resp_command(command)
+                    out.write(encoded)
+                    digest.update(encoded)
+                count += 1
+                if count % self.seed_pipeline_size == 0:
+                    pipe.execute()
+            
+            # Execute all operations
+            logger.info("💾 Executing bulk data creation...")
+            pipe.execute()
+        finally:
+            if out:
+                out.close()
+        
+        # Get final key count
+        total_keys = self.redis_mgr.connection.dbsize()
+        logger.info(f"✅ Enhanced gaming data loaded! {count:,} commands, total keys: {total_keys:,}")
         
+        result = {'commands': count, 'total_keys': total_keys}
+        if export_path:
+            result['snapshot'] = {'path': export_path, 'sha256': digest.hexdigest(), 'bytes': os.path.getsize(export_path)}
+            logger.info(f"📼 Seed snapshot written to {export_path} (sha256 {digest.hexdigest()[:12]}...)")
+        return result
+    
+    def _generate_seed_commands(self) -> Iterator[Tuple]:
+        """Generate the seed data set as raw Redis commands"""
         # Create expanded leaderboard with 100 players and dynamic score ranges
         logger.info("📊 Creating 100-player leaderboard with dynamic scores...")
         for i, player in enumerate(random.sample(PLAYER_NAMES, 100)):
@@ -390,10 +2165,10 @@ class RedisArenaApp:
             else:  # Rest - lower scores
                 score = random.randint(100, 9999)
             
-            pipe.zadd('leaderboard:global', {player: score})
+            yield ('ZADD', 'leaderboard:global', score, player)
             
             # Add to online players
-            pipe.sadd('online:players', player)
+            yield ('SADD', 'online:players', player)
             
             # Create detailed user session with TTL
             session_data = {
@@ -408,8 +2183,8 @@ class RedisArenaApp:
                 'rank': random.randint(1, 1000),
                 'xp': random.randint(1000, 100000)
             }
-            pipe.hset(f'user:session:{player}', mapping=session_data)
-            pipe.expire(f'user:session:{player}', random.randint(1800, 86400))  # 30min-24hr TTL
+            yield ('HSET', f'user:session:{player}', *flatten_mapping(session_data))
+            yield ('EXPIRE', f'user:session:{player}', random.randint(1800, 86400))  # 30min-24hr TTL
         
         # Create thousands of cache entries with TTLs
         logger.info("🗄️ Creating cache entries with TTLs...")
@@ -427,8 +2202,8 @@ class RedisArenaApp:
                 }),
                 'price': random.randint(100, 50000)
             }
-            pipe.hset(cache_key, mapping=cache_data)
-            pipe.expire(cache_key, random.randint(300, 3600))  # 5min-1hr TTL
+            yield ('HSET', cache_key, *flatten_mapping(cache_data))
+            yield ('EXPIRE', cache_key, random.randint(300, 3600))  # 5min-1hr TTL
         
         # Create game lobby data with TTLs
         logger.info("🎮 Creating game lobbies with TTLs...")
@@ -445,16 +2220,16 @@ class RedisArenaApp:
                 'status': random.choice(['waiting', 'starting', 'active']),
                 'created_at': datetime.now().isoformat()
             }
-            pipe.hset(lobby_key, mapping=lobby_data)
-            pipe.expire(lobby_key, random.randint(600, 1800))  # 10-30min TTL
+            yield ('HSET', lobby_key, *flatten_mapping(lobby_data))
+            yield ('EXPIRE', lobby_key, random.randint(600, 1800))  # 10-30min TTL
         
         # Create rate limiting keys
         logger.info("⚡ Creating rate limiting keys...")
         for player in random.sample(PLAYER_NAMES, 50):
             for api_endpoint in ['login', 'game_action', 'chat', 'leaderboard']:
                 rate_key = f'ratelimit:{api_endpoint}:{player}'
-                pipe.set(rate_key, random.randint(1, 10))
-                pipe.expire(rate_key, random.randint(60, 300))  # 1-5min TTL
+                yield ('SET', rate_key, random.randint(1, 10))
+                yield ('EXPIRE', rate_key, random.randint(60, 300))  # 1-5min TTL
         
         # Create achievement tracking
         logger.info("🏆 Creating achievement data...")
@@ -468,8 +2243,8 @@ class RedisArenaApp:
                     'progress': random.randint(80, 100),
                     'reward_claimed': str(random.choice([True, False]))
                 }
-                pipe.hset(achievement_key, mapping=achievement_data)
-                pipe.expire(achievement_key, random.randint(86400, 604800))  # 1-7 days TTL
+                yield ('HSET', achievement_key, *flatten_mapping(achievement_data))
+                yield ('EXPIRE', achievement_key, random.randint(86400, 604800))  # 1-7 days TTL
         
         # Create analytics events
         logger.info("📈 Creating analytics events...")
@@ -486,8 +2261,8 @@ class RedisArenaApp:
                     'duration': random.randint(60, 3600)
                 })
             }
-            pipe.hset(event_key, mapping=event_data)
-            pipe.expire(event_key, random.randint(3600, 259200))  # 1hr-3days TTL
+            yield ('HSET', event_key, *flatten_mapping(event_data))
+            yield ('EXPIRE', event_key, random.randint(3600, 259200))  # 1hr-3days TTL
         
         # Create notification queues
         logger.info("🔔 Creating notification queues...")
@@ -502,89 +2277,143 @@ class RedisArenaApp:
                     'created_at': datetime.now().isoformat(),
                     'read': str(random.choice([True, False]))
                 }
-                pipe.hset(notif_key, mapping=notification)
-                pipe.expire(notif_key, random.randint(86400, 604800))  # 1-7 days TTL
-        
-        # Execute all operations
-        logger.info("💾 Executing bulk data creation...")
-        pipe.execute()
-        
-        # Get final key count
-        total_keys = self.redis_mgr.connection.dbsize()
-        logger.info(f"✅ Enhanced gaming data loaded! Total keys: {total_keys:,}")
+                yield ('HSET', notif_key, *flatten_mapping(notification))
+                yield ('EXPIRE', notif_key, random.randint(86400, 604800))  # 1-7 days TTL
     
-    def start_simulation(self):
-        """Start high-performance gaming simulation targeting 1000+ ops/sec"""
+    def start_simulation(self) -> bool:
+        """Start high-performance gaming simulation targeting 1000+ ops/sec
+        
+        Returns False without starting anything if the simulation is already running
+        (e.g. auto-resumed after a restart), so workers are never started twice. Raises
+        RuntimeError while threads from the previous run are still alive: clearing the
+        shared stop_event would revive them next to the new workers.
+        """
+        with self._start_lock:
+            if self.simulation_active:
+                logger.info("▶️ Simulation already running - start request ignored")
+                return False
+            stragglers = self.live_stragglers()
+            if stragglers:
+                raise RuntimeError(f"Threads from the previous run are still stopping: {', '.join(stragglers)}")
+            self.simulation_active = True
         try:
             logger.info("🚀 Starting HIGH-PERFORMANCE gaming simulation (targeting 1000+ ops/sec)...")
-            self.simulation_active = True
+            self.stop_event.clear()
+            self.stop_status = {'state': 'running'}
+            
+            # Seed the in-memory leaderboard before workers start writing
+            self.leaderboard_view.reconcile(self.redis_mgr.connection)
             
             # Clear previous threads if any
             self.worker_threads.clear()
             logger.info("🧹 Cleared previous threads")
             
-            # Start MORE simulation threads for higher ops
-            for i in range(8):  # 8 worker threads for 1000+ ops
-                logger.info(f"🔧 Starting GameWorker-{i}")
-                thread = threading.Thread(target=self._simulation_worker, daemon=False, name=f"GameWorker-{i}")
-                thread.start()
-                self.worker_threads.append(thread)
-                logger.info(f"✅ GameWorker-{i} started successfully")
+            if self.simulation_engine == 'asyncio':
+                # Player-session coroutines replace the GameWorker threads
+                logger.info("🔧 Starting asyncio simulation engine")
+                self.async_engine = AsyncSimulationEngine(
+                    self,
+                    sessions=int(os.getenv('ASYNC_PLAYER_SESSIONS', 500)),
+                    pool_size=int(os.getenv('ASYNC_POOL_MAX_CONNECTIONS', 100))
+                )
+                self.async_engine.start()
+            else:
+                # Start MORE simulation threads for higher ops
+                for i in range(8):  # 8 worker threads for 1000+ ops
+                    logger.info(f"🔧 Starting GameWorker-{i}")
+                    thread = threading.Thread(target=self._simulation_worker, daemon=True, name=f"GameWorker-{i}")
+                    thread.start()
+                    self.worker_threads.append(thread)
+                    logger.info(f"✅ GameWorker-{i} started successfully")
             
             # Start specialized high-ops threads
             logger.info("🔧 Starting cache worker")
-            self.cache_thread = threading.Thread(target=self._cache_worker, daemon=False)
+            self.cache_thread = threading.Thread(target=self._cache_worker, daemon=True)
             self.cache_thread.start()
             logger.info("✅ Cache worker started")
             
             logger.info("🔧 Starting TTL worker")
-            self.ttl_thread = threading.Thread(target=self._ttl_worker, daemon=False)
+            self.ttl_thread = threading.Thread(target=self._ttl_worker, daemon=True)
             self.ttl_thread.start()
             logger.info("✅ TTL worker started")
             
             # Start demo counter
             logger.info("🔧 Starting demo counter")
-            self.demo_thread = threading.Thread(target=self._demo_counter_worker, daemon=False)
+            self.demo_thread = threading.Thread(target=self._demo_counter_worker, daemon=True)
             self.demo_thread.start()
             logger.info("✅ Demo counter started")
             
+            # Start memory footprint sampler
+            logger.info("🔧 Starting memory footprint sampler")
+            self.memory_thread = threading.Thread(target=self._memory_sampler_worker, daemon=True)
+            self.memory_thread.start()
+            logger.info("✅ Memory footprint sampler started")
+            
             # Start performance monitor
             logger.info("🔧 Starting performance monitor")
-            self.performance_thread = threading.Thread(target=self._performance_monitor, daemon=False)
+            self.performance_thread = threading.Thread(target=self._performance_monitor, daemon=True)
             self.performance_thread.start()
             logger.info("✅ Performance monitor started")
             
-            logger.info("🔥 HIGH-PERFORMANCE gaming simulation started with 8 worker threads + 4 specialized threads")
+            logger.info(f"🔥 HIGH-PERFORMANCE gaming simulation started ({self.simulation_engine} engine) + 5 specialized threads")
             logger.info(f"🔍 simulation_active flag: {self.simulation_active}")
+            self.stats_cache.invalidate()
+            return True
             
         except Exception as e:
             logger.error(f"❌ Error starting simulation: {e}")
             self.simulation_active = False
+            self.stop_event.set()
             raise
     
-    def stop_simulation(self):
-        """Stop all simulation activity"""
+    def live_stragglers(self) -> List[str]:
+        """Names of threads from the last stop that are still running"""
+        self._straggler_threads = [thread for thread in self._straggler_threads if thread.is_alive()]
+        return [thread.name for thread in self._straggler_threads]
+    
+    def stop_simulation(self) -> Dict:
+        """Signal all simulation activity to stop and finish shutdown in the background
+        
+        Returns immediately; poll stop_status (GET /api/stop-simulation) for completion.
+        """
+        if self.stop_status.get('state') == 'stopping':
+            return self.stop_status
+        
         self.simulation_active = False
-        self.demo_counter_value = 0
+        self.stop_event.set()
+        # Workers parked behind a write freeze would otherwise wait for the thaw
+        self.redis_mgr.wake_waiters()
         logger.info("⏹️ Stopping high-performance gaming simulation...")
         
-        # Wait for threads to finish gracefully
+        self.stop_status = {'state': 'stopping', 'requested_at': datetime.now().isoformat()}
+        threading.Thread(target=self._finish_stop, daemon=True, name="SimulationStopper").start()
+        return self.stop_status
+    
+    def _finish_stop(self):
+        """Join every simulation thread under one deadline, flush pending writes, then clean up"""
+        started = time.monotonic()
+        deadline = started + self.stop_timeout
+        
+        # Every thread got the same stop event, so joining in turn against the shared
+        # deadline waits for them in parallel - total wait is bounded by stop_timeout
         logger.info("🧹 Cleaning up worker threads...")
-        for thread in self.worker_threads:
-            if thread.is_alive():
-                thread.join(timeout=2.0)
+        threads = list(self.worker_threads) + [t for t in (
+            self.demo_thread, self.performance_thread, self.cache_thread, self.ttl_thread, self.memory_thread
+        ) if t]
+        if self.async_engine:
+            self.async_engine.stop(timeout=max(0.0, deadline - time.monotonic()))
+            if self.async_engine.thread:
+                threads.append(self.async_engine.thread)
+            self.async_engine = None
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._straggler_threads = [thread for thread in threads if thread.is_alive()]
+        stragglers = [thread.name for thread in self._straggler_threads]
         
-        if self.demo_thread and self.demo_thread.is_alive():
-            self.demo_thread.join(timeout=2.0)
-            
-        if self.performance_thread and self.performance_thread.is_alive():
-            self.performance_thread.join(timeout=2.0)
-            
-        if self.cache_thread and self.cache_thread.is_alive():
-            self.cache_thread.join(timeout=2.0)
-            
-        if self.ttl_thread and self.ttl_thread.is_alive():
-            self.ttl_thread.join(timeout=2.0)
+        # Drain writes still queued for the secondary backend
+        mirror_flushed = True
+        if self.redis_mgr.mirror:
+            mirror_flushed = self.redis_mgr.mirror.flush(max(0.0, deadline - time.monotonic()))
         
         # Clear thread references
         self.worker_threads.clear()
@@ -592,179 +2421,239 @@ class RedisArenaApp:
         self.performance_thread = None
         self.cache_thread = None
         self.ttl_thread = None
+        self.memory_thread = None
         
-        # Clean up demo counter
-        try:
-            self.redis_mgr.connection.delete('migration:demo:counter')
-            logger.info("🔢 Demo counter removed")
-        except Exception as e:
-            logger.error(f"Error cleaning demo counter: {e}")
+        # Clean up demo counter - only once nothing can INCR it again
+        self.demo_counter_value = 0
+        if stragglers:
+            logger.warning(f"⚠️ {len(stragglers)} threads still running after {self.stop_timeout}s, "
+                           f"keeping demo counter: {', '.join(stragglers)}")
+        else:
+            try:
+                self.redis_mgr.connection.delete(SequenceTimeline.COUNTER_KEY, SequenceTimeline.TIMELINE_KEY)
+                logger.info("🔢 Demo counter removed")
+            except Exception as e:
+                logger.error(f"Error cleaning demo counter: {e}")
         
-        logger.info("✅ All simulation threads stopped")
+        self.stop_status = {
+            **self.stop_status,
+            'state': 'stopped' if not stragglers else 'stopped_with_stragglers',
+            'completed_at': datetime.now().isoformat(),
+            'duration_ms': round((time.monotonic() - started) * 1000, 1),
+            'stragglers': stragglers,
+            'mirror_flushed': mirror_flushed
+        }
+        self.stats_cache.invalidate()
+        logger.info(f"✅ All simulation threads stopped in {self.stop_status['duration_ms']}ms")
     
     def _demo_counter_worker(self):
-        """Demo counter for migration demonstration"""
-        logger.info("🔢 Starting demo counter...")
+        """Demo counter for migration demonstration - INCR sequence plus timeline at DEMO_COUNTER_HZ"""
+        logger.info(f"🔢 Starting demo counter at {self.demo_counter_hz} Hz...")
+        interval = 1.0 / self.demo_counter_hz
+        log_every = max(10, int(10 * self.demo_counter_hz))
+        next_tick = time.monotonic()
         
         while self.simulation_active:
             try:
-                self.demo_counter_value += 1
-                self.redis_mgr.connection.set('migration:demo:counter', self.demo_counter_value)
+                with self.redis_mgr.in_flight(self.stop_event) as entered:
+                    if not entered:
+                        break
+                    with self.latency.measure('demo_counter'):
+                        self.demo_counter_value = self.sequence.write(self.redis_mgr.connection,
+                                                                      self.redis_mgr.backend_label)
                 
-                if self.demo_counter_value % 10 == 0:
+                if self.demo_counter_value % log_every == 0:
                     logger.info(f"🔢 Demo counter: {self.demo_counter_value}")
-                
-                time.sleep(1)
             except Exception as e:
                 logger.error(f"Demo counter error: {e}")
-                time.sleep(1)
+            
+            # Fixed schedule so the rate doesn't drift with write latency (no catch-up bursts after stalls)
+            next_tick = max(next_tick + interval, time.monotonic() - interval)
+            self.stop_event.wait(max(0.0, next_tick - time.monotonic()))
         
         logger.info("🔢 Demo counter stopped")
     
+    def _pace(self, ops: int, min_delay: float, max_delay: float):
+        """Pace a worker batch - governor when a target rate is set, otherwise a short random sleep"""
+        if self.rate_governor.enabled:
+            self.rate_governor.acquire(ops, self.stop_event)
+        else:
+            self.stop_event.wait(random.uniform(min_delay, max_delay))
+    
     def _simulation_worker(self):
         """High-volume gaming simulation worker"""
         while self.simulation_active:
             try:
                 # Batch MORE operations for higher throughput
-                for _ in range(random.randint(8, 15)):  # 8-15 ops per batch
-                    operation = random.choice([
-                        'update_leaderboard',
-                        'post_message', 
-                        'update_session',
-                        'player_activity',
-                        'create_temp_data',
-                        'update_analytics'
-                    ])
-                    
-                    if operation == 'update_leaderboard':
-                        self._update_leaderboard()
-                    elif operation == 'post_message':
-                        self._post_chat_message()
-                    elif operation == 'update_session':
-                        self._update_player_session()
-                    elif operation == 'player_activity':
-                        self._simulate_player_activity()
-                    elif operation == 'create_temp_data':
-                        self._create_temporary_data()
-                    elif operation == 'update_analytics':
-                        self._update_analytics()
-                    
-                    self.total_operations += 1
+                batch_size = random.randint(8, 15)  # 8-15 ops per batch
+                with self.redis_mgr.in_flight(self.stop_event) as entered:
+                    if not entered:
+                        break
+                    for _ in range(batch_size):
+                        operation = random.choice([
+                            'update_leaderboard',
+                            'post_message', 
+                            'update_session',
+                            'player_activity',
+                            'create_temp_data',
+                            'update_analytics'
+                        ])
+                        
+                        started = time.perf_counter()
+                        if operation == 'update_leaderboard':
+                            self._update_leaderboard()
+                        elif operation == 'post_message':
+                            self._post_chat_message()
+                        elif operation == 'update_session':
+                            self._update_player_session()
+                        elif operation == 'player_activity':
+                            self._simulate_player_activity()
+                        elif operation == 'create_temp_data':
+                            self._create_temporary_data()
+                        elif operation == 'update_analytics':
+                            self._update_analytics()
+                        self.latency.record(operation, time.perf_counter() - started)
+                        
+                        self.total_operations += 1
                 
                 # Smaller delay for higher ops/sec
-                time.sleep(random.uniform(0.001, 0.010))  # 1-10ms
+                self._pace(batch_size, 0.001, 0.010)  # 1-10ms
                 
             except Exception as e:
                 logger.error(f"Simulation error: {e}")
-                time.sleep(0.1)
+                self.stop_event.wait(0.1)
     
     def _cache_worker(self):
         """Dedicated high-speed cache operations worker"""
         while self.simulation_active:
             try:
                 # High-speed cache operations
-                for _ in range(random.randint(10, 20)):  # 10-20 cache ops
-                    cache_op = random.choice(['set_cache', 'get_cache', 'delete_cache', 'update_cache'])
-                    
-                    if cache_op == 'set_cache':
-                        cache_key = f'cache:rapid:{uuid.uuid4()}'
-                        self.redis_mgr.connection.setex(cache_key, random.randint(60, 300), 
-                                                      json.dumps({'data': random.randint(1, 1000)}))
-                    elif cache_op == 'get_cache':
-                        # Try to get random cache key
-                        try:
-                            self.redis_mgr.connection.get(f'cache:rapid:{uuid.uuid4()}')
-                        except:
-                            pass
-                    elif cache_op == 'update_cache':
-                        # Update cache with new TTL
-                        cache_key = f'cache:update:{random.randint(1, 1000)}'
-                        self.redis_mgr.connection.setex(cache_key, random.randint(30, 600),
-                                                      json.dumps({'updated': time.time()}))
-                    
-                    self.total_operations += 1
+                batch_size = random.randint(10, 20)  # 10-20 cache ops
+                with self.redis_mgr.in_flight(self.stop_event) as entered:
+                    if not entered:
+                        break
+                    for _ in range(batch_size):
+                        cache_op = random.choice(['set_cache', 'get_cache', 'delete_cache', 'update_cache'])
+                        
+                        started = time.perf_counter()
+                        if cache_op == 'set_cache':
+                            cache_key = f'cache:rapid:{self.key_population.next_id("cache:rapid:")}'
+                            self.redis_mgr.connection.setex(cache_key, random.randint(60, 300), 
+                                                          json.dumps({'data': random.randint(1, 1000)}))
+                            self.cache_model.record_write(cache_key)
+                        elif cache_op == 'get_cache':
+                            # Read a recently written key (hit) or an absent one (miss) per the target ratio
+                            cache_key = self.cache_model.pick_read_key()
+                            started = time.perf_counter()
+                            value = self.redis_mgr.connection.get(cache_key)
+                            self.cache_model.record_read(value is not None, time.perf_counter() - started)
+                        elif cache_op == 'delete_cache':
+                            # Invalidate a live entry
+                            cache_key = self.cache_model.take_delete_key()
+                            if cache_key:
+                                self.redis_mgr.connection.delete(cache_key)
+                        elif cache_op == 'update_cache':
+                            # Update cache with new TTL
+                            cache_key = f'cache:update:{random.randint(1, 1000)}'
+                            self.redis_mgr.connection.setex(cache_key, random.randint(30, 600),
+                                                          json.dumps({'updated': time.time()}))
+                        self.latency.record(cache_op, time.perf_counter() - started)
+                        
+                        self.total_operations += 1
                 
-                time.sleep(random.uniform(0.001, 0.005))  # Very fast cache ops
+                self._pace(batch_size, 0.001, 0.005)  # Very fast cache ops
                 
             except Exception as e:
                 logger.error(f"Cache worker error: {e}")
-                time.sleep(0.1)
+                self.stop_event.wait(0.1)
     
     def _ttl_worker(self):
         """Dedicated TTL and key lifecycle management worker"""
         while self.simulation_active:
             try:
                 # Create expiring keys rapidly
-                for _ in range(random.randint(5, 10)):
-                    key_type = random.choice(['session', 'temp', 'rate', 'event'])
-                    
-                    if key_type == 'session':
-                        key = f'temp:session:{uuid.uuid4()}'
-                        self.redis_mgr.connection.setex(key, random.randint(30, 300), 
-                                                      json.dumps({'session_data': time.time()}))
-                    elif key_type == 'temp':
-                        key = f'temp:data:{uuid.uuid4()}'
-                        self.redis_mgr.connection.setex(key, random.randint(10, 60),
-                                                      f'temp_value_{random.randint(1, 1000)}')
-                    elif key_type == 'rate':
-                        key = f'rate:{random.choice(PLAYER_NAMES)}:{random.randint(1, 100)}'
-                        self.redis_mgr.connection.setex(key, random.randint(5, 30), '1')
-                    elif key_type == 'event':
-                        key = f'event:temp:{int(time.time())}:{random.randint(1, 1000)}'
-                        self.redis_mgr.connection.setex(key, random.randint(60, 180),
-                                                      json.dumps({'event': 'temp_event'}))
-                    
-                    self.total_operations += 1
+                batch_size = random.randint(5, 10)
+                with self.redis_mgr.in_flight(self.stop_event) as entered:
+                    if not entered:
+                        break
+                    for _ in range(batch_size):
+                        key_type = random.choice(['session', 'temp', 'rate', 'event'])
+                        
+                        started = time.perf_counter()
+                        if key_type == 'session':
+                            key = f'temp:session:{self.key_population.next_id("temp:session:")}'
+                            self.redis_mgr.connection.setex(key, random.randint(30, 300), 
+                                                          json.dumps({'session_data': time.time()}))
+                        elif key_type == 'temp':
+                            key = f'temp:data:{self.key_population.next_id("temp:data:")}'
+                            self.redis_mgr.connection.setex(key, random.randint(10, 60),
+                                                          f'temp_value_{random.randint(1, 1000)}')
+                        elif key_type == 'rate':
+                            key = f'rate:{self.players.pick()}:{random.randint(1, 100)}'
+                            self.redis_mgr.connection.setex(key, random.randint(5, 30), '1')
+                        elif key_type == 'event':
+                            event_suffix = self.key_population.next_id('event:temp:', f'{int(time.time())}:{random.randint(1, 1000)}')
+                            key = f'event:temp:{event_suffix}'
+                            self.redis_mgr.connection.setex(key, random.randint(60, 180),
+                                                          json.dumps({'event': 'temp_event'}))
+                        self.latency.record(f'ttl_{key_type}', time.perf_counter() - started)
+                        
+                        self.total_operations += 1
                 
-                time.sleep(random.uniform(0.002, 0.008))  # Fast TTL operations
+                self._pace(batch_size, 0.002, 0.008)  # Fast TTL operations
                 
             except Exception as e:
                 logger.error(f"TTL worker error: {e}")
-                time.sleep(0.1)
+                self.stop_event.wait(0.1)
     
-    def _update_leaderboard(self):
-        """Update leaderboard with MUCH more dynamic score changes"""
-        player = random.choice(PLAYER_NAMES)
-        
-        # Get current score to make changes more dynamic
-        current_score = self.redis_mgr.connection.zscore('leaderboard:global', player) or 0
-        
-        # More dramatic and varied score changes
+    def _random_score_change(self) -> int:
+        """Pick a dramatic, varied score delta for a leaderboard update"""
         change_type = random.choice(['mega_win', 'big_win', 'win', 'loss', 'big_loss', 'mega_loss', 'reset_streak'])
         
         if change_type == 'mega_win':  # Rare massive gains
-            score_change = random.randint(50000, 500000)
+            return random.randint(50000, 500000)
         elif change_type == 'big_win':
-            score_change = random.randint(10000, 49999)
+            return random.randint(10000, 49999)
         elif change_type == 'win':
-            score_change = random.randint(500, 9999)
+            return random.randint(500, 9999)
         elif change_type == 'loss':
-            score_change = random.randint(-5000, -100)
+            return random.randint(-5000, -100)
         elif change_type == 'big_loss':
-            score_change = random.randint(-25000, -5001)
+            return random.randint(-25000, -5001)
         elif change_type == 'mega_loss':  # Rare massive losses
-            score_change = random.randint(-200000, -25001)
+            return random.randint(-200000, -25001)
         else:  # reset_streak - random dramatic change
-            score_change = random.randint(-100000, 200000)
+            return random.randint(-100000, 200000)
+    
+    def _update_leaderboard(self):
+        """Update leaderboard with MUCH more dynamic score changes"""
+        player = self.players.pick()
+        
+        # Get current score to make changes more dynamic
+        current_score = self.redis_mgr.connection.zscore('leaderboard:global', player) or 0
         
         # Apply score change
-        new_score = self.redis_mgr.connection.zincrby('leaderboard:global', score_change, player)
+        new_score = self.redis_mgr.connection.zincrby('leaderboard:global', self._random_score_change(), player)
         
         # Keep scores in reasonable bounds (but much higher than before)
         if new_score < 100:
-            self.redis_mgr.connection.zadd('leaderboard:global', {player: 100})
+            new_score = 100
+            self.redis_mgr.connection.zadd('leaderboard:global', {player: new_score})
         elif new_score > 50000000:  # 50M max instead of 100k
-            self.redis_mgr.connection.zadd('leaderboard:global', {player: 50000000})
+            new_score = 50000000
+            self.redis_mgr.connection.zadd('leaderboard:global', {player: new_score})
+        
+        self.leaderboard_view.record(player, new_score)
     
     def _create_temporary_data(self):
         """Create various temporary data with TTLs"""
         temp_type = random.choice(['lobby', 'match', 'notification', 'cache'])
         
         if temp_type == 'lobby':
-            lobby_id = str(uuid.uuid4())
+            lobby_id = self.key_population.next_id('temp:lobby:')
             key = f'temp:lobby:{lobby_id}'
             data = {
-                'players': json.dumps(random.sample(PLAYER_NAMES, random.randint(2, 6))),
+                'players': json.dumps(self.players.sample(random.randint(2, 6))),
                 'status': 'waiting',
                 'created': time.time()
             }
@@ -772,20 +2661,21 @@ class RedisArenaApp:
             self.redis_mgr.connection.expire(key, random.randint(300, 900))  # 5-15min
             
         elif temp_type == 'match':
-            match_id = str(uuid.uuid4())
+            match_id = self.key_population.next_id('temp:match:')
             key = f'temp:match:{match_id}'
             self.redis_mgr.connection.setex(key, random.randint(600, 1800),  # 10-30min
                                           json.dumps({
-                                              'players': random.sample(PLAYER_NAMES, random.randint(4, 8)),
-                                              'score': {p: random.randint(0, 1000) for p in random.sample(PLAYER_NAMES, 4)},
+                                              'players': self.players.sample(random.randint(4, 8)),
+                                              'score': {p: random.randint(0, 1000) for p in self.players.sample(4)},
                                               'status': 'active'
                                           }))
     
     def _update_analytics(self):
         """Update analytics data"""
-        event_key = f'analytics:realtime:{int(time.time())}:{random.randint(1, 1000)}'
+        event_suffix = self.key_population.next_id('analytics:realtime:', f'{int(time.time())}:{random.randint(1, 1000)}')
+        event_key = f'analytics:realtime:{event_suffix}'
         event_data = {
-            'player': random.choice(PLAYER_NAMES),
+            'player': self.players.pick(),
             'action': random.choice(['click', 'view', 'purchase', 'achievement', 'level_up']),
             'value': random.randint(1, 500),
             'timestamp': time.time()
@@ -793,29 +2683,34 @@ class RedisArenaApp:
         self.redis_mgr.connection.setex(event_key, random.randint(1800, 7200),  # 30min-2hr
                                       json.dumps(event_data))
     
-    def _post_chat_message(self):
-        """Post realistic chat message"""
-        player = random.choice(PLAYER_NAMES)
+    def _build_chat_message(self, player: str) -> Optional[Dict[str, str]]:
+        """Build a validated, sanitized chat message for a player (None if rejected)"""
         template = random.choice(CHAT_TEMPLATES)
         
         if not self._validate_player_name(player):
-            return
+            return None
         
         if '{player}' in template:
-            target_player = random.choice([p for p in PLAYER_NAMES if p != player])
+            target_player = self.players.pick(exclude=player)
             message_text = template.replace('{player}', target_player)
         else:
             message_text = template
         
         if not self._validate_message_content(message_text):
-            return
+            return None
         
-        message = {
+        return {
             'player': self._sanitize_html(player),
             'message': self._sanitize_html(message_text),
             'timestamp': datetime.now().isoformat(),
             'type': 'chat'
         }
+    
+    def _post_chat_message(self):
+        """Post realistic chat message"""
+        message = self._build_chat_message(self.players.pick())
+        if not message:
+            return
         
         # Add to message list (keep last 50 messages)
         pipe = self.redis_mgr.connection.pipeline()
@@ -825,7 +2720,7 @@ class RedisArenaApp:
     
     def _update_player_session(self):
         """Update player session data"""
-        player = random.choice(PLAYER_NAMES)
+        player = self.players.pick()
         
         updates = {
             'last_seen': datetime.now().isoformat(),
@@ -841,15 +2736,22 @@ class RedisArenaApp:
         self.redis_mgr.connection.expire(f'user:session:{player}', random.randint(1800, 86400))
     
     def _simulate_player_activity(self):
-        """Simulate various player activities"""
-        activity = random.choice(['join', 'leave', 'achievement', 'status_update', 'purchase'])
-        player = random.choice(PLAYER_NAMES)
+        """Advance one active player's session state machine and write what that transition implies"""
+        player, state, next_state = self.players.step()
         
-        if activity == 'join':
-            self.redis_mgr.connection.sadd('online:players', player)
-        elif activity == 'leave':
+        if next_state == 'offline':
             self.redis_mgr.connection.srem('online:players', player)
-        elif activity == 'achievement':
+            self.redis_mgr.connection.hset(f'user:session:{player}', 'status', 'offline')
+        elif state == 'offline':
+            # Login
+            self.redis_mgr.connection.sadd('online:players', player)
+            self.redis_mgr.connection.hset(f'user:session:{player}', mapping={
+                'username': player,
+                'status': 'online',
+                'last_seen': datetime.now().isoformat()
+            })
+            self.redis_mgr.connection.expire(f'user:session:{player}', random.randint(1800, 86400))
+        elif next_state == 'post_game' and random.random() < 0.3:
             if not self._validate_player_name(player):
                 return
                 
@@ -864,13 +2766,10 @@ class RedisArenaApp:
             pipe.lpush('messages:global', json.dumps(message))
             pipe.ltrim('messages:global', 0, 49)
             pipe.execute()
-        elif activity == 'status_update':
-            status = random.choice(['playing', 'idle', 'in-menu', 'in-game'])
-            self.redis_mgr.connection.hset(f'user:session:{player}', 'status', status)
-        elif activity == 'purchase':
+        elif next_state == 'shopping':
             # Simulate item purchase
             item = random.choice(GAME_ITEMS)
-            purchase_key = f'purchase:{player}:{uuid.uuid4()}'
+            purchase_key = f'purchase:{player}:{self.key_population.next_id("purchase:")}'
             purchase_data = {
                 'player': player,
                 'item': item,
@@ -878,11 +2777,24 @@ class RedisArenaApp:
                 'timestamp': time.time()
             }
             self.redis_mgr.connection.setex(purchase_key, 86400, json.dumps(purchase_data))  # 24hr TTL
+        else:
+            status = {'lobby': 'in-menu', 'matchmaking': 'in-menu', 'in_game': 'in-game', 'post_game': 'idle'}
+            self.redis_mgr.connection.hset(f'user:session:{player}', 'status', status[next_state])
+    
+    def _memory_sampler_worker(self):
+        """Advance the memory footprint scan one bounded step per interval"""
+        while self.simulation_active:
+            try:
+                self.memory_sampler.tick(self.redis_mgr.connection)
+            except Exception as e:
+                logger.error(f"Memory sampler error: {e}")
+            self.stop_event.wait(self.memory_sampler_interval)
     
     def _performance_monitor(self):
         """Monitor operations per second"""
         while self.simulation_active:
-            time.sleep(5)  # Update every 5 seconds
+            if self.stop_event.wait(5):  # Update every 5 seconds
+                break
             
             current_time = time.time()
             time_diff = current_time - self.last_ops_time
@@ -890,20 +2802,68 @@ class RedisArenaApp:
             if time_diff > 0:
                 self.ops_per_second = int((self.total_operations) / time_diff)
                 total_keys = self.redis_mgr.connection.dbsize()
-                logger.info(f"⚡ Performance: {self.ops_per_second} ops/sec | Total keys: {total_keys:,}")
+                cache_stats = self.cache_model.stats()
+                logger.info(f"⚡ Performance: {self.ops_per_second} ops/sec | Total keys: {total_keys:,} | "
+                            f"Cache hit ratio: {cache_stats['hit_ratio']:.1%} (target {cache_stats['target_hit_ratio']:.0%}), "
+                            f"avg read {cache_stats['avg_read_ms']}ms")
                 
                 # Reset counters
                 self.total_operations = 0
                 self.last_ops_time = current_time
+                
+                # Merge per-thread latency histograms into this window's p50/p99
+                self.latency_report = self.latency.merge_window()
+                for backend, operations in self.latency_report['window'].items():
+                    slowest = max(operations.items(), key=lambda item: item[1]['p99_ms'])
+                    logger.info(f"⏱️ Latency [{backend}]: slowest p99 {slowest[0]} {slowest[1]['p99_ms']}ms "
+                                f"(p50 {slowest[1]['p50_ms']}ms) across {len(operations)} operation types")
+            
+            # Periodically correct the in-memory leaderboard against the server
+            if current_time - self.leaderboard_view.last_reconciled >= self.leaderboard_reconcile_interval:
+                try:
+                    self.leaderboard_view.reconcile(self.redis_mgr.connection)
+                    drift = self.leaderboard_view.last_drift
+                    logger.info(f"🏆 Leaderboard reconciled: {drift['rank_mismatches']} rank mismatches, "
+                                f"length diff {drift['length_diff']}, max score drift {drift['max_score_drift']:,}")
+                except Exception as e:
+                    logger.error(f"Leaderboard reconcile error: {e}")
     
     def run(self, host='0.0.0.0', port=5000, debug=False):
         """Run the RedisArena application"""
         logger.info(f"🚀 Starting Enhanced RedisArena Gaming Platform on {host}:{port}")
+        self.socketio.start_background_task(self._stats_broadcaster)
         self.socketio.run(self.app, host=host, port=port, debug=debug)
 
+def flatten_mapping(mapping: Dict) -> List:
+    """{'a': 1, 'b': 2} -> ['a', 1, 'b', 2] for raw HSET commands"""
+    return [item for pair in mapping.items() for item in pair]
+
+def encode_resp_command(command: Tuple) -> bytes:
+    """Encode one command in RESP (the format `redis-cli --pipe` consumes)"""
+    parts = [b'*%d\r\n' % len(command)]
+    for arg in command:
+        data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+        parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+    return b''.join(parts)
+
+def iter_resp_commands(stream) -> Iterator[List[bytes]]:
+    """Stream commands back out of a RESP file without loading it into memory"""
+    while True:
+        header = stream.readline()
+        if not header:
+            return
+        if not header.startswith(b'*'):
+            raise ValueError(f"Corrupt seed snapshot: expected array header, got {header[:20]!r}")
+        command = []
+        for _ in range(int(header[1:])):
+            length = int(stream.readline()[1:])
+            command.append(stream.read(length))
+            stream.read(2)  # Trailing CRLF
+        yield command
+
 def load_config() -> RedisConfig:
     """Load Redis configuration from environment"""
-    load_dotenv("/opt/redisarena/.env")
+    load_dotenv(ENV_FILE)
     
     return RedisConfig(
         host=os.environ.get("REDIS_HOST", "localhost"),
@@ -912,6 +2872,16 @@ def load_config() -> RedisConfig:
         db=int(os.environ.get("REDIS_DB", 0))
     )
 
+def read_env_config(path: str = ENV_FILE) -> RedisConfig:
+    """Read Redis configuration straight from the .env file (ignores the process environment)"""
+    values = dotenv_values(path)
+    return RedisConfig(
+        host=values.get("REDIS_HOST") or "localhost",
+        port=int(values.get("REDIS_PORT") or 6379),
+        password=values.get("REDIS_PASSWORD") or "",
+        db=int(values.get("REDIS_DB") or 0)
+    )
+
 if __name__ == "__main__":
     try:
         config = load_config()
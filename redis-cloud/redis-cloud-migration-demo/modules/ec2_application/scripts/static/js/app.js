@@ -8,40 +8,51 @@ socket.on('connect', function() {
     updateStats();
 });
 
-setInterval(updateStats, 2000);
+// Stats are pushed by the server; only fall back to polling while the socket is down
+socket.on('stats', renderStats);
+
+setInterval(function() {
+    if (!socket.connected) {
+        updateStats();
+    }
+}, 2000);
 
 function updateStats() {
     fetch('/api/stats')
         .then(response => response.json())
-        .then(data => {
-            if (data.success) {
-                updateLeaderboard(data.leaderboard);
-                updateChat(data.recent_messages);
-                document.getElementById('online-count').textContent = data.online_count;
-                document.getElementById('ops-per-second').textContent = data.ops_per_second;
-                document.getElementById('demo-counter').textContent = data.demo_counter;
-                
-                // Update profile stats
-                if (data.profile_stats) {
-                    document.getElementById('total-players').textContent = data.profile_stats.total_players;
-                    document.getElementById('active-games').textContent = data.profile_stats.active_games;
-                    document.getElementById('high-score').textContent = data.profile_stats.high_score;
-                    document.getElementById('server-uptime').textContent = data.profile_stats.server_status;
-                }
-                
-                // Sync button states with server state
-                if (data.simulation_running !== undefined && data.data_loaded !== undefined) {
-                    if (isSimulationRunning !== data.simulation_running || dataLoaded !== data.data_loaded) {
-                        isSimulationRunning = data.simulation_running;
-                        dataLoaded = data.data_loaded;
-                        updateButtonStates();
-                    }
-                }
-            }
-        })
+        .then(renderStats)
         .catch(error => console.log('Stats update error:', error));
 }
 
+function renderStats(data) {
+    if (!data.success) {
+        return;
+    }
+    
+    updateLeaderboard(data.leaderboard);
+    updateChat(data.recent_messages);
+    document.getElementById('online-count').textContent = data.online_count;
+    document.getElementById('ops-per-second').textContent = data.ops_per_second;
+    document.getElementById('demo-counter').textContent = data.demo_counter;
+    
+    // Update profile stats
+    if (data.profile_stats) {
+        document.getElementById('total-players').textContent = data.profile_stats.total_players;
+        document.getElementById('active-games').textContent = data.profile_stats.active_games;
+        document.getElementById('high-score').textContent = data.profile_stats.high_score;
+        document.getElementById('server-uptime').textContent = data.profile_stats.server_status;
+    }
+    
+    // Sync button states with server state
+    if (data.simulation_running !== undefined && data.data_loaded !== undefined) {
+        if (isSimulationRunning !== data.simulation_running || dataLoaded !== data.data_loaded) {
+            isSimulationRunning = data.simulation_running;
+            dataLoaded = data.data_loaded;
+            updateButtonStates();
+        }
+    }
+}
+
 function updateButtonStates() {
     const startBtn = document.getElementById('start-btn');
     const stopBtn = document.getElementById('stop-btn');